@@ -1,6 +1,13 @@
-import PyInstaller.__main__
 import os
+import shutil
 import sys
+
+# Store archive entries uncompressed: the zip of the onedir output is compressed
+# anyway, and skipping zlib inflate shortens every launch. Must be set before
+# PyInstaller's archive writers are imported.
+os.environ.setdefault('PYINSTALLER_ZLIB_COMPRESSION_LEVEL', '0')
+
+import PyInstaller.__main__
 from src.resources.compile_resources import compile_resources
 
 def build():
@@ -16,7 +23,8 @@ def build():
         'src/main.py',
         '--name=SynapseLink',
         '--windowed',
-        '--onefile',
+        '--onedir',
+        '--noupx',
         f'--add-data=src/resources;src/resources',
         '--paths=src',
         '--hidden-import=PyQt6',
@@ -34,13 +42,28 @@ def build():
         '--hidden-import=src.ui.security_dialog',
         '--hidden-import=src.ui.automation_view',
         '--hidden-import=src.ui.splash_screen',
+        '--hidden-import=src.ui.tab_selection_dialog',
+        '--hidden-import=src.ui.search_filter_dialog',
+        '--hidden-import=src.ui.visualization_widget',
         '--hidden-import=src.resources.resources_rc',
-        '--collect-submodules=src',
-        '--collect-data=src',
+        '--exclude-module=tkinter',
+        '--exclude-module=pytest',
+        '--exclude-module=PyQt6.Qt3DCore',
+        '--exclude-module=PyQt6.QtMultimedia',
+        '--exclude-module=PyQt6.QtWebEngineCore',
+        '--exclude-module=PySide6',
+        '--exclude-module=PyQt5',
+        '--exclude-module=matplotlib',
+        '--exclude-module=pandas.tests',
+        '--exclude-module=numpy.tests',
         f'--icon={os.path.join(resources_dir, "icon.ico")}',
         '--clean',
         '--noconfirm',
     ])
 
+    # Ship the onedir output as a single archive
+    dist_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dist')
+    shutil.make_archive(os.path.join(dist_dir, 'SynapseLink'), 'zip', dist_dir, 'SynapseLink')
+
 if __name__ == '__main__':
     build() 
\ No newline at end of file
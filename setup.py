@@ -1,21 +1,32 @@
 from setuptools import setup, find_packages
-import PyInstaller.__main__
 import sys
 import os
 
+# Store archive entries uncompressed to skip zlib inflate at startup
+os.environ.setdefault('PYINSTALLER_ZLIB_COMPRESSION_LEVEL', '0')
+
+import PyInstaller.__main__
+from src.resources.compile_resources import compile_resources
+
 def build_exe():
     """Build executable using PyInstaller."""
+    # Embed icons as a compiled Qt resource module before bundling
+    if not compile_resources():
+        sys.exit(1)
+
     PyInstaller.__main__.run([
         'src/main.py',                      # Script to bundle
         '--name=SynapseLink',               # Name of the executable
         '--windowed',                       # GUI mode
-        '--onefile',                        # Create a single executable
+        '--onedir',                         # Create an application folder
+        '--noupx',                          # Skip UPX decompression at startup
         '--icon=resources/icon.ico',        # Application icon
         '--add-data=resources;resources',   # Include resources
         '--hidden-import=PyQt6',
         '--hidden-import=pymodbus',
         '--hidden-import=cryptography',
         '--hidden-import=qdarkstyle',
+        '--hidden-import=src.resources.resources_rc',
         '--clean',                          # Clean cache
         '--noconfirm',                      # Replace existing spec/build
     ])
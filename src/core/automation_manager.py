@@ -1,10 +1,12 @@
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Mapping, Optional, Any, Callable, Tuple, Union
+from types import CodeType
 import os
 import json
 import time
 from datetime import datetime
 import threading
-import queue
+import heapq
+from collections import deque
 import importlib.util
 from PyQt6.QtCore import QObject, pyqtSignal
 
@@ -64,7 +66,7 @@ class ScriptEngine:
         self.globals = {}
         self.locals = {}
         self.running_scripts: Dict[str, threading.Thread] = {}
-        self.script_output: Dict[str, queue.Queue] = {}
+        self.script_output: Dict[str, deque] = {}
 
     def load_script(self, filename: str) -> Optional[str]:
         """Load a Python script from file."""
@@ -74,17 +76,16 @@ class ScriptEngine:
         except Exception:
             return None
 
-    def run_script(self, script_id: str, code: str, api: Dict[str, Any]) -> bool:
-        """Run a Python script with the provided API."""
+    def run_script(self, script_id: str, code: Union[str, CodeType],
+                   api: Mapping[str, Any]) -> bool:
+        """Run a Python script (source or precompiled code) with the provided API."""
         try:
-            # Create output queue
-            self.script_output[script_id] = queue.Queue()
+            # Create output buffer; deque append/popleft are atomic without a lock
+            output = self.script_output[script_id] = deque()
             
             # Prepare globals
             self.globals.update(api)
-            self.globals['print'] = lambda *args: self.script_output[script_id].put(
-                ' '.join(str(arg) for arg in args)
-            )
+            self.globals['print'] = lambda *args: output.append(' '.join(map(str, args)))
 
             # Create and start script thread
             thread = threading.Thread(
@@ -99,12 +100,12 @@ class ScriptEngine:
         except Exception:
             return False
 
-    def _run_script_thread(self, script_id: str, code: str):
+    def _run_script_thread(self, script_id: str, code: Union[str, CodeType]):
         """Execute script in a separate thread."""
         try:
             exec(code, self.globals, self.locals)
         except Exception as e:
-            self.script_output[script_id].put(f"Error: {str(e)}")
+            self.script_output[script_id].append(f"Error: {str(e)}")
         finally:
             if script_id in self.running_scripts:
                 del self.running_scripts[script_id]
@@ -121,8 +122,9 @@ class ScriptEngine:
             return []
 
         output = []
-        while not self.script_output[script_id].empty():
-            output.append(self.script_output[script_id].get())
+        pending = self.script_output[script_id]
+        while pending:
+            output.append(pending.popleft())
         return output
 
 class AutomationManager(QObject):
@@ -139,22 +141,29 @@ class AutomationManager(QObject):
         self.macro_recorder = MacroRecorder()
         self.script_engine = ScriptEngine()
         self.scheduled_tasks: Dict[str, Dict] = {}
+        self._task_heap: List[Tuple[float, str]] = []  # (monotonic deadline, task_id)
+        self._next_run: Dict[str, float] = {}
+        self._task_lock = threading.Lock()
+        self._wake = threading.Event()
         self.task_timer = None
         self.running = True
         self.start_timer()
 
     def start_timer(self):
-        """Start the task checking timer."""
-        self.task_timer = threading.Timer(1.0, self._check_scheduled_tasks)
-        self.task_timer.daemon = True  # Make it a daemon thread
+        """Start the task scheduler thread."""
+        if self.task_timer and self.task_timer.is_alive():
+            return
+        self.running = True
+        self.task_timer = threading.Thread(target=self._run_scheduler, daemon=True)
         self.task_timer.start()
 
     def stop_timer(self):
-        """Stop the task checking timer."""
+        """Stop the task scheduler thread."""
         self.running = False
-        if self.task_timer:
-            self.task_timer.cancel()
-            self.task_timer = None
+        self._wake.set()
+        if self.task_timer and self.task_timer is not threading.current_thread():
+            self.task_timer.join(timeout=1.0)
+        self.task_timer = None
 
     def start_macro_recording(self):
         """Start recording a new macro."""
@@ -191,7 +200,8 @@ class AutomationManager(QObject):
             self.automation_error.emit(f"Error playing macro: {str(e)}")
             return False
 
-    def run_script(self, script_id: str, code: str, api: Dict[str, Any]) -> bool:
+    def run_script(self, script_id: str, code: Union[str, CodeType],
+                   api: Mapping[str, Any]) -> bool:
         """Run a Python script."""
         success = self.script_engine.run_script(script_id, code, api)
         if not success:
@@ -210,6 +220,7 @@ class AutomationManager(QObject):
                 'action': action,
                 'last_run': None
             }
+            self._push_task(task_id, time.monotonic())
             return True
         except Exception as e:
             self.automation_error.emit(f"Error scheduling task: {str(e)}")
@@ -218,50 +229,77 @@ class AutomationManager(QObject):
     def remove_task(self, task_id: str) -> bool:
         """Remove a scheduled task."""
         if task_id in self.scheduled_tasks:
-            del self.scheduled_tasks[task_id]
+            with self._task_lock:
+                del self.scheduled_tasks[task_id]
+                self._next_run.pop(task_id, None)
             return True
         return False
 
+    def _push_task(self, task_id: str, deadline: float):
+        """Queue the next run of a task and wake the scheduler."""
+        with self._task_lock:
+            if task_id not in self.scheduled_tasks:
+                return
+            self._next_run[task_id] = deadline
+            heapq.heappush(self._task_heap, (deadline, task_id))
+        self._wake.set()
+
+    def _run_scheduler(self):
+        """Sleep until the soonest task deadline, then run what is due."""
+        while self.running:
+            with self._task_lock:
+                delay = self._task_heap[0][0] - time.monotonic() if self._task_heap else None
+
+            if delay is None or delay > 0:
+                self._wake.wait(delay)
+                self._wake.clear()
+                continue
+
+            self._check_scheduled_tasks()
+
     def _check_scheduled_tasks(self):
         """Check and execute scheduled tasks."""
         try:
             if not self.running:
                 return
 
-            now = datetime.now()
-            for task_id, task in self.scheduled_tasks.items():
-                schedule = task['schedule']
-                last_run = task['last_run']
-
-                # Check if task should run
-                should_run = False
-                if not last_run:
-                    should_run = True
-                elif 'interval' in schedule:
-                    # Time-based scheduling
-                    interval = schedule['interval']
-                    if (now - last_run).total_seconds() >= interval:
-                        should_run = True
-                elif 'cron' in schedule:
-                    # TODO: Implement cron-style scheduling
-                    pass
-
-                if should_run:
-                    # Execute task
-                    action = task['action']
-                    if action['type'] == 'macro':
-                        self.play_macro(action['name'], action['handler'])
-                    elif action['type'] == 'script':
-                        self.run_script(action['script_id'], action['code'], action['api'])
-                    
-                    task['last_run'] = now
+            due = []
+            with self._task_lock:
+                now = time.monotonic()
+                while self._task_heap and self._task_heap[0][0] <= now:
+                    deadline, task_id = heapq.heappop(self._task_heap)
+                    # Entries left behind by removed or rescheduled tasks are skipped
+                    if self._next_run.get(task_id) == deadline:
+                        del self._next_run[task_id]
+                        due.append((task_id, self.scheduled_tasks[task_id]))
+
+            for task_id, task in due:
+                self._run_task(task_id, task)
 
         except Exception as e:
             self.automation_error.emit(f"Error in task scheduler: {str(e)}")
+
+    def _run_task(self, task_id: str, task: Dict):
+        """Execute one due task; a failure never stops its later runs."""
+        try:
+            # Execute task
+            action = task['action']
+            if action['type'] == 'macro':
+                self.play_macro(action['name'], action['handler'])
+            elif action['type'] == 'script':
+                self.run_script(action['script_id'], action['code'], action['api'])
+
+            task['last_run'] = datetime.now()
+        except Exception as e:
+            self.automation_error.emit(f"Error in scheduled task {task_id}: {str(e)}")
         finally:
-            # Only reschedule if still running
-            if self.running:
-                self.start_timer()
+            schedule = task['schedule']
+            if 'interval' in schedule:
+                # Time-based scheduling
+                self._push_task(task_id, time.monotonic() + schedule['interval'])
+            elif 'cron' in schedule:
+                # TODO: Implement cron-style scheduling
+                pass
 
     def __del__(self):
         """Clean up resources."""
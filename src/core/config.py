@@ -2,6 +2,29 @@ PERFORMANCE_CONFIG = {
     'buffer_size': 10000,
     'chunk_size': 1024 * 1024,  # 1MB
     'memory_threshold': 512,     # MB
-    'plot_decimation': 1000,
+    'plot_decimation': 4000,     # points kept per series (LTTB), ~2 per pixel on wide screens
     'cleanup_interval': 300,     # seconds
+    'memory_check_interval': 30,  # seconds between memory monitor ticks
+    'memory_sample_every': 1,    # ticks per memory usage sample; raise if the monitor ticks faster
+    'cache_size': 4096,          # cached filter results
+    'cache_min_length': 64,      # bytes; shorter payloads are filtered directly
+    'cache_max_length': 1024,    # bytes; longer payloads are filtered directly, bounding the cache
+    'match_cache_size': 8192,    # cached pattern hits for short payloads
+    'match_cache_max_length': 64,  # bytes; longer payloads are always scanned
+    'export_buffer_size': 1024 * 1024,  # 1MB write buffer for exports
+    'frame_buffer_compact_threshold': 64 * 1024,  # bytes consumed before compacting
+    'serial_flush_interval': 5,  # ms between coalesced data_received emits
+    'serial_flush_size': 64 * 1024,  # bytes buffered before an early flush
+    'port_list_ttl': 1.0,        # seconds a serial port listing is reused
+    'error_emit_interval': 0.5,  # seconds between error_occurred emits per port
+    'display_flush_interval': 40,  # ms between batched inserts into the data display
+    'display_max_lines': 5000,   # scrollback kept in a connection's data display
+    'receive_queue_size': 1024,  # received chunks awaiting processing before the oldest drop
+    'protocol_frame_queue_size': 4096,  # frames queued for the protocol view per flush
+    'hex_cache_max_length': 256,  # bytes; longer payloads are hex-formatted directly
+    'protocol_view_max_frames': 50000,  # rows kept in the protocol view before the oldest drop
+    'search_timeout': 2.0,  # seconds a user regex search may run when the regex module is available
+    'plot_inline_max_points': 2000,  # larger series are processed on a worker thread
+    'plot_update_delay': 50,     # ms that plot refresh requests are coalesced over
+    'permission_save_delay': 200,  # ms of checkbox quiet before permission edits are saved
 } 
\ No newline at end of file
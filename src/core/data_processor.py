@@ -1,177 +1,591 @@
-from typing import List, Dict, Pattern, Optional
+from typing import TYPE_CHECKING, Callable, List, Dict, Iterator, Pattern, Optional, Tuple, Union
+import functools
+import shutil
+import math
+import threading
+import time
 import re
+from bisect import bisect_left, bisect_right
 import json
 import csv
-import xml.etree.ElementTree as ET
+from xml.sax.saxutils import XMLGenerator
 from datetime import datetime
-import numpy as np
-import pandas as pd
 from PyQt6.QtCore import QObject, pyqtSignal
-from collections import deque
-import weakref
+from collections import OrderedDict, deque
+from itertools import accumulate, count, islice
 from .config import PERFORMANCE_CONFIG
 
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+try:
+    import hyperscan
+except ImportError:  # Optional accelerator; pattern matching falls back to re
+    hyperscan = None
+
+try:
+    import xxhash
+except ImportError:  # Optional accelerator; cache keys fall back to the payload itself
+    xxhash = None
+
+# Shared by all buffers, so a replaced buffer never repeats an earlier version
+_buffer_versions = count(1)
+
 class OptimizedDataBuffer:
     def __init__(self, max_size: int = PERFORMANCE_CONFIG['buffer_size']):
         self.max_size = max_size
-        self._buffer: deque[tuple[datetime, bytes]] = deque(maxlen=max_size)
+        self.version = next(_buffer_versions)  # changes whenever the contents do
+        # Parallel columns in arrival order so time ranges can be bisected
+        self._timestamps: deque = deque(maxlen=max_size)
+        self._seconds: deque = deque(maxlen=max_size)  # timestamps as epoch seconds, for plots
+        self._payloads: deque = deque(maxlen=max_size)
+        self._sizes: deque = deque(maxlen=max_size)
         self._total_size = 0
         self._chunk_size = PERFORMANCE_CONFIG['chunk_size']
+        # Running aggregates over the whole buffer; the min/max deques are monotonic
+        self._sum_sq = 0
+        self._min_sizes: deque = deque()
+        self._max_sizes: deque = deque()
+
+    def __len__(self) -> int:
+        return len(self._payloads)
 
     def append(self, timestamp: datetime, data: bytes):
-        self._buffer.append((timestamp, data))
-        self._total_size += len(data)
+        if len(self._payloads) == self.max_size:
+            self._pop_oldest()
+
+        size = len(data)
+        self._timestamps.append(timestamp)
+        self._seconds.append(timestamp.timestamp())
+        self._payloads.append(data)
+        self._sizes.append(size)
+        self._total_size += size
+        self._sum_sq += size * size
+        while self._min_sizes and self._min_sizes[-1] > size:
+            self._min_sizes.pop()
+        self._min_sizes.append(size)
+        while self._max_sizes and self._max_sizes[-1] < size:
+            self._max_sizes.pop()
+        self._max_sizes.append(size)
         
         while self._total_size > self._chunk_size:
-            _, removed_data = self._buffer.popleft()
-            self._total_size -= len(removed_data)
+            self._pop_oldest()
+        self.version = next(_buffer_versions)
+
+    def _pop_oldest(self):
+        self._timestamps.popleft()
+        self._seconds.popleft()
+        self._payloads.popleft()
+        size = self._sizes.popleft()
+        self._total_size -= size
+        self._sum_sq -= size * size
+        if self._min_sizes[0] == size:
+            self._min_sizes.popleft()
+        if self._max_sizes[0] == size:
+            self._max_sizes.popleft()
+
+    def _bounds(self, start_time: Optional[datetime],
+                end_time: Optional[datetime]) -> Tuple[int, int]:
+        # Bisect the deque in place; only the selected rows are ever copied
+        timestamps = self._timestamps
+        lo = bisect_left(timestamps, start_time) if start_time else 0
+        hi = bisect_right(timestamps, end_time) if end_time else len(timestamps)
+        return lo, hi
 
     def get_data(self, start_time: datetime = None, end_time: datetime = None) -> list:
-        return [
-            (ts, data) for ts, data in self._buffer
-            if (not start_time or ts >= start_time) and
-               (not end_time or ts <= end_time)
-        ]
+        lo, hi = self._bounds(start_time, end_time)
+        return list(zip(islice(self._timestamps, lo, hi), islice(self._payloads, lo, hi)))
+
+    def get_payloads(self) -> list:
+        """Return every buffered payload in arrival order."""
+        return list(self._payloads)
+
+    def iter_payloads_newest_first(self) -> Iterator[bytes]:
+        """Iterate over buffered payloads from the newest; the buffer must not change meanwhile."""
+        return reversed(self._payloads)
+
+    def get_sizes(self, start_time: datetime = None,
+                  end_time: datetime = None) -> Tuple[list, list]:
+        """Return the timestamp and packet size columns for a time range."""
+        lo, hi = self._bounds(start_time, end_time)
+        return list(islice(self._timestamps, lo, hi)), list(islice(self._sizes, lo, hi))
+
+    def get_size_arrays(self, start_time: datetime = None,
+                        end_time: datetime = None) -> Tuple['np.ndarray', 'np.ndarray']:
+        """Return epoch seconds (float64) and packet sizes (int64) for a time range."""
+        import numpy as np
+
+        lo, hi = self._bounds(start_time, end_time)
+        count = max(hi - lo, 0)
+        return (np.fromiter(islice(self._seconds, lo, hi), dtype=np.float64, count=count),
+                np.fromiter(islice(self._sizes, lo, hi), dtype=np.int64, count=count))
+
+    def get_statistics(self, start_time: datetime = None, end_time: datetime = None) -> Dict:
+        if start_time is None and end_time is None:
+            count = len(self._sizes)
+            if not count:
+                return {}
+            mean = self._total_size / count
+            return {
+                'total_bytes': self._total_size,
+                'packet_count': count,
+                'avg_packet_size': mean,
+                'min_packet_size': self._min_sizes[0],
+                'max_packet_size': self._max_sizes[0],
+                'std_dev_packet_size': math.sqrt(max(self._sum_sq / count - mean * mean, 0.0))
+            }
+
+        lo, hi = self._bounds(start_time, end_time)
+        if lo >= hi:
+            return {}
+
+        import numpy as np
+
+        sizes = np.fromiter(islice(self._sizes, lo, hi), dtype=np.int64, count=hi - lo)
+        return {
+            'total_bytes': int(sizes.sum()),
+            'packet_count': len(sizes),
+            'avg_packet_size': float(sizes.mean()),
+            'min_packet_size': int(sizes.min()),
+            'max_packet_size': int(sizes.max()),
+            'std_dev_packet_size': float(sizes.std())
+        }
 
     def clear_old_data(self, before_time: datetime):
-        while self._buffer and self._buffer[0][0] < before_time:
-            _, removed_data = self._buffer.popleft()
-            self._total_size -= len(removed_data)
+        stale = bisect_left(self._timestamps, before_time)
+        for _ in range(stale):
+            self._pop_oldest()
+        if stale:
+            self.version = next(_buffer_versions)
+
+_EXPORT_FIELDS = ('timestamp', 'data', 'ascii')
+
+def _export_row(timestamp: datetime, data: bytes) -> Tuple[str, str, str]:
+    """Return a packet's export fields, in _EXPORT_FIELDS order."""
+    return timestamp.isoformat(), data.hex(), data.decode('ascii', errors='replace')
+
+def _json_row(row: Tuple[str, str, str]) -> str:
+    """Encode an export row as a JSON object; only the ascii field can need escaping."""
+    timestamp, hex_data, text = row
+    return f'{{"timestamp": "{timestamp}", "data": "{hex_data}", "ascii": {json.dumps(text)}}}'
+
+class StreamRecorder:
+    """Appends packets to an export file as they arrive."""
+
+    FORMATS = ('csv', 'json', 'xml')
+
+    def __init__(self, filename: str, format: str,
+                 buffer_size: int = PERFORMANCE_CONFIG['export_buffer_size']):
+        self.filename = filename
+        self.format = format.lower()
+        if self.format not in self.FORMATS:
+            raise ValueError(f"Unsupported export format: {format}")
+        self.packet_count = 0
+        # Set by the owner when the recording began with nothing buffered yet
+        self.covers_buffer = False
+
+        self._file = open(filename, 'w', newline='', encoding='utf-8',
+                          buffering=buffer_size)
+        if self.format == 'csv':
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(_EXPORT_FIELDS)
+            self._footer = ''
+        elif self.format == 'json':
+            self._file.write('[')
+            self._separator = '\n  '
+            self._footer = '\n]\n'
+        else:
+            self._xml = XMLGenerator(self._file, encoding='utf-8')
+            self._xml.startDocument()
+            self._xml.startElement('data', {})
+            self._footer = '</data>'
+
+    def write(self, timestamp: datetime, data: bytes):
+        row = _export_row(timestamp, data)
+        if self.format == 'csv':
+            self._writer.writerow(row)
+        elif self.format == 'json':
+            self._file.write(self._separator)
+            self._file.write(_json_row(row))
+            self._separator = ',\n  '
+        else:
+            self._xml.startElement('packet', {})
+            for key, value in zip(_EXPORT_FIELDS, row):
+                self._xml.startElement(key, {})
+                self._xml.characters(value)
+                self._xml.endElement(key)
+            self._xml.endElement('packet')
+        self.packet_count += 1
+
+    def copy_to(self, filename: str):
+        """Write a complete copy of everything recorded so far."""
+        self._file.flush()
+        shutil.copyfile(self.filename, filename)
+        with open(filename, 'a', newline='', encoding='utf-8') as f:
+            f.write(self._footer)
+
+    def close(self):
+        self._file.write(self._footer)
+        self._file.close()
+
+def _synchronized(method):
+    """Serialise a DataProcessor method; received data is processed off the UI thread."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+class PortSignals(QObject):
+    """Signals scoped to a single port, so listeners skip other ports' events."""
+
+    pattern_matched = pyqtSignal(str, bytes)  # pattern_name, data
+    data_filtered = pyqtSignal(bytes)  # filtered_data
 
 class DataProcessor(QObject):
     """Handles data processing, filtering, and analysis."""
     
     # Signals
     pattern_matched = pyqtSignal(str, str, bytes)  # port_name, pattern_name, data
+    patterns_matched_batch = pyqtSignal(str, list)  # port_name, [(pattern_name, start, end)]
     data_filtered = pyqtSignal(str, bytes)  # port_name, filtered_data
     error_detected = pyqtSignal(str, str)  # port_name, error_message
 
     def __init__(self):
         super().__init__()
+        self._lock = threading.RLock()
         self.buffers: Dict[str, OptimizedDataBuffer] = {}
-        self.cache = weakref.WeakValueDictionary()
+        self.cache: OrderedDict = OrderedDict()
+        self.cache_size = PERFORMANCE_CONFIG['cache_size']
+        self.cache_min_length = PERFORMANCE_CONFIG['cache_min_length']
+        self.cache_max_length = PERFORMANCE_CONFIG['cache_max_length']
+        self.export_buffer_size = PERFORMANCE_CONFIG['export_buffer_size']
+        self._match_cache: OrderedDict = OrderedDict()
+        self.match_cache_size = PERFORMANCE_CONFIG['match_cache_size']
+        self.match_cache_max_length = PERFORMANCE_CONFIG['match_cache_max_length']
         self.patterns: Dict[str, Pattern] = {}
         self.filters: Dict[str, Pattern] = {}
-
+        self._pattern_db = None
+        self._pattern_db_names: List[str] = []
+        self._pattern_db_dirty = True
+        self._literal_filters: Dict[str, bytes] = {}
+        self.recorders: Dict[str, StreamRecorder] = {}
+        self._port_signals: Dict[str, PortSignals] = {}
+
+    def port_signals(self, port_name: str) -> PortSignals:
+        """Returns the per-port signals for a port, creating them on first use."""
+        signals = self._port_signals.get(port_name)
+        if signals is None:
+            signals = self._port_signals[port_name] = PortSignals(self)
+        return signals
+
+    @_synchronized
     def add_pattern(self, name: str, pattern: str) -> bool:
         """Add a pattern to match in the incoming data."""
         try:
             self.patterns[name] = re.compile(pattern.encode())
+            self._pattern_db_dirty = True
+            self._match_cache.clear()
             return True
         except re.error:
             return False
 
+    @_synchronized
     def remove_pattern(self, name: str) -> bool:
         """Remove a pattern from matching."""
         if name in self.patterns:
             del self.patterns[name]
+            self._pattern_db_dirty = True
+            self._match_cache.clear()
             return True
         return False
 
+    @_synchronized
     def add_filter(self, name: str, pattern: str) -> bool:
         """Add a filter for the data stream."""
         try:
             self.filters[name] = re.compile(pattern.encode())
+            if pattern and re.escape(pattern) == pattern:
+                self._literal_filters[name] = pattern.encode()
+            else:
+                self._literal_filters.pop(name, None)
+            self.cache.clear()
             return True
         except re.error:
             return False
 
+    @_synchronized
     def remove_filter(self, name: str) -> bool:
         """Remove a filter from the data stream."""
         if name in self.filters:
             del self.filters[name]
+            self._literal_filters.pop(name, None)
+            self.cache.clear()
             return True
         return False
 
+    @_synchronized
     def process_data(self, port_name: str, data: bytes) -> bytes:
         if port_name not in self.buffers:
             self.buffers[port_name] = OptimizedDataBuffer()
         
         timestamp = datetime.now()
         self.buffers[port_name].append(timestamp, data)
+        recorder = self.recorders.get(port_name)
+        if recorder is not None:
+            try:
+                recorder.write(timestamp, data)
+            except OSError as e:
+                # Runs on the receive worker, so report e.g. a full disk instead of raising
+                self._abort_recording(port_name)
+                self.error_detected.emit(port_name, f"Recording stopped: {str(e)}")
         return self._process_with_cache(port_name, data)
 
     def _process_with_cache(self, port_name: str, data: bytes) -> bytes:
-        cache_key = (port_name, hash(data))
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        # Short payloads cost less to filter than to hash and look up, and
+        # coalesced reads are too large (and too unlikely to repeat) to keep
+        if not self.cache_min_length <= len(data) <= self.cache_max_length:
+            return self._process_chunk(port_name, data)
+
+        self._match_patterns(port_name, data)
+
+        cache_key = self._cache_key(data)
+        filtered_data = self.cache.get(cache_key)
+        if filtered_data is None:
+            filtered_data = self._apply_filters(data)
+            self.cache[cache_key] = filtered_data
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(cache_key)
+
+        if filtered_data != data:
+            self._emit_filtered(port_name, filtered_data)
+
+        return filtered_data
 
-        processed_data = self._process_chunk(port_name, data)
-        self.cache[cache_key] = processed_data
-        return processed_data
+    def _cache_key(self, data: bytes):
+        """Key filter results by a fast 128-bit digest, or by the payload itself."""
+        if xxhash is not None:
+            return xxhash.xxh3_128_intdigest(data)
+        return data
+
+    def _get_pattern_db(self):
+        """Return a Hyperscan database of all patterns, rebuilding it when stale."""
+        if hyperscan is None or not self.patterns:
+            return None
+
+        if self._pattern_db_dirty:
+            self._pattern_db_dirty = False
+            self._pattern_db_names = list(self.patterns)
+            try:
+                db = hyperscan.Database()
+                db.compile(
+                    expressions=[self.patterns[name].pattern for name in self._pattern_db_names],
+                    ids=list(range(len(self._pattern_db_names))),
+                    elements=len(self._pattern_db_names)
+                )
+                self._pattern_db = db
+            except Exception:
+                # Syntax Hyperscan does not support; keep using the re module
+                self._pattern_db = None
+
+        return self._pattern_db
 
     def _process_chunk(self, port_name: str, data: bytes) -> bytes:
-        # Check patterns
-        for name, pattern in self.patterns.items():
-            if pattern.search(data):
+        self._match_patterns(port_name, data)
+
+        filtered_data = self._apply_filters(data)
+        if filtered_data != data:
+            self._emit_filtered(port_name, filtered_data)
+
+        return filtered_data
+
+    def _emit_filtered(self, port_name: str, filtered_data: bytes):
+        self.data_filtered.emit(port_name, filtered_data)
+        signals = self._port_signals.get(port_name)
+        if signals is not None:
+            signals.data_filtered.emit(filtered_data)
+
+    def _match_patterns(self, port_name: str, data: bytes):
+        """Emit one patterns_matched_batch for all patterns found in data."""
+        # Repeated short frames (polls, heartbeats) reuse their earlier hits
+        cacheable = len(data) <= self.match_cache_max_length
+        if cacheable and data in self._match_cache:
+            self._match_cache.move_to_end(data)
+            self._emit_matches(port_name, data, self._match_cache[data])
+            return
+
+        hits = self._find_matches(data)
+        if cacheable:
+            self._match_cache[data] = hits
+            if len(self._match_cache) > self.match_cache_size:
+                self._match_cache.popitem(last=False)
+
+        self._emit_matches(port_name, data, hits)
+
+    def _find_matches(self, data: bytes) -> List[Tuple[str, int, int]]:
+        """Return (pattern_name, start, end) for the first match of each pattern."""
+        hits = []
+
+        # One Hyperscan pass picks the patterns that match at all; their spans
+        # still come from re, which reports leftmost matches where Hyperscan
+        # reports the one that ends first
+        pattern_db = self._get_pattern_db()
+        if pattern_db is not None:
+            matched = set()
+
+            def on_match(id, start, end, flags, context):
+                matched.add(id)
+
+            pattern_db.scan(data, match_event_handler=on_match)
+            candidates = [(name, self.patterns[name])
+                          for index, name in enumerate(self._pattern_db_names)
+                          if index in matched]
+        else:
+            candidates = self.patterns.items()
+
+        for name, pattern in candidates:
+            match = next(pattern.finditer(data), None)
+            if match:
+                hits.append((name, match.start(), match.end()))
+
+        return hits
+
+    def _emit_matches(self, port_name: str, data: bytes, hits: List[Tuple[str, int, int]]):
+        """Emit the batch signal, plus per-match signals for connected slots."""
+        if not hits:
+            return
+
+        # Hand out a copy so slots cannot alter cached hits
+        self.patterns_matched_batch.emit(port_name, list(hits))
+
+        # Per-match signal is only dispatched for slots that still use it
+        if self.receivers(self.pattern_matched) > 0:
+            for name, _, _ in hits:
                 self.pattern_matched.emit(port_name, name, data)
 
-        # Apply filters
+        signals = self._port_signals.get(port_name)
+        if signals is not None and signals.receivers(signals.pattern_matched) > 0:
+            for name, _, _ in hits:
+                signals.pattern_matched.emit(name, data)
+
+    def _apply_filters(self, data: bytes) -> bytes:
+        """Return data with every filter match removed."""
+        # One at a time, in order: removing a match can expose one for a later filter
         filtered_data = data
         for name, filter_pattern in self.filters.items():
-            filtered_data = filter_pattern.sub(b'', filtered_data)
-        
-        if filtered_data != data:
-            self.data_filtered.emit(port_name, filtered_data)
-
+            literal = self._literal_filters.get(name)
+            if literal is not None:
+                # Same leftmost non-overlapping cut as re.sub, without the regex engine
+                filtered_data = filtered_data.replace(literal, b'')
+            else:
+                filtered_data = filter_pattern.sub(b'', filtered_data)
         return filtered_data
 
-    def search_data(self, port_name: str, pattern: str, 
+    @_synchronized
+    def search_data(self, port_name: str, pattern: Union[str, Pattern],
                    start_time: Optional[datetime] = None,
-                   end_time: Optional[datetime] = None) -> List[tuple]:
-        """Search for pattern in stored data within the specified time range."""
+                   end_time: Optional[datetime] = None,
+                   timeout: Optional[float] = None) -> List[tuple]:
+        """Search for pattern in stored data within the specified time range.
+
+        pattern may be a regex string or an already compiled bytes pattern.
+        A timeout (seconds, for the whole search) needs a pattern compiled
+        with the third-party regex module; TimeoutError is raised when it
+        runs out.
+        """
         if port_name not in self.buffers:
             return []
 
-        try:
-            search_pattern = re.compile(pattern.encode())
-        except re.error:
-            return []
+        if isinstance(pattern, str):
+            try:
+                search_pattern = re.compile(pattern.encode())
+            except re.error:
+                return []
+        else:
+            search_pattern = pattern
 
         results = []
-        for timestamp, data in self.buffers[port_name].get_data(start_time, end_time):
-            if search_pattern.search(data):
+        records = self.buffers[port_name].get_data(start_time, end_time)
+        if timeout is None:
+            for timestamp, data in records:
+                if search_pattern.search(data):
+                    results.append((timestamp, data))
+            return results
+
+        deadline = time.monotonic() + timeout
+        for timestamp, data in records:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError('regex search timed out')
+            if search_pattern.search(data, timeout=remaining):
                 results.append((timestamp, data))
+        return results
+
+    @_synchronized
+    def search_literal(self, port_name: str, needle: bytes,
+                       start_time: Optional[datetime] = None,
+                       end_time: Optional[datetime] = None,
+                       ignore_case: bool = False) -> List[tuple]:
+        """Find records containing a literal byte string within a time range.
+
+        Scans the records as one contiguous buffer with bytes.find, so no regex
+        engine runs per record; matches spanning two records are ignored.
+        """
+        if port_name not in self.buffers:
+            return []
+
+        records = self.buffers[port_name].get_data(start_time, end_time)
+        blob = b''.join(data for _, data in records)
+        if ignore_case:
+            blob = blob.lower()
+            needle = needle.lower()
+        ends = list(accumulate(len(data) for _, data in records))
 
+        results = []
+        pos = blob.find(needle)
+        while pos != -1:
+            index = bisect_right(ends, pos)
+            if index >= len(records):
+                break
+            if pos + len(needle) <= ends[index]:
+                results.append(records[index])
+                # One hit per record; continue with the next one
+                pos = blob.find(needle, ends[index])
+            else:
+                pos = blob.find(needle, pos + 1)
         return results
 
+    @_synchronized
     def export_data(self, port_name: str, format: str, filename: str,
                    start_time: Optional[datetime] = None,
                    end_time: Optional[datetime] = None) -> bool:
         """Export data in specified format (CSV, JSON, or XML)."""
+        recorder = self.recorders.get(port_name)
+        if (recorder is not None and recorder.format == format.lower()
+                and start_time is None and end_time is None
+                and self._recording_covers_buffer(port_name, recorder)):
+            # Everything is already on disk; only the closing markup is missing
+            try:
+                recorder.copy_to(filename)
+                return True
+            except OSError:
+                return False
+
         if port_name not in self.buffers:
             return False
 
-        data_to_export = [
-            {
-                'timestamp': timestamp.isoformat(),
-                'data': data.hex(),
-                'ascii': data.decode('ascii', errors='replace')
-            }
-            for timestamp, data in self.buffers[port_name].get_data(start_time, end_time)
-        ]
+        rows = self._export_rows(port_name, start_time, end_time)
 
         try:
             if format.lower() == 'csv':
-                with open(filename, 'w', newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=['timestamp', 'data', 'ascii'])
-                    writer.writeheader()
-                    writer.writerows(data_to_export)
-
+                self._export_csv(filename, rows)
             elif format.lower() == 'json':
-                with open(filename, 'w') as f:
-                    json.dump(data_to_export, f, indent=2)
-
+                self._export_json(filename, rows)
             elif format.lower() == 'xml':
-                root = ET.Element('data')
-                for entry in data_to_export:
-                    packet = ET.SubElement(root, 'packet')
-                    for key, value in entry.items():
-                        elem = ET.SubElement(packet, key)
-                        elem.text = str(value)
-                tree = ET.ElementTree(root)
-                tree.write(filename, encoding='utf-8', xml_declaration=True)
-
+                self._export_xml(filename, rows)
             else:
                 return False
 
@@ -180,6 +594,81 @@ class DataProcessor(QObject):
         except Exception:
             return False
 
+    def _recording_covers_buffer(self, port_name: str, recorder: StreamRecorder) -> bool:
+        """Whether a recording holds exactly the packets buffered for its port."""
+        # Every buffered packet passed through the recorder, so equal counts
+        # mean none has been cleared or aged out of the buffer since
+        buffer = self.buffers.get(port_name)
+        return (recorder.covers_buffer and buffer is not None
+                and len(buffer) == recorder.packet_count)
+
+    def _export_rows(self, port_name: str, start_time: Optional[datetime],
+                     end_time: Optional[datetime]):
+        """Yield export rows one at a time instead of building them all up front."""
+        for timestamp, data in self.buffers[port_name].get_data(start_time, end_time):
+            yield _export_row(timestamp, data)
+
+    @_synchronized
+    def start_recording(self, port_name: str, format: str, filename: str) -> bool:
+        """Stream every packet received on a port to a file as it arrives."""
+        self.stop_recording(port_name)
+        try:
+            recorder = StreamRecorder(filename, format, self.export_buffer_size)
+        except (OSError, ValueError):
+            return False
+        recorder.covers_buffer = not self.buffers.get(port_name)
+        self.recorders[port_name] = recorder
+        return True
+
+    @_synchronized
+    def stop_recording(self, port_name: str) -> Optional[str]:
+        """Finish a port's recording and return the file it was written to."""
+        recorder = self.recorders.pop(port_name, None)
+        if recorder is None:
+            return None
+        recorder.close()
+        return recorder.filename
+
+    def _abort_recording(self, port_name: str):
+        """Drop a port's recording after a write error, keeping whatever reached disk."""
+        try:
+            self.stop_recording(port_name)
+        except OSError:
+            pass
+
+    def _export_csv(self, filename: str, rows):
+        with open(filename, 'w', newline='', buffering=self.export_buffer_size) as f:
+            writer = csv.writer(f)
+            writer.writerow(_EXPORT_FIELDS)
+            writer.writerows(rows)
+
+    def _export_json(self, filename: str, rows):
+        # Emit the array incrementally, one encoded packet per line
+        with open(filename, 'wb', buffering=self.export_buffer_size) as f:
+            f.write(b'[')
+            separator = b'\n  '
+            for row in rows:
+                f.write(separator)
+                f.write(_json_row(row).encode())
+                separator = b',\n  '
+            f.write(b'\n]\n')
+
+    def _export_xml(self, filename: str, rows):
+        with open(filename, 'wb', buffering=self.export_buffer_size) as f:
+            generator = XMLGenerator(f, encoding='utf-8')
+            generator.startDocument()
+            generator.startElement('data', {})
+            for row in rows:
+                generator.startElement('packet', {})
+                for key, value in zip(_EXPORT_FIELDS, row):
+                    generator.startElement(key, {})
+                    generator.characters(value)
+                    generator.endElement(key)
+                generator.endElement('packet')
+            generator.endElement('data')
+            generator.endDocument()
+
+    @_synchronized
     def get_statistics(self, port_name: str,
                       start_time: Optional[datetime] = None,
                       end_time: Optional[datetime] = None) -> Dict:
@@ -187,23 +676,68 @@ class DataProcessor(QObject):
         if port_name not in self.buffers:
             return {}
 
-        data = [
-            len(data)
-            for timestamp, data in self.buffers[port_name].get_data(start_time, end_time)
-        ]
+        return self.buffers[port_name].get_statistics(start_time, end_time)
 
-        if not data:
-            return {}
+    @_synchronized
+    def get_filtered_data(self, port_name: str, max_lines: Optional[int] = None) -> str:
+        """Return a port's buffered data with filters applied, decoded as text.
 
-        return {
-            'total_bytes': sum(data),
-            'packet_count': len(data),
-            'avg_packet_size': sum(data) / len(data),
-            'min_packet_size': min(data),
-            'max_packet_size': max(data),
-            'std_dev_packet_size': np.std(data)
-        }
+        With max_lines only the trailing lines are decoded, so a bounded view
+        never pays for the whole buffer.
+        """
+        if port_name not in self.buffers:
+            return ''
 
+        buffer = self.buffers[port_name]
+        apply_filters = self._apply_filters
+        if max_lines is None:
+            data = b''.join(apply_filters(payload) for payload in buffer.get_payloads())
+        else:
+            # Filter from the newest payload back until enough lines are collected
+            parts = []
+            newlines = 0
+            for payload in buffer.iter_payloads_newest_first():
+                if newlines >= max_lines:
+                    break
+                filtered = apply_filters(payload)
+                parts.append(filtered)
+                newlines += filtered.count(b'\n')
+            parts.reverse()
+            data = b''.join(parts)
+
+            start = len(data)
+            for _ in range(max_lines):
+                start = data.rfind(b'\n', 0, start)
+                if start < 0:
+                    break
+            data = data[start + 1:]
+
+        return data.decode('utf-8', errors='replace')
+
+    @_synchronized
+    def archive_old_data(self, port_name: str, cutoff_time: datetime,
+                         write: Callable[[List[Tuple[datetime, bytes]]], None]) -> int:
+        """Pass a port's packets up to cutoff_time to write, then drop them.
+
+        Packets are only dropped once write returns, and no packet can arrive
+        in between. Returns the number of packets written.
+        """
+        buffer = self.buffers.get(port_name)
+        if buffer is None:
+            return 0
+
+        old_data = buffer.get_data(end_time=cutoff_time)
+        if old_data:
+            write(old_data)
+            buffer.clear_old_data(cutoff_time)
+        return len(old_data)
+
+    def get_data_version(self, port_name: str) -> int:
+        """Return a number that changes whenever the port's buffered data does."""
+        buffer = self.buffers.get(port_name)
+        return buffer.version if buffer is not None else 0
+
+    @_synchronized
     def clear_data(self, port_name: str = None):
         """Clear stored data for specified port or all ports."""
         if port_name:
@@ -212,17 +746,38 @@ class DataProcessor(QObject):
         else:
             self.buffers.clear()
 
+    @_synchronized
     def get_data_for_visualization(self, port_name: str,
                                  start_time: Optional[datetime] = None,
-                                 end_time: Optional[datetime] = None) -> pd.DataFrame:
+                                 end_time: Optional[datetime] = None) -> 'pd.DataFrame':
+        # pandas is only needed once plots are shown, so keep it out of startup
+        import numpy as np
+        import pandas as pd
+
         if port_name not in self.buffers:
             return pd.DataFrame()
 
-        data = self.buffers[port_name].get_data(start_time, end_time)
+        timestamps, sizes = self.buffers[port_name].get_sizes(start_time, end_time)
         
-        if not data:
+        if not timestamps:
             return pd.DataFrame()
 
-        df = pd.DataFrame(data, columns=['timestamp', 'data'])
-        df['data_size'] = df['data'].apply(len)
-        return df 
\ No newline at end of file
+        # Plots only need timestamps and sizes, so the payloads are left out
+        return pd.DataFrame({
+            'timestamp': timestamps,
+            'data_size': np.fromiter(sizes, dtype=np.int64, count=len(sizes))
+        })
+
+    @_synchronized
+    def get_visualization_arrays(self, port_name: str,
+                                 start_time: Optional[datetime] = None,
+                                 end_time: Optional[datetime] = None
+                                 ) -> Tuple['np.ndarray', 'np.ndarray']:
+        """Return timestamps as float epoch seconds and packet sizes as int64 arrays."""
+        import numpy as np
+
+        if port_name not in self.buffers:
+            return np.empty(0), np.empty(0, dtype=np.int64)
+
+        # Epoch seconds are kept alongside the datetimes, so nothing is converted here
+        return self.buffers[port_name].get_size_arrays(start_time, end_time)
@@ -1,10 +1,41 @@
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from datetime import datetime
-import struct
-from pymodbus.exceptions import ModbusException
-from pymodbus.utilities import hexlify_packets
 from PyQt6.QtCore import QObject, pyqtSignal
+from .config import PERFORMANCE_CONFIG
+
+def _build_crc16_table() -> Tuple[int, ...]:
+    """Precompute the CRC16-Modbus (reflected 0xA001) lookup table."""
+    table = []
+    for value in range(256):
+        crc = value
+        for _ in range(8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ 0xA001
+            else:
+                crc >>= 1
+        table.append(crc)
+    return tuple(table)
+
+CRC16_TABLE = _build_crc16_table()
+
+def _parse_modbus_rtu(buf: Union[bytes, bytearray, memoryview]) -> Optional[Tuple[int, int]]:
+    """Verify an RTU frame's CRC16 and return its (unit_id, function_code) header."""
+    length = len(buf)
+    if length < 4:
+        return None
+
+    # Calculate CRC16 one byte per table lookup
+    crc = 0xFFFF
+    table = CRC16_TABLE
+    for byte in buf[:length - 2]:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+
+    # CRC is transmitted little-endian in the last two bytes
+    if crc != buf[length - 2] | (buf[length - 1] << 8):
+        return None
+
+    return buf[0], buf[1]
 
 @dataclass
 class ProtocolFrame:
@@ -24,15 +55,18 @@ class ProtocolAnalyzer(QObject):
 
     def __init__(self):
         super().__init__()
-        self.frame_buffer: Dict[str, List[bytes]] = {}
+        self.frame_buffer: Dict[str, bytearray] = {}
+        self.read_offset: Dict[str, int] = {}  # consumed bytes at the buffer head
         self.last_byte: Dict[str, int] = {}
+        self.compact_threshold = PERFORMANCE_CONFIG['frame_buffer_compact_threshold']
 
     def analyze_frame(self, port_name: str, data: bytes) -> Optional[ProtocolFrame]:
         """Analyze incoming data for protocol frames."""
         # Buffer the data
         if port_name not in self.frame_buffer:
-            self.frame_buffer[port_name] = []
-        self.frame_buffer[port_name].extend(data)
+            self.frame_buffer[port_name] = bytearray()
+            self.read_offset[port_name] = 0
+        self.frame_buffer[port_name] += data
 
         # Try to detect protocol and extract frame
         frame = None
@@ -54,83 +88,68 @@ class ProtocolAnalyzer(QObject):
 
     def _extract_modbus_frame(self, port_name: str) -> Optional[ProtocolFrame]:
         """Try to extract a Modbus frame from the buffer."""
-        buffer = bytes(self.frame_buffer[port_name])
-        if len(buffer) < 4:  # Minimum Modbus frame size
+        buf = self.frame_buffer[port_name]
+        offset = self.read_offset[port_name]
+        if len(buf) - offset < 4:  # Minimum Modbus frame size
             return None
 
         try:
-            # Check for Modbus RTU frame
-            if len(buffer) >= 4 and self._check_modbus_crc(buffer):
-                # Try to decode as request or response
-                try:
-                    # Basic Modbus frame parsing
-                    function_code = buffer[1] if len(buffer) > 1 else None
-                    unit_id = buffer[0] if len(buffer) > 0 else None
-                    data_payload = buffer[2:-2] if len(buffer) > 4 else b''
-                    
-                    parsed_data = {
-                        'function_code': function_code,
-                        'unit_id': unit_id,
-                        'data': hexlify_packets(data_payload),
-                        'crc': hexlify_packets(buffer[-2:])
-                    }
-                    
-                    # Determine frame type based on function code
-                    if function_code is not None:
-                        if function_code & 0x80:  # Error response
-                            frame_type = 'ModbusErrorResponse'
-                            parsed_data['error_code'] = data_payload[0] if data_payload else None
-                        else:
-                            frame_type = 'ModbusRequest' if function_code < 0x80 else 'ModbusResponse'
-                    else:
-                        frame_type = 'Unknown'
-                    
-                    # Clear the processed bytes from buffer
-                    self.frame_buffer[port_name] = self.frame_buffer[port_name][len(buffer):]
-                    
-                    return ProtocolFrame(
-                        timestamp=datetime.now(),
-                        protocol='Modbus RTU',
-                        frame_type=frame_type,
-                        data=buffer,
-                        parsed_data=parsed_data,
-                        errors=[]
-                    )
-                except ModbusException as e:
-                    self.error_detected.emit(port_name, 'Modbus', str(e))
+            # Check for Modbus RTU frame without copying the buffer
+            with memoryview(buf) as view:
+                header = _parse_modbus_rtu(view[offset:])
+                if header is None:
+                    return None
+                buffer = bytes(view[offset:])
+
+            unit_id, function_code = header
+            data_payload = buffer[2:-2]
+
+            parsed_data = {
+                'function_code': function_code,
+                'unit_id': unit_id,
+                'data': data_payload.hex(' '),
+                'crc': buffer[-2:].hex(' ')
+            }
+
+            # Determine frame type based on function code
+            if function_code & 0x80:  # Error response
+                frame_type = 'ModbusErrorResponse'
+                parsed_data['error_code'] = data_payload[0] if data_payload else None
+            else:
+                frame_type = 'ModbusRequest'
+
+            # The frame spans all unread bytes, so the buffer can be reset
+            buf.clear()
+            self.read_offset[port_name] = 0
+
+            return ProtocolFrame(
+                timestamp=datetime.now(),
+                protocol='Modbus RTU',
+                frame_type=frame_type,
+                data=buffer,
+                parsed_data=parsed_data,
+                errors=[]
+            )
 
         except Exception as e:
             self.error_detected.emit(port_name, 'Modbus', f'Frame parsing error: {str(e)}')
 
         return None
 
-    def _check_modbus_crc(self, data: bytes) -> bool:
+    def _check_modbus_crc(self, data: Union[bytes, bytearray, memoryview]) -> bool:
         """Verify Modbus CRC."""
-        if len(data) < 4:
-            return False
-        
-        # Calculate CRC16
-        crc = 0xFFFF
-        for byte in data[:-2]:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x0001:
-                    crc >>= 1
-                    crc ^= 0xA001
-                else:
-                    crc >>= 1
-
-        # Extract CRC from frame
-        frame_crc = struct.unpack('<H', data[-2:])[0]
-        
-        return crc == frame_crc
+        return _parse_modbus_rtu(data) is not None
 
     def _extract_serial_frame(self, port_name: str) -> Optional[ProtocolFrame]:
         """Try to extract an RS-232/485 frame from the buffer."""
         buffer = self.frame_buffer[port_name]
-        if len(buffer) < 3:  # Minimum frame size (start + data + end)
+        offset = self.read_offset[port_name]
+        if len(buffer) - offset < 3:  # Minimum frame size (start + data + end)
             return None
 
+        # Remember the last byte before any in-place consumption
+        last_byte = buffer[-1]
+
         # Look for common frame patterns
         frame = None
         errors = []
@@ -138,80 +157,102 @@ class ProtocolAnalyzer(QObject):
         # Check for basic UART frame errors
         if port_name in self.last_byte:
             # Check for framing error (missing stop bit)
-            if buffer[0] & 0x01:
+            if buffer[offset] & 0x01:
                 errors.append("Framing Error: Missing stop bit")
             
             # Check for break condition
-            if buffer[0] == 0:
+            if buffer[offset] == 0:
                 errors.append("Break Condition Detected")
 
         # Try to detect standard serial frames
         try:
             # Look for start/end markers
-            start_markers = [0x02, 0x01]  # STX, SOH
-            end_markers = [0x03, 0x04]    # ETX, EOT
-
-            for start in start_markers:
-                try:
-                    start_idx = buffer.index(start)
-                    for end in end_markers:
-                        try:
-                            end_idx = buffer.index(end, start_idx + 1)
-                            frame_data = bytes(buffer[start_idx:end_idx + 1])
-                            
-                            # Parse frame
-                            parsed_data = {
-                                'start_marker': hex(start),
-                                'end_marker': hex(end),
-                                'payload': hexlify_packets(frame_data[1:-1]),
-                                'length': len(frame_data)
-                            }
-
-                            # Check parity if present
-                            if len(frame_data) > 3:
-                                parity = self._calculate_parity(frame_data[1:-2])
-                                if frame_data[-2] != parity:
-                                    errors.append("Parity Error")
-                                parsed_data['parity'] = hex(parity)
-
-                            # Clear processed bytes
-                            self.frame_buffer[port_name] = buffer[end_idx + 1:]
-                            
-                            frame = ProtocolFrame(
-                                timestamp=datetime.now(),
-                                protocol='RS-232/485',
-                                frame_type='Standard',
-                                data=frame_data,
-                                parsed_data=parsed_data,
-                                errors=errors
-                            )
-                            break
-                        except ValueError:
-                            continue
-                    if frame:
-                        break
-                except ValueError:
-                    continue
+            markers = self._find_serial_markers(buffer, offset)
+            if markers:
+                start_idx, end_idx = markers
+                start = buffer[start_idx]
+                end = buffer[end_idx]
+                frame_data = bytes(buffer[start_idx:end_idx + 1])
+
+                # Parse frame
+                parsed_data = {
+                    'start_marker': hex(start),
+                    'end_marker': hex(end),
+                    'payload': frame_data[1:-1].hex(' '),
+                    'length': len(frame_data)
+                }
+
+                # Check parity if present
+                if len(frame_data) > 3:
+                    parity = self._calculate_parity(frame_data[1:-2])
+                    if frame_data[-2] != parity:
+                        errors.append("Parity Error")
+                    parsed_data['parity'] = hex(parity)
+
+                # Advance past the frame; bytes are only moved on compaction
+                self._consume(port_name, end_idx + 1)
+
+                frame = ProtocolFrame(
+                    timestamp=datetime.now(),
+                    protocol='RS-232/485',
+                    frame_type='Standard',
+                    data=frame_data,
+                    parsed_data=parsed_data,
+                    errors=errors
+                )
 
         except Exception as e:
             self.error_detected.emit(port_name, 'Serial', f'Frame parsing error: {str(e)}')
 
         # Store last byte for next analysis
-        if buffer:
-            self.last_byte[port_name] = buffer[-1]
+        self.last_byte[port_name] = last_byte
 
         return frame
 
+    def _consume(self, port_name: str, end: int):
+        """Mark buffer bytes up to ``end`` as read, compacting once mostly consumed."""
+        buffer = self.frame_buffer[port_name]
+        if end >= len(buffer):
+            buffer.clear()
+            end = 0
+        elif end > self.compact_threshold and end > len(buffer) // 2:
+            del buffer[:end]
+            end = 0
+        self.read_offset[port_name] = end
+
+    def _find_serial_markers(self, buffer: bytearray,
+                             offset: int = 0) -> Optional[Tuple[int, int]]:
+        """Find the first start marker from ``offset`` and the end marker after it."""
+        import numpy as np
+
+        # Vectorized scan; the array view must not outlive this call because
+        # the caller resizes the bytearray afterwards.
+        arr = np.frombuffer(buffer, dtype=np.uint8)[offset:]
+        starts = np.flatnonzero((arr == 0x02) | (arr == 0x01))  # STX, SOH
+        if starts.size == 0:
+            return None
+
+        start_idx = offset + int(starts[0])
+        tail = arr[start_idx - offset + 1:]
+        ends = np.flatnonzero((tail == 0x03) | (tail == 0x04))  # ETX, EOT
+        if ends.size == 0:
+            return None
+
+        return start_idx, start_idx + 1 + int(ends[0])
+
     def _calculate_parity(self, data: bytes) -> int:
         """Calculate parity byte for serial data."""
-        parity = 0
-        for byte in data:
-            parity ^= byte
-        return parity
+        if not data:
+            return 0
+
+        import numpy as np
+
+        return int(np.bitwise_xor.reduce(np.frombuffer(data, dtype=np.uint8)))
 
     def clear_buffer(self, port_name: str):
         """Clear the frame buffer for a port."""
         if port_name in self.frame_buffer:
             self.frame_buffer[port_name].clear()
+            self.read_offset[port_name] = 0
         if port_name in self.last_byte:
             del self.last_byte[port_name] 
\ No newline at end of file
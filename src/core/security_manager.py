@@ -1,13 +1,55 @@
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple, Union
 import os
+import copy
+import functools
 import json
 import hashlib
+import logging
+import hmac
 import base64
+import secrets
+import threading
+import time
 from datetime import datetime, timedelta
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from PyQt6.QtCore import QObject, pyqtSignal
+from .config import PERFORMANCE_CONFIG
+
+try:
+    import rfernet
+except ImportError:  # Optional accelerator; ciphers fall back to cryptography's Fernet
+    rfernet = None
+
+try:
+    import orjson
+except ImportError:  # Optional accelerator; config parsing falls back to the json module
+    orjson = None
+
+PBKDF2_ITERATIONS = 200_000
+AUTH_CACHE_TTL = 3 * 60 * 60  # seconds a verified password skips PBKDF2
+
+@functools.lru_cache(maxsize=8)
+def _load_security_config(path: str, mtime_ns: int, size: int) -> Dict:
+    """Parse a config file; cached until its modification time or size changes."""
+    with open(path, 'rb') as f:
+        content = f.read()
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def _synchronized(method):
+    """Serialise a SecurityManager method; logins are verified off the UI thread."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+def _password_bytes(password: Union[str, bytes, bytearray]) -> Union[bytes, bytearray]:
+    """Encode a password once; bytes-like input is used as is."""
+    if isinstance(password, str):
+        return password.encode()
+    return password
 
 class SecurityManager(QObject):
     """Manages security features including authentication, access control, and encryption."""
@@ -23,20 +65,38 @@ class SecurityManager(QObject):
         self.users: Dict[str, Dict] = {}
         self.sessions: Dict[str, Dict] = {}
         self.encryption_keys: Dict[str, bytes] = {}
+        self._ciphers: Dict[str, object] = {}
+        self._last_status: Dict[str, bool] = {}
+        self._permission_sets: Dict[str, Tuple[bool, FrozenSet[str]]] = {}
+        # Successful logins only: username -> (keyed password digest, expiry)
+        self._auth_cache: Dict[str, Tuple[bytes, float]] = {}
+        self._auth_cache_key = secrets.token_bytes(32)
+        self._admins: Dict[str, None] = {}  # insertion-ordered set of admin usernames
+        self._lock = threading.RLock()
+        # Cipher errors are always logged but only surfaced to the UI at a bounded rate
+        self.logger = logging.getLogger(__name__)
+        self.error_emit_interval = PERFORMANCE_CONFIG['error_emit_interval']
+        self._last_error_emit: Dict[str, float] = {}
         self.load_config()
 
+    @_synchronized
     def load_config(self):
         """Load security configuration from file."""
+        self._permission_sets.clear()
+        self._auth_cache.clear()
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    self.users = config.get('users', {})
+                stat = os.stat(self.config_file)
+                config = _load_security_config(
+                    os.path.abspath(self.config_file), stat.st_mtime_ns, stat.st_size
+                )
+                # Copy so edits to users cannot leak into the cached parse
+                self.users = copy.deepcopy(config.get('users', {}))
             else:
                 # Create default admin user if no config exists
                 self.users = {
                     'admin': {
-                        'password_hash': self._hash_password('admin'),
+                        **self._new_credentials('admin'),
                         'role': 'admin',
                         'permissions': ['*']
                     }
@@ -45,6 +105,17 @@ class SecurityManager(QObject):
         except Exception as e:
             self.security_error.emit(f"Error loading security config: {str(e)}")
 
+        self._admins = {
+            username: None for username, user in self.users.items()
+            if user.get('role') == 'admin'
+        }
+
+    @_synchronized
+    def get_admin_username(self) -> Optional[str]:
+        """Return the first admin user, if any."""
+        return next(iter(self._admins), None)
+
+    @_synchronized
     def save_config(self):
         """Save security configuration to file."""
         try:
@@ -53,57 +124,129 @@ class SecurityManager(QObject):
         except Exception as e:
             self.security_error.emit(f"Error saving security config: {str(e)}")
 
-    def _hash_password(self, password: str) -> str:
-        """Hash a password using SHA-256."""
-        return hashlib.sha256(password.encode()).hexdigest()
+    def _hash_password(self, password: Union[str, bytes, bytearray], salt: bytes) -> str:
+        """Hash a password using salted PBKDF2-HMAC-SHA256."""
+        digest = hashlib.pbkdf2_hmac('sha256', _password_bytes(password), salt,
+                                     PBKDF2_ITERATIONS)
+        return base64.b64encode(digest).decode()
 
-    def authenticate(self, username: str, password: str) -> bool:
-        """Authenticate a user."""
-        if username not in self.users:
-            self.auth_status_changed.emit(username, False)
-            return False
+    def _new_credentials(self, password: Union[str, bytes, bytearray]) -> Dict[str, str]:
+        """Generate a fresh salt and the matching password hash."""
+        salt = secrets.token_bytes(16)
+        return {
+            'password_hash': self._hash_password(password, salt),
+            'salt': base64.b64encode(salt).decode()
+        }
+
+    def _verify_password(self, user: Dict, password: Union[bytes, bytearray]) -> bool:
+        """Check an encoded password against a user's stored hash in constant time."""
+        if 'salt' not in user:
+            # Unsalted SHA-256 hash written by older versions
+            candidate = hashlib.sha256(password).hexdigest()
+        else:
+            candidate = self._hash_password(password, base64.b64decode(user['salt']))
+
+        return hmac.compare_digest(candidate.encode(), user['password_hash'].encode())
+
+    @_synchronized
+    def invalidate_auth_cache(self, username: str):
+        """Force the next login of a user to verify the password hash again."""
+        self._auth_cache.pop(username, None)
+
+    def _set_auth_status(self, username: str, is_authenticated: bool):
+        """Emit auth_status_changed only when a user's status actually changes."""
+        if self._last_status.get(username) != is_authenticated:
+            self._last_status[username] = is_authenticated
+            self.auth_status_changed.emit(username, is_authenticated)
+
+    def authenticate(self, username: str, password: Union[str, bytes, bytearray]) -> bool:
+        """Authenticate a user; the password may be a str or UTF-8 bytes."""
+        secret = _password_bytes(password)
+        # Keyed with a per-process secret so the cache never holds a plain hash
+        cache_digest = hmac.new(self._auth_cache_key, secret, 'sha256').digest()
+        with self._lock:
+            user = self.users.get(username)
+            if user is None:
+                self._set_auth_status(username, False)
+                return False
+            user = dict(user)
+            now = time.monotonic()
+            cached = self._auth_cache.get(username)
+            cache_hit = (cached is not None and now < cached[1]
+                         and hmac.compare_digest(cached[0], cache_digest))
+
+        # Hashing is deliberately slow, so it runs on the snapshot without the lock
+        verified = cache_hit or self._verify_password(user, secret)
+        # Upgrade a legacy hash now that the plain password is known
+        upgrade = self._new_credentials(secret) if verified and 'salt' not in user else None
+
+        with self._lock:
+            current = self.users.get(username)
+            # The user may have been removed or changed their password meanwhile
+            if (not verified or current is None
+                    or current['password_hash'] != user['password_hash']):
+                self._set_auth_status(username, False)
+                return False
+
+            if not cache_hit:
+                self._auth_cache[username] = (cache_digest, now + AUTH_CACHE_TTL)
+            if upgrade is not None:
+                current.update(upgrade)
+                self.save_config()
 
-        if self._hash_password(password) == self.users[username]['password_hash']:
             # Create session
             session = {
                 'timestamp': datetime.now(),
                 'token': os.urandom(32).hex()
             }
             self.sessions[username] = session
-            self.auth_status_changed.emit(username, True)
+            self._set_auth_status(username, True)
             return True
 
-        self.auth_status_changed.emit(username, False)
-        return False
-
+    @_synchronized
     def logout(self, username: str):
         """Log out a user."""
         if username in self.sessions:
             del self.sessions[username]
-        self.auth_status_changed.emit(username, False)
+        self._set_auth_status(username, False)
 
+    @_synchronized
     def is_authenticated(self, username: str) -> bool:
         """Check if a user is authenticated."""
         return username in self.sessions
 
+    @_synchronized
     def check_permission(self, username: str, resource: str) -> bool:
         """Check if a user has permission to access a resource."""
         if not self.is_authenticated(username):
             return False
 
-        user = self.users.get(username)
-        if not user:
-            return False
+        permission_set = self._permission_sets.get(username)
+        if permission_set is None:
+            user = self.users.get(username)
+            if not user:
+                return False
 
-        permissions = user['permissions']
-        
-        # Admin has all permissions
-        if user['role'] == 'admin' or '*' in permissions:
-            return True
+            # Precompute the admin flag and a set for O(1) lookups
+            permissions = frozenset(user['permissions'])
+            permission_set = (user['role'] == 'admin' or '*' in permissions, permissions)
+            self._permission_sets[username] = permission_set
+
+        is_admin, permissions = permission_set
+        return is_admin or resource in permissions
 
-        # Check specific permissions
-        return resource in permissions
+    @_synchronized
+    def set_permissions(self, username: str, permissions: List[str]) -> bool:
+        """Replace a user's permissions and save the configuration."""
+        if username not in self.users:
+            return False
+
+        self.users[username]['permissions'] = list(permissions)
+        self._permission_sets.pop(username, None)
+        self.save_config()
+        return True
 
+    @_synchronized
     def add_user(self, admin_username: str, new_username: str, password: str,
                 role: str = 'user', permissions: List[str] = None) -> bool:
         """Add a new user (requires admin privileges)."""
@@ -116,13 +259,18 @@ class SecurityManager(QObject):
             return False
 
         self.users[new_username] = {
-            'password_hash': self._hash_password(password),
+            **self._new_credentials(password),
             'role': role,
             'permissions': permissions or []
         }
+        self._permission_sets.pop(new_username, None)
+        self.invalidate_auth_cache(new_username)
+        if role == 'admin':
+            self._admins[new_username] = None
         self.save_config()
         return True
 
+    @_synchronized
     def remove_user(self, admin_username: str, username: str) -> bool:
         """Remove a user (requires admin privileges)."""
         if not self.check_permission(admin_username, 'user_management'):
@@ -133,6 +281,9 @@ class SecurityManager(QObject):
             return False
 
         del self.users[username]
+        self._permission_sets.pop(username, None)
+        self.invalidate_auth_cache(username)
+        self._admins.pop(username, None)
         if username in self.sessions:
             del self.sessions[username]
         self.save_config()
@@ -143,8 +294,14 @@ class SecurityManager(QObject):
         if not self.authenticate(username, old_password):
             return False
 
-        self.users[username]['password_hash'] = self._hash_password(new_password)
-        self.save_config()
+        credentials = self._new_credentials(new_password)
+        with self._lock:
+            user = self.users.get(username)
+            if user is None:
+                return False
+            user.update(credentials)
+            self.invalidate_auth_cache(username)
+            self.save_config()
         return True
 
     def setup_encryption(self, port_name: str) -> bool:
@@ -153,31 +310,73 @@ class SecurityManager(QObject):
             # Generate a new encryption key
             key = Fernet.generate_key()
             self.encryption_keys[port_name] = key
+            self._ciphers[port_name] = self._create_cipher(key)
             return True
         except Exception as e:
             self.security_error.emit(f"Error setting up encryption: {str(e)}")
             return False
 
-    def encrypt_data(self, port_name: str, data: bytes) -> Optional[bytes]:
-        """Encrypt data for transmission."""
-        if port_name not in self.encryption_keys:
+    def _create_cipher(self, key: bytes):
+        """Create a Fernet cipher, preferring the Rust implementation (same token format)."""
+        if rfernet is not None:
+            return rfernet.Fernet(key.decode())
+        return Fernet(key)
+
+    def remove_encryption(self, port_name: str) -> bool:
+        """Disable encryption for a serial port."""
+        self._ciphers.pop(port_name, None)
+        return self.encryption_keys.pop(port_name, None) is not None
+
+    def set_port_encryption_bulk(self, ports: Mapping[str, bool]) -> bool:
+        """Enable or disable encryption for several ports in one call.
+
+        Ports that are already in the requested state keep their current key.
+        """
+        ok = True
+        for port_name, enabled in ports.items():
+            if enabled and port_name not in self.encryption_keys:
+                ok = self.setup_encryption(port_name) and ok
+            elif not enabled and port_name in self.encryption_keys:
+                self.remove_encryption(port_name)
+        return ok
+
+    def encrypt_data(self, port_name: str,
+                     data: Union[bytes, bytearray, memoryview]) -> Optional[bytes]:
+        """Encrypt data for transmission.
+
+        Every call produces a separate token with its own IV and HMAC, so pass
+        whole frames or accumulated buffers rather than individual reads.
+        """
+        cipher = self._ciphers.get(port_name)
+        if cipher is None:
             return data
 
         try:
-            f = Fernet(self.encryption_keys[port_name])
-            return f.encrypt(data)
+            # Fernet only accepts bytes; convert other buffers once here
+            return cipher.encrypt(data if isinstance(data, bytes) else bytes(data))
         except Exception as e:
-            self.security_error.emit(f"Encryption error: {str(e)}")
+            self._report_error(port_name, "Encryption error", e)
             return None
 
-    def decrypt_data(self, port_name: str, data: bytes) -> Optional[bytes]:
+    def decrypt_data(self, port_name: str,
+                     data: Union[bytes, bytearray, memoryview]) -> Optional[bytes]:
         """Decrypt received data."""
-        if port_name not in self.encryption_keys:
+        cipher = self._ciphers.get(port_name)
+        if cipher is None:
             return data
 
         try:
-            f = Fernet(self.encryption_keys[port_name])
-            return f.decrypt(data)
+            return cipher.decrypt(data if isinstance(data, bytes) else bytes(data))
         except Exception as e:
-            self.security_error.emit(f"Decryption error: {str(e)}")
-            return None 
\ No newline at end of file
+            self._report_error(port_name, "Decryption error", e)
+            return None
+
+    def _report_error(self, port_name: str, context: str, error: Exception):
+        """Log a cipher error and emit security_error at most once per interval per port."""
+        self.logger.error("%s on %s: %s", context, port_name, error)
+
+        now = time.monotonic()
+        last = self._last_error_emit.get(port_name)
+        if last is None or now - last >= self.error_emit_interval:
+            self._last_error_emit[port_name] = now
+            self.security_error.emit(f"{context}: {error}") 
\ No newline at end of file
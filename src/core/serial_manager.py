@@ -1,10 +1,18 @@
 import serial
 import serial.tools.list_ports
-from PyQt6.QtCore import QObject, pyqtSignal
-from typing import Dict, List, Optional, Tuple
+from PyQt6.QtCore import QObject, QMetaObject, Qt, QThread, QTimer, pyqtSignal, pyqtSlot
+from typing import Dict, Mapping, Optional, Tuple
+import logging
+import os
+import selectors
 import threading
-import queue
 import time
+from .config import PERFORMANCE_CONFIG
+
+class PortSignals(QObject):
+    """Signals scoped to a single port, so listeners skip other ports' traffic."""
+
+    data_received = pyqtSignal(bytes)  # data
 
 class SerialManager(QObject):
     """Manages serial port connections and communications."""
@@ -19,73 +27,154 @@ class SerialManager(QObject):
         self.connections: Dict[str, serial.Serial] = {}
         self.read_threads: Dict[str, threading.Thread] = {}
         self.running: Dict[str, bool] = {}
-        self.data_queues: Dict[str, queue.Queue] = {}
 
-    def list_ports(self) -> List[Tuple[str, str]]:
-        """Returns a list of available serial ports."""
-        ports = []
-        for port in serial.tools.list_ports.comports():
-            ports.append((port.device, port.description))
-        return ports
+        # Reads are coalesced per port and emitted from the owning thread
+        self._read_buf: Dict[str, bytearray] = {}
+        self._read_lock = threading.Lock()
+        self._port_signals: Dict[str, PortSignals] = {}
+        self.flush_size = PERFORMANCE_CONFIG['serial_flush_size']
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(PERFORMANCE_CONFIG['serial_flush_interval'])
+        self._flush_timer.timeout.connect(self._flush_reads)
+
+        # On POSIX one reactor thread services every selectable port; other
+        # ports (and all ports on Windows) get a dedicated read thread
+        self._selector = selectors.DefaultSelector() if os.name == 'posix' else None
+        self._selector_ports: Dict[str, int] = {}  # port_name -> registered fd
+        self._reactor_lock = threading.Lock()
+        self._reactor_thread: Optional[threading.Thread] = None
+
+        # I/O errors are always logged but only surfaced to the UI at a bounded rate
+        self.logger = logging.getLogger(__name__)
+        self.error_emit_interval = PERFORMANCE_CONFIG['error_emit_interval']
+        self._last_error_emit: Dict[str, float] = {}
+
+        # Enumerating ports is slow, so results are reused for a short time
+        self.port_list_ttl = PERFORMANCE_CONFIG['port_list_ttl']
+        self._ports_cache: Optional[Tuple[Tuple[str, str], ...]] = None
+        self._ports_cache_time = 0.0
+
+    def list_ports(self, use_cache: bool = True) -> Tuple[Tuple[str, str], ...]:
+        """Returns the available serial ports as (device, description) pairs.
+
+        Results are reused for port_list_ttl seconds unless use_cache is False.
+        """
+        now = time.monotonic()
+        if (not use_cache or self._ports_cache is None
+                or now - self._ports_cache_time >= self.port_list_ttl):
+            self._ports_cache = tuple(
+                (port.device, port.description)
+                for port in serial.tools.list_ports.comports()
+            )
+            self._ports_cache_time = now
+        return self._ports_cache
+
+    def port_signals(self, port_name: str) -> PortSignals:
+        """Returns the per-port signals for a port, creating them on first use."""
+        signals = self._port_signals.get(port_name)
+        if signals is None:
+            signals = self._port_signals[port_name] = PortSignals(self)
+        return signals
 
     def open_connection(self, port_name: str, baud_rate: int = 9600,
                        data_bits: int = 8, stop_bits: int = 1,
                        parity: str = 'N', flow_control: bool = False) -> bool:
         """Opens a new serial connection with the specified parameters."""
-        try:
-            if port_name in self.connections:
-                return False
+        if port_name in self.connections:
+            return False
 
+        return self._open(port_name, {
+            'baudrate': baud_rate,
+            'bytesize': data_bits,
+            'stopbits': stop_bits,
+            'parity': parity,
+            'flow_control': flow_control
+        })
+
+    def close_connection(self, port_name: str) -> bool:
+        """Closes the specified serial connection."""
+        return self._close(port_name)
+
+    def _open(self, port_name: str, settings: Mapping) -> bool:
+        """Open a port, start reading from it and announce the connection."""
+        self._ports_cache = None
+        try:
             ser = serial.Serial(
                 port=port_name,
-                baudrate=baud_rate,
-                bytesize=data_bits,
-                stopbits=stop_bits,
-                parity=parity,
-                xonxoff=flow_control,
+                baudrate=settings.get('baudrate', 9600),
+                bytesize=settings.get('bytesize', 8),
+                stopbits=settings.get('stopbits', 1),
+                parity=settings.get('parity', 'N'),
+                xonxoff=settings.get('flow_control', False),
                 timeout=0.1
             )
 
             self.connections[port_name] = ser
             self.running[port_name] = True
-            self.data_queues[port_name] = queue.Queue()
 
-            # Start read thread
-            read_thread = threading.Thread(
-                target=self._read_loop,
-                args=(port_name,),
-                daemon=True
-            )
-            self.read_threads[port_name] = read_thread
-            read_thread.start()
+            if not self._register_port(port_name, ser):
+                # Start read thread
+                read_thread = threading.Thread(
+                    target=self._read_loop,
+                    args=(port_name,),
+                    daemon=True
+                )
+                self.read_threads[port_name] = read_thread
+                read_thread.start()
+            self._set_flush_timer_active(True)
 
             self.connection_status_changed.emit(port_name, True)
             return True
 
         except serial.SerialException as e:
-            self.error_occurred.emit(port_name, str(e))
+            self.error_occurred.emit(port_name, f"Connection error: {str(e)}")
+            return False
+        except ValueError as e:
+            self.error_occurred.emit(port_name, f"Invalid settings: {str(e)}")
+            return False
+        except Exception as e:
+            self.error_occurred.emit(port_name, f"Unexpected error: {str(e)}")
             return False
 
-    def close_connection(self, port_name: str) -> bool:
-        """Closes the specified serial connection."""
+    def _close(self, port_name: str) -> bool:
+        """Stop reading from a port, close it and release its resources."""
         if port_name not in self.connections:
             return False
 
-        self.running[port_name] = False
-        self.read_threads[port_name].join(timeout=1.0)
-        
+        self._ports_cache = None
         try:
-            self.connections[port_name].close()
+            # Stop read thread
+            self.running[port_name] = False
+            if port_name in self.read_threads:
+                self.read_threads[port_name].join(timeout=1.0)
+
+            with self._reactor_lock:
+                # Holding the lock guarantees the reactor is not mid-read
+                self._unregister_port(port_name)
+
+                # Close port
+                if self.connections[port_name].is_open:
+                    self.connections[port_name].close()
+            
+            # Clean up resources
             del self.connections[port_name]
-            del self.read_threads[port_name]
-            del self.running[port_name]
-            del self.data_queues[port_name]
+            if port_name in self.read_threads:
+                del self.read_threads[port_name]
+            if port_name in self.running:
+                del self.running[port_name]
+
+            # Deliver anything read before the thread stopped
+            self._flush_reads()
+            self._read_buf.pop(port_name, None)
             
             self.connection_status_changed.emit(port_name, False)
             return True
 
         except serial.SerialException as e:
-            self.error_occurred.emit(port_name, str(e))
+            self.error_occurred.emit(port_name, f"Disconnect error: {str(e)}")
+            return False
+        except Exception as e:
+            self.error_occurred.emit(port_name, f"Unexpected error: {str(e)}")
             return False
 
     def write_data(self, port_name: str, data: bytes) -> bool:
@@ -98,7 +187,7 @@ class SerialManager(QObject):
             return True
 
         except serial.SerialException as e:
-            self.error_occurred.emit(port_name, str(e))
+            self._report_error(port_name, "Write error", e)
             return False
 
     def _read_loop(self, port_name: str):
@@ -112,18 +201,129 @@ class SerialManager(QObject):
                 if not ser.is_open:
                     break
 
-                if ser.in_waiting:
-                    data = ser.read(ser.in_waiting)
-                    self.data_queues[port_name].put(data)
-                    self.data_received.emit(port_name, data)
-                else:
-                    time.sleep(0.01)  # Prevent CPU hogging
+                # Block until a byte arrives; the port timeout bounds the wait
+                # so the running flag is still rechecked regularly
+                data = ser.read(1)
+                if not data:
+                    continue
+
+                # Drain whatever else arrived with it in one read
+                waiting = ser.in_waiting
+                if waiting:
+                    data += ser.read(waiting)
+
+                self._buffer_read(port_name, data)
 
             except serial.SerialException as e:
-                self.error_occurred.emit(port_name, f"Read error: {str(e)}")
+                self._report_error(port_name, "Read error", e)
                 self.running[port_name] = False
                 break
 
+    def _register_port(self, port_name: str, ser: serial.Serial) -> bool:
+        """Hand a port to the reactor thread; False if it must use its own thread."""
+        if self._selector is None:
+            return False
+
+        with self._reactor_lock:
+            try:
+                fd = ser.fileno()
+                self._selector.register(fd, selectors.EVENT_READ, data=port_name)
+            except (AttributeError, TypeError, ValueError, OSError):
+                return False
+
+            self._selector_ports[port_name] = fd
+            if self._reactor_thread is None:
+                self._reactor_thread = threading.Thread(target=self._reactor_loop, daemon=True)
+                self._reactor_thread.start()
+        return True
+
+    def _unregister_port(self, port_name: str):
+        """Remove a port from the reactor; the caller holds the reactor lock."""
+        fd = self._selector_ports.pop(port_name, None)
+        if fd is not None:
+            self._selector.unregister(fd)
+
+    def _reactor_loop(self):
+        """Single background thread reading from every registered port."""
+        while True:
+            with self._reactor_lock:
+                # Exit under the lock so _register_port knows to start a new thread
+                if not self._selector_ports:
+                    self._reactor_thread = None
+                    return
+
+            ready = self._selector.select(timeout=0.5)
+
+            with self._reactor_lock:
+                for key, _ in ready:
+                    port_name = key.data
+                    if port_name not in self._selector_ports:
+                        continue  # Closed while we were waiting
+
+                    try:
+                        ser = self.connections[port_name]
+                        data = ser.read(ser.in_waiting or 1)
+                    except (serial.SerialException, OSError) as e:
+                        self._report_error(port_name, "Read error", e)
+                        self.running[port_name] = False
+                        self._unregister_port(port_name)
+                        continue
+
+                    if data:
+                        self._buffer_read(port_name, data)
+
+    def _report_error(self, port_name: str, context: str, error: Exception):
+        """Log an I/O error and emit error_occurred at most once per interval per port."""
+        self.logger.error("%s on %s: %s", context, port_name, error)
+
+        now = time.monotonic()
+        last = self._last_error_emit.get(port_name)
+        if last is None or now - last >= self.error_emit_interval:
+            self._last_error_emit[port_name] = now
+            self.error_occurred.emit(port_name, f"{context}: {error}")
+
+    def _buffer_read(self, port_name: str, data: bytes):
+        """Queue received bytes for the next flush."""
+        with self._read_lock:
+            buf = self._read_buf.setdefault(port_name, bytearray())
+            previous = len(buf)
+            buf += data
+            full = previous < self.flush_size <= len(buf)
+
+        if full:
+            # Flush early on the owning thread so emission order is preserved
+            QMetaObject.invokeMethod(self, '_flush_reads', Qt.ConnectionType.QueuedConnection)
+
+    @pyqtSlot()
+    def _flush_reads(self):
+        """Emit one data_received per port for everything read since the last flush."""
+        with self._read_lock:
+            pending = [(port_name, bytes(buf)) for port_name, buf in self._read_buf.items() if buf]
+            for buf in self._read_buf.values():
+                buf.clear()
+
+        port_signals = self._port_signals
+        for port_name, data in pending:
+            self.data_received.emit(port_name, data)
+            signals = port_signals.get(port_name)
+            if signals is not None:
+                signals.data_received.emit(data)
+
+        if not self.connections:
+            self._set_flush_timer_active(False)
+
+    def _set_flush_timer_active(self, active: bool):
+        """Start or stop the flush timer; ports may be opened and closed off the UI thread."""
+        if QThread.currentThread() != self.thread():
+            # A QTimer may only be driven from the thread that owns it
+            QMetaObject.invokeMethod(self._flush_timer, 'start' if active else 'stop',
+                                     Qt.ConnectionType.QueuedConnection)
+        elif active != self._flush_timer.isActive():
+            if active:
+                self._flush_timer.start()
+            else:
+                self._flush_timer.stop()
+
     def get_connection_status(self, port_name: str) -> bool:
         """Returns the connection status for the specified port."""
         return port_name in self.connections and self.connections[port_name].is_open
@@ -151,92 +351,26 @@ class SerialManager(QObject):
         """Check if a port is connected."""
         return port_name in self.connections and self.connections[port_name].is_open
 
-    def connect_port(self, port_name: str, settings: dict) -> bool:
+    def connect_port(self, port_name: str, settings: Mapping) -> bool:
         """Connect to a serial port with the specified settings."""
-        try:
-            # Check if port is already connected
-            if port_name in self.connections:
-                if self.connections[port_name].is_open:
-                    return True
-                # Try to reopen existing connection
-                try:
-                    self.connections[port_name].open()
-                    self.connection_status_changed.emit(port_name, True)
-                    return True
-                except serial.SerialException as e:
-                    self.error_occurred.emit(port_name, f"Failed to reopen port: {str(e)}")
-                    return False
-
-            # Create new connection
-            ser = serial.Serial(
-                port=port_name,
-                baudrate=settings.get('baudrate', 9600),
-                bytesize=settings.get('bytesize', 8),
-                stopbits=settings.get('stopbits', 1),
-                parity=settings.get('parity', 'N'),
-                xonxoff=settings.get('flow_control', False),
-                timeout=0.1
-            )
-
-            self.connections[port_name] = ser
-            self.running[port_name] = True
-            self.data_queues[port_name] = queue.Queue()
-
-            # Start read thread
-            read_thread = threading.Thread(
-                target=self._read_loop,
-                args=(port_name,),
-                daemon=True
-            )
-            self.read_threads[port_name] = read_thread
-            read_thread.start()
-
-            self.connection_status_changed.emit(port_name, True)
-            return True
+        # Check if port is already connected
+        if port_name in self.connections:
+            if self.connections[port_name].is_open:
+                return True
+            # Try to reopen existing connection
+            try:
+                self.connections[port_name].open()
+                self.connection_status_changed.emit(port_name, True)
+                return True
+            except serial.SerialException as e:
+                self.error_occurred.emit(port_name, f"Failed to reopen port: {str(e)}")
+                return False
 
-        except serial.SerialException as e:
-            self.error_occurred.emit(port_name, f"Connection error: {str(e)}")
-            return False
-        except ValueError as e:
-            self.error_occurred.emit(port_name, f"Invalid settings: {str(e)}")
-            return False
-        except Exception as e:
-            self.error_occurred.emit(port_name, f"Unexpected error: {str(e)}")
-            return False
+        return self._open(port_name, settings)
 
     def disconnect_port(self, port_name: str) -> bool:
         """Disconnect from a serial port."""
-        if port_name not in self.connections:
-            return False
-
-        try:
-            # Stop read thread
-            self.running[port_name] = False
-            if port_name in self.read_threads:
-                self.read_threads[port_name].join(timeout=1.0)
-            
-            # Close port
-            if self.connections[port_name].is_open:
-                self.connections[port_name].close()
-            
-            # Clean up resources
-            del self.connections[port_name]
-            if port_name in self.read_threads:
-                del self.read_threads[port_name]
-            if port_name in self.running:
-                del self.running[port_name]
-            if port_name in self.data_queues:
-                del self.data_queues[port_name]
-            
-            self.connection_status_changed.emit(port_name, False)
-            return True
-
-        except serial.SerialException as e:
-            self.error_occurred.emit(port_name, f"Disconnect error: {str(e)}")
-            return False
-        except Exception as e:
-            self.error_occurred.emit(port_name, f"Unexpected error: {str(e)}")
-            return False
+        return self._close(port_name)
 
     def send_data(self, port_name: str, data: bytes) -> bool:
         """Send data through the specified serial port."""
@@ -253,5 +387,5 @@ class SerialManager(QObject):
             return bytes_written == len(data)
 
         except serial.SerialException as e:
-            self.error_occurred.emit(port_name, f"Send error: {str(e)}")
+            self._report_error(port_name, "Send error", e)
             return False 
\ No newline at end of file
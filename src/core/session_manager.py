@@ -1,6 +1,10 @@
 from typing import Dict, Any
+import gzip
+import hashlib
+import heapq
 import json
 import os
+import re
 from datetime import datetime, timedelta
 import psutil
 import gc
@@ -8,16 +12,57 @@ import logging
 from PyQt6.QtCore import QObject, pyqtSignal, QTimer
 from .config import PERFORMANCE_CONFIG
 
+try:
+    import orjson
+except ImportError:  # Optional accelerator; sessions fall back to the json module
+    orjson = None
+
+try:
+    import blake3
+except ImportError:  # Optional accelerator; digests fall back to hashlib's BLAKE2b
+    blake3 = None
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+def _write_atomic(path: str, payload: bytes):
+    """Write payload in one call via a temp file so readers never see a partial file."""
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _digest(data: bytes) -> Dict[str, str]:
+    """Integrity digest for archived data (not for authentication)."""
+    if blake3 is not None:
+        return {'algorithm': 'blake3', 'hex': blake3.blake3(data).hexdigest()}
+    return {'algorithm': 'blake2b', 'hex': hashlib.blake2b(data, digest_size=32).hexdigest()}
+
 class MemoryManager:
     def __init__(self, threshold_mb: int = PERFORMANCE_CONFIG['memory_threshold']):
         self.threshold_bytes = threshold_mb * 1024 * 1024
         self.last_cleanup = datetime.now()
         self.cleanup_interval = timedelta(seconds=PERFORMANCE_CONFIG['cleanup_interval'])
+        self.sample_every = PERFORMANCE_CONFIG['memory_sample_every']
         self.logger = logging.getLogger(__name__)
+        self._process = psutil.Process()
+        self._checks = 0
 
     def check_memory_usage(self) -> bool:
-        process = psutil.Process()
-        memory_info = process.memory_info()
+        # Count calls rather than time them, so timer jitter never skips a sample
+        self._checks += 1
+        if (self._checks - 1) % self.sample_every:
+            return False
+
+        memory_info = self._process.memory_info()
         
         if memory_info.rss > self.threshold_bytes:
             self.logger.warning(f"Memory usage exceeded threshold: {memory_info.rss / 1024 / 1024:.2f}MB")
@@ -39,6 +84,7 @@ class SessionManager(QObject):
     def __init__(self, app_data_dir: str):
         super().__init__()
         self.app_data_dir = app_data_dir
+        self.data_processor = None  # Set by the owner; its buffers are archived
         self.memory_manager = MemoryManager()
         self.ensure_directories()
         self._start_memory_monitor()
@@ -53,7 +99,7 @@ class SessionManager(QObject):
     def _start_memory_monitor(self):
         self.memory_timer = QTimer()
         self.memory_timer.timeout.connect(self._check_memory)
-        self.memory_timer.start(30000)  # Check every 30 seconds
+        self.memory_timer.start(PERFORMANCE_CONFIG['memory_check_interval'] * 1000)
 
     def _check_memory(self):
         if self.memory_manager.check_memory_usage():
@@ -65,6 +111,9 @@ class SessionManager(QObject):
         self.memory_manager.cleanup()
 
     def _serialize_old_data(self):
+        if self.data_processor is None:
+            return
+
         current_time = datetime.now()
         archive_path = os.path.join(self.app_data_dir, 'archive')
         os.makedirs(archive_path, exist_ok=True)
@@ -72,25 +121,38 @@ class SessionManager(QObject):
         # Archive data older than 1 hour
         cutoff_time = current_time - timedelta(hours=1)
         
-        for port_name, buffer in self.data_processor.buffers.items():
-            old_data = buffer.get_data(end_time=cutoff_time)
-            if old_data:
-                archive_file = os.path.join(
-                    archive_path,
-                    f"{port_name}_{cutoff_time.strftime('%Y%m%d_%H%M%S')}.json"
+        # Snapshot: ports can be added by the receive worker while archiving
+        for port_name in list(self.data_processor.buffers):
+            # POSIX port names such as /dev/ttyUSB0 are paths of their own
+            safe_name = re.sub(r'[^\w.-]', '_', port_name)
+            archive_file = os.path.join(
+                archive_path,
+                f"{safe_name}_{cutoff_time.strftime('%Y%m%d_%H%M%S')}.json.gz"
+            )
+            try:
+                # Runs under the processor's lock, so the buffer cannot change meanwhile
+                self.data_processor.archive_old_data(
+                    port_name, cutoff_time,
+                    lambda old_data, path=archive_file: self._write_archive(path, old_data)
                 )
-                try:
-                    with open(archive_file, 'w') as f:
-                        json.dump([
-                            {
-                                'timestamp': ts.isoformat(),
-                                'data': data.hex()
-                            }
-                            for ts, data in old_data
-                        ], f)
-                    buffer.clear_old_data(cutoff_time)
-                except Exception as e:
-                    self.session_error.emit(f"Failed to archive data: {str(e)}")
+            except Exception as e:
+                self.session_error.emit(f"Failed to archive data: {str(e)}")
+
+    @staticmethod
+    def _write_archive(archive_file: str, old_data: list):
+        # Hex-encode all packets at once; records index into the blob
+        joined = bytearray()
+        records = []
+        for ts, data in old_data:
+            records.append((ts.isoformat(), len(joined), len(data)))
+            joined += data
+
+        # Fastest gzip level; archiving holds up the receive worker
+        _write_atomic(archive_file, gzip.compress(_dumps({
+            'blob': joined.hex(),
+            'records': records,
+            'digest': _digest(joined)
+        }), compresslevel=1))
 
     def save_session(self, session_data: Dict[str, Any], filename: str = None) -> bool:
         """Save current session state."""
@@ -105,8 +167,7 @@ class SessionManager(QObject):
             # Optimize memory before saving
             self._optimize_memory()
 
-            with open(filename, 'w') as f:
-                json.dump(session_data, f, indent=2)
+            _write_atomic(filename, _dumps(session_data))
 
             self.session_saved.emit(filename)
             return True
@@ -134,19 +195,19 @@ class SessionManager(QObject):
         if not os.path.exists(sessions_dir):
             return []
 
-        sessions = []
-        for file in os.listdir(sessions_dir):
-            if file.endswith('.json'):
-                full_path = os.path.join(sessions_dir, file)
-                sessions.append({
-                    'path': full_path,
-                    'name': file,
-                    'date': datetime.fromtimestamp(os.path.getmtime(full_path))
-                })
-
-        # Sort by date, newest first
-        sessions.sort(key=lambda x: x['date'], reverse=True)
-        return sessions[:max_count]
+        # scandir entries carry their stat result, avoiding a stat call per file
+        with os.scandir(sessions_dir) as it:
+            entries = [
+                (entry.stat().st_mtime, entry.path, entry.name)
+                for entry in it
+                if entry.name.endswith('.json') and entry.is_file()
+            ]
+
+        # Newest first
+        return [
+            {'path': path, 'name': name, 'date': datetime.fromtimestamp(mtime)}
+            for mtime, path, name in heapq.nlargest(max_count, entries, key=lambda x: x[0])
+        ]
 
     def get_app_data_path(self, *paths: str) -> str:
         """Get full path within app data directory."""
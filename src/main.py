@@ -17,6 +17,12 @@ else:
 from src.ui.main_window import MainWindow
 from src.ui.splash_screen import SplashScreen
 
+try:
+    # Registers the embedded :/icons and :/app resources on import
+    import src.resources.resources_rc  # noqa: F401
+except ImportError:  # Resources not compiled; actions are shown without icons
+    pass
+
 def main():
     # Enable High DPI display
     if hasattr(Qt, 'AA_EnableHighDpiScaling'):
@@ -2,11 +2,39 @@ import os
 import subprocess
 from pathlib import Path
 
+try:
+    from .download_icons import ICON_URLS, download_icons
+except ImportError:  # Run as a script
+    from download_icons import ICON_URLS, download_icons
+
+try:
+    import cairosvg
+except ImportError:  # Optional build tool; icons stay as downloaded
+    cairosvg = None
+
+def prepare_icons(icons_dir: Path):
+    """Fetch missing icons and render any SVG sources to real PNGs."""
+    download_icons()
+
+    if cairosvg is None:
+        print("Warning: cairosvg is not installed; SVG icons are embedded unconverted.")
+        return
+
+    for icon_name in ICON_URLS:
+        icon_path = icons_dir / icon_name
+        if icon_path.exists() and icon_path.read_bytes().lstrip().startswith(b'<svg'):
+            cairosvg.svg2png(url=str(icon_path), write_to=str(icon_path),
+                             output_width=64, output_height=64)
+
 def compile_resources():
     """Compile Qt resources into a Python module."""
     current_dir = Path(__file__).parent
     rcc_file = current_dir / 'resources.qrc'
     py_file = current_dir / 'resources_rc.py'
+
+    # Icons are fetched and converted once at build time and embedded, so
+    # the application never touches the network or icon files at runtime
+    prepare_icons(current_dir / 'icons')
     
     try:
         # Try using PyQt6's rcc tool
@@ -1,5 +1,7 @@
 import os
+import shutil
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 ICON_URLS = {
@@ -17,26 +19,47 @@ ICON_URLS = {
     'settings.png': 'https://raw.githubusercontent.com/FortAwesome/Font-Awesome/master/svgs/solid/cog.svg'
 }
 
+def _download_icon(url: str, icon_path: Path):
+    """Fetch a single icon to icon_path."""
+    # Write beside the target and rename once complete, so an interrupted
+    # download never leaves a partial icon that counts as present
+    tmp_path = icon_path.with_name(icon_path.name + '.tmp')
+    request = urllib.request.Request(url, headers={'User-Agent': 'SynapseLink'})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response, open(tmp_path, 'wb') as f:
+            shutil.copyfileobj(response, f)
+        os.replace(tmp_path, icon_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
 def download_icons():
     """Download and prepare icons for the application."""
     current_dir = Path(__file__).parent
     icons_dir = current_dir / 'icons'
     icons_dir.mkdir(exist_ok=True)
-    
-    for icon_name, url in ICON_URLS.items():
-        icon_path = icons_dir / icon_name
-        if not icon_path.exists():
+
+    missing = {
+        icon_name: url for icon_name, url in ICON_URLS.items()
+        if not (icons_dir / icon_name).exists()
+    }
+
+    # Downloads are latency bound, so fetch them all concurrently
+    with ThreadPoolExecutor(max_workers=max(1, len(missing))) as executor:
+        futures = {}
+        for icon_name, url in missing.items():
+            print(f"Downloading {icon_name}...")
+            futures[executor.submit(_download_icon, url, icons_dir / icon_name)] = icon_name
+
+        for future in as_completed(futures):
+            icon_name = futures[future]
             try:
-                print(f"Downloading {icon_name}...")
-                urllib.request.urlretrieve(url, icon_path)
+                future.result()
                 print(f"Successfully downloaded {icon_name}")
             except Exception as e:
                 print(f"Failed to download {icon_name}: {str(e)}")
-                continue
 
     print("\nAll icons have been downloaded.")
-    print("Note: SVG files need to be converted to PNG format.")
-    print("Please use an SVG to PNG converter or image editing software to convert the icons.")
 
 if __name__ == '__main__':
     download_icons() 
\ No newline at end of file
@@ -1,7 +1,31 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                                QLineEdit, QPushButton, QMessageBox, QTabWidget,
                                QWidget, QFormLayout, QComboBox, QListWidget)
-from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+class AuthWorkerSignals(QObject):
+    finished = pyqtSignal(str, bool)  # username, authenticated
+
+class AuthWorker(QRunnable):
+    """Verifies credentials off the UI thread."""
+
+    def __init__(self, security_manager, username: str, password: bytearray):
+        super().__init__()
+        self.security_manager = security_manager
+        self.username = username
+        self.password = password
+        self.signals = AuthWorkerSignals()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            ok = self.security_manager.authenticate(self.username, self.password)
+        except Exception:
+            ok = False
+        finally:
+            # Best-effort: drop the plaintext as soon as it has been checked
+            self.password[:] = bytes(len(self.password))
+        self.signals.finished.emit(self.username, ok)
 
 class LoginDialog(QDialog):
     """Dialog for user authentication."""
@@ -25,6 +49,7 @@ class LoginDialog(QDialog):
         
         self.password_edit = QLineEdit()
         self.password_edit.setEchoMode(QLineEdit.EchoMode.Password)
+        self.password_edit.returnPressed.connect(self.try_login)
         form_layout.addRow("Password:", self.password_edit)
         
         layout.addLayout(form_layout)
@@ -32,9 +57,9 @@ class LoginDialog(QDialog):
         # Buttons
         button_layout = QHBoxLayout()
         
-        login_button = QPushButton("Login")
-        login_button.clicked.connect(self.try_login)
-        button_layout.addWidget(login_button)
+        self.login_button = QPushButton("Login")
+        self.login_button.clicked.connect(self.try_login)
+        button_layout.addWidget(self.login_button)
         
         cancel_button = QPushButton("Cancel")
         cancel_button.clicked.connect(self.reject)
@@ -44,10 +69,26 @@ class LoginDialog(QDialog):
 
     def try_login(self):
         """Attempt to log in with provided credentials."""
-        username = self.username_edit.text()
-        password = self.password_edit.text()
+        # Ignore repeated submissions while a check is already running
+        if not self.login_button.isEnabled():
+            return
 
-        if self.security_manager.authenticate(username, password):
+        username = self.username_edit.text()
+        password = bytearray(self.password_edit.text(), 'utf-8')
+        self.password_edit.clear()
+
+        # Password hashing is deliberately slow, so verify in the background
+        self.login_button.setEnabled(False)
+        self._auth_worker = AuthWorker(self.security_manager, username, password)
+        self._auth_worker.signals.finished.connect(self.on_auth_finished)
+        QThreadPool.globalInstance().start(self._auth_worker)
+
+    @pyqtSlot(str, bool)
+    def on_auth_finished(self, username: str, authenticated: bool):
+        """Handle the result of a background login attempt."""
+        self._auth_worker = None
+        self.login_button.setEnabled(True)
+        if authenticated:
             self.login_successful.emit(username)
             self.accept()
         else:
@@ -118,9 +159,18 @@ class UserManagementDialog(QDialog):
 
     def refresh_user_list(self):
         """Refresh the list of users."""
-        self.user_list.clear()
-        for username, data in self.security_manager.users.items():
-            self.user_list.addItem(f"{username} ({data['role']})")
+        items = [f"{username} ({data['role']})"
+                 for username, data in self.security_manager.users.items()]
+
+        # Repaint once after the bulk rebuild instead of per item
+        self.user_list.setUpdatesEnabled(False)
+        self.user_list.blockSignals(True)
+        try:
+            self.user_list.clear()
+            self.user_list.addItems(items)
+        finally:
+            self.user_list.blockSignals(False)
+            self.user_list.setUpdatesEnabled(True)
 
     def add_user(self):
         """Add a new user."""
@@ -134,8 +184,7 @@ class UserManagementDialog(QDialog):
             return
 
         # Get current user (admin)
-        admin_username = next((user for user, data in self.security_manager.users.items()
-                             if data['role'] == 'admin'), None)
+        admin_username = self.security_manager.get_admin_username()
         
         if not admin_username:
             QMessageBox.warning(self, "Error", "No admin user found.")
@@ -144,7 +193,7 @@ class UserManagementDialog(QDialog):
         permissions = ['*'] if role == 'admin' else ['read', 'write']
         if self.security_manager.add_user(admin_username, username, password,
                                         role, permissions):
-            self.refresh_user_list()
+            self.user_list.addItem(f"{username} ({role})")
             self.new_username.clear()
             self.new_password.clear()
         else:
@@ -157,11 +206,11 @@ class UserManagementDialog(QDialog):
         if not current_item:
             return
 
-        username = current_item.text().split(' ')[0]
+        # Labels are "<username> (<role>)"; split at the last one so names may contain spaces
+        username, _, _ = current_item.text().rpartition(' (')
         
         # Get current user (admin)
-        admin_username = next((user for user, data in self.security_manager.users.items()
-                             if data['role'] == 'admin'), None)
+        admin_username = self.security_manager.get_admin_username()
         
         if not admin_username:
             QMessageBox.warning(self, "Error", "No admin user found.")
@@ -175,6 +224,6 @@ class UserManagementDialog(QDialog):
                               f"Are you sure you want to remove user {username}?",
                               QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No) == QMessageBox.StandardButton.Yes:
             if self.security_manager.remove_user(admin_username, username):
-                self.refresh_user_list()
+                self.user_list.takeItem(self.user_list.row(current_item))
             else:
                 QMessageBox.warning(self, "Error", "Failed to remove user.") 
\ No newline at end of file
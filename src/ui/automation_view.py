@@ -1,10 +1,39 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTabWidget,
-                               QPushButton, QTextEdit, QLabel, QLineEdit,
+                               QPushButton, QPlainTextEdit, QLabel, QLineEdit,
                                QFileDialog, QMessageBox, QGroupBox, QListWidget,
                                QSpinBox, QComboBox, QFormLayout, QDialog)
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
 import json
+import hashlib
 from datetime import datetime
+from types import MappingProxyType
+
+# Names exposed to user scripts; read-only so every run can share it
+SCRIPT_API = MappingProxyType({
+    'datetime': datetime,
+    'json': json,
+    # Add more API functions as needed
+})
+
+class FileTaskSignals(QObject):
+    done = pyqtSignal(object)  # return value of the task, None if it raised
+
+class FileTask(QRunnable):
+    """Runs a blocking file operation off the UI thread."""
+
+    def __init__(self, func, *args):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.signals = FileTaskSignals()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            result = self.func(*self.args)
+        except Exception:
+            result = None
+        self.signals.done.emit(result)
 
 class ScriptEditor(QWidget):
     """Script editor widget with Python syntax highlighting."""
@@ -12,6 +41,7 @@ class ScriptEditor(QWidget):
     def __init__(self, automation_manager, parent=None):
         super().__init__(parent)
         self.automation_manager = automation_manager
+        self._compiled_cache = {}  # (script_id, source digest) -> code object
         self.setup_ui()
 
     def setup_ui(self):
@@ -24,9 +54,9 @@ class ScriptEditor(QWidget):
         self.script_name.setPlaceholderText("Script Name")
         controls_layout.addWidget(self.script_name)
         
-        load_button = QPushButton("Load")
-        load_button.clicked.connect(self.load_script)
-        controls_layout.addWidget(load_button)
+        self.load_button = QPushButton("Load")
+        self.load_button.clicked.connect(self.load_script)
+        controls_layout.addWidget(self.load_button)
         
         save_button = QPushButton("Save")
         save_button.clicked.connect(self.save_script)
@@ -39,7 +69,7 @@ class ScriptEditor(QWidget):
         layout.addLayout(controls_layout)
 
         # Script editor
-        self.editor = QTextEdit()
+        self.editor = QPlainTextEdit()
         self.editor.setPlaceholderText("Enter your Python script here...")
         layout.addWidget(self.editor)
 
@@ -47,8 +77,9 @@ class ScriptEditor(QWidget):
         output_group = QGroupBox("Output")
         output_layout = QVBoxLayout()
         
-        self.output_text = QTextEdit()
+        self.output_text = QPlainTextEdit()
         self.output_text.setReadOnly(True)
+        self.output_text.setMaximumBlockCount(5000)
         output_layout.addWidget(self.output_text)
         
         clear_button = QPushButton("Clear Output")
@@ -68,12 +99,25 @@ class ScriptEditor(QWidget):
             self, "Load Script", "", "Python Files (*.py)"
         )
         if filename:
-            script = self.automation_manager.script_engine.load_script(filename)
-            if script is not None:
-                self.editor.setPlainText(script)
-                self.script_name.setText(filename)
-            else:
-                QMessageBox.warning(self, "Error", "Failed to load script.")
+            # Read the file in the background; the editor is filled in on_script_loaded
+            self.load_button.setEnabled(False)
+            self._pending_file = filename
+            self._file_task = FileTask(
+                self.automation_manager.script_engine.load_script, filename
+            )
+            self._file_task.signals.done.connect(self.on_script_loaded)
+            QThreadPool.globalInstance().start(self._file_task)
+
+    @pyqtSlot(object)
+    def on_script_loaded(self, script):
+        """Show a script read by the background load task."""
+        self.load_button.setEnabled(True)
+        self._file_task = None
+        if script is not None:
+            self.editor.setPlainText(script)
+            self.script_name.setText(self._pending_file)
+        else:
+            QMessageBox.warning(self, "Error", "Failed to load script.")
 
     def save_script(self):
         """Save the current script to file."""
@@ -82,8 +126,14 @@ class ScriptEditor(QWidget):
         )
         if filename:
             try:
-                with open(filename, 'w') as f:
-                    f.write(self.editor.toPlainText())
+                # Write block by block rather than materialising the whole document
+                with open(filename, 'w', buffering=1 << 20) as f:
+                    block = self.editor.document().begin()
+                    while block.isValid():
+                        f.write(block.text())
+                        block = block.next()
+                        if block.isValid():
+                            f.write('\n')
                 self.script_name.setText(filename)
             except Exception as e:
                 QMessageBox.warning(self, "Error", f"Failed to save script: {str(e)}")
@@ -94,23 +144,36 @@ class ScriptEditor(QWidget):
         if not script:
             return
 
-        # Prepare API for the script
-        api = {
-            'datetime': datetime,
-            'json': json,
-            # Add more API functions as needed
-        }
-
         script_id = self.script_name.text() or "unnamed_script"
-        self.automation_manager.run_script(script_id, script, api)
+        code = self._compile_script(script_id, script)
+        if code is None:
+            return
+        self.automation_manager.run_script(script_id, code, SCRIPT_API)
+
+    def _compile_script(self, script_id: str, script: str):
+        """Compile a script once per distinct source text."""
+        key = (script_id, hashlib.blake2b(script.encode(), digest_size=16).digest())
+        code = self._compiled_cache.get(key)
+        if code is None:
+            try:
+                code = compile(script, script_id, 'exec')
+            except (SyntaxError, ValueError) as e:  # ValueError: source with null bytes
+                self.output_text.appendPlainText(f"Error: {str(e)}")
+                return None
+            # Only the latest revision of each script is worth keeping
+            self._compiled_cache = {
+                k: v for k, v in self._compiled_cache.items() if k[0] != script_id
+            }
+            self._compiled_cache[key] = code
+        return code
 
     def on_script_output(self, script_id: str, output: str):
         """Handle script output."""
-        self.output_text.append(f"[{script_id}] {output}")
+        self.output_text.appendPlainText(f"[{script_id}] {output}")
 
     def on_automation_error(self, error: str):
         """Handle automation errors."""
-        self.output_text.append(f"Error: {error}")
+        self.output_text.appendPlainText(f"Error: {error}")
 
 class MacroRecorder(QWidget):
     """Macro recording and playback interface."""
@@ -135,13 +198,13 @@ class MacroRecorder(QWidget):
         self.record_button.toggled.connect(self.toggle_recording)
         controls_layout.addWidget(self.record_button)
         
-        load_button = QPushButton("Load")
-        load_button.clicked.connect(self.load_macro)
-        controls_layout.addWidget(load_button)
+        self.load_button = QPushButton("Load")
+        self.load_button.clicked.connect(self.load_macro)
+        controls_layout.addWidget(self.load_button)
         
-        save_button = QPushButton("Save")
-        save_button.clicked.connect(self.save_macro)
-        controls_layout.addWidget(save_button)
+        self.save_button = QPushButton("Save")
+        self.save_button.clicked.connect(self.save_macro)
+        controls_layout.addWidget(self.save_button)
         
         play_button = QPushButton("Play")
         play_button.clicked.connect(self.play_macro)
@@ -186,11 +249,18 @@ class MacroRecorder(QWidget):
 
     def refresh_action_list(self):
         """Refresh the list of recorded actions."""
-        self.action_list.clear()
-        for action in self.automation_manager.macro_recorder.actions:
-            self.action_list.addItem(
-                f"{action['type']} - Delay: {action['delay']:.2f}s"
-            )
+        items = [
+            f"{action['type']} - Delay: {action['delay']:.2f}s"
+            for action in self.automation_manager.macro_recorder.actions
+        ]
+
+        # Add all rows in one call and repaint once
+        self.action_list.setUpdatesEnabled(False)
+        try:
+            self.action_list.clear()
+            self.action_list.addItems(items)
+        finally:
+            self.action_list.setUpdatesEnabled(True)
 
     def load_macro(self):
         """Load a macro from file."""
@@ -198,11 +268,18 @@ class MacroRecorder(QWidget):
             self, "Load Macro", "", "Macro Files (*.json)"
         )
         if filename:
-            if self.automation_manager.load_macro(filename):
-                self.macro_name.setText(filename)
-                self.refresh_action_list()
-            else:
-                QMessageBox.warning(self, "Error", "Failed to load macro.")
+            self._start_file_task(self.automation_manager.load_macro, filename,
+                                  self.on_macro_loaded)
+
+    @pyqtSlot(object)
+    def on_macro_loaded(self, ok: bool):
+        """Handle completion of a background macro load."""
+        self._finish_file_task()
+        if ok:
+            self.macro_name.setText(self._pending_file)
+            self.refresh_action_list()
+        else:
+            QMessageBox.warning(self, "Error", "Failed to load macro.")
 
     def save_macro(self):
         """Save the current macro to file."""
@@ -210,10 +287,31 @@ class MacroRecorder(QWidget):
             self, "Save Macro", "", "Macro Files (*.json)"
         )
         if filename:
-            if self.automation_manager.save_macro(filename):
-                self.macro_name.setText(filename)
-            else:
-                QMessageBox.warning(self, "Error", "Failed to save macro.")
+            self._start_file_task(self.automation_manager.save_macro, filename,
+                                  self.on_macro_saved)
+
+    @pyqtSlot(object)
+    def on_macro_saved(self, ok: bool):
+        """Handle completion of a background macro save."""
+        self._finish_file_task()
+        if ok:
+            self.macro_name.setText(self._pending_file)
+        else:
+            QMessageBox.warning(self, "Error", "Failed to save macro.")
+
+    def _start_file_task(self, func, filename: str, on_done):
+        """Run a macro file operation in the background, one at a time."""
+        self.load_button.setEnabled(False)
+        self.save_button.setEnabled(False)
+        self._pending_file = filename
+        self._file_task = FileTask(func, filename)
+        self._file_task.signals.done.connect(on_done)
+        QThreadPool.globalInstance().start(self._file_task)
+
+    def _finish_file_task(self):
+        self._file_task = None
+        self.load_button.setEnabled(True)
+        self.save_button.setEnabled(True)
 
     def play_macro(self):
         """Play the current macro."""
@@ -244,17 +342,25 @@ class MacroRecorder(QWidget):
         # Implement action handling based on your application's needs
         pass
 
+    def _append_event(self, text: str):
+        """Append a status row, following the tail only if already scrolled there."""
+        scroll_bar = self.action_list.verticalScrollBar()
+        at_bottom = scroll_bar.value() == scroll_bar.maximum()
+        self.action_list.addItem(text)
+        if at_bottom:
+            self.action_list.scrollToBottom()
+
     def on_macro_started(self, name: str):
         """Handle macro start event."""
-        self.action_list.addItem(f"Started macro: {name}")
+        self._append_event(f"Started macro: {name}")
 
     def on_macro_finished(self, name: str):
         """Handle macro finish event."""
-        self.action_list.addItem(f"Finished macro: {name}")
+        self._append_event(f"Finished macro: {name}")
 
     def on_automation_error(self, error: str):
         """Handle automation errors."""
-        self.action_list.addItem(f"Error: {error}")
+        self._append_event(f"Error: {error}")
 
 class AutomationView(QWidget):
     """Main automation interface combining script editor and macro recorder."""
@@ -267,15 +373,26 @@ class AutomationView(QWidget):
     def setup_ui(self):
         layout = QVBoxLayout(self)
 
-        # Create tab widget
-        tab_widget = QTabWidget()
-        
-        # Add script editor
-        script_editor = ScriptEditor(self.automation_manager)
-        tab_widget.addTab(script_editor, "Script Editor")
-        
-        # Add macro recorder
-        macro_recorder = MacroRecorder(self.automation_manager)
-        tab_widget.addTab(macro_recorder, "Macro Recorder")
-        
-        layout.addWidget(tab_widget) 
\ No newline at end of file
+        # Create tab widget; each page is built the first time it is shown
+        self.tab_widget = QTabWidget()
+        self._tab_factories = [ScriptEditor, MacroRecorder]
+        self._tab_pages = {}
+
+        for title in ("Script Editor", "Macro Recorder"):
+            placeholder = QWidget()
+            placeholder_layout = QVBoxLayout(placeholder)
+            placeholder_layout.setContentsMargins(0, 0, 0, 0)
+            self.tab_widget.addTab(placeholder, title)
+
+        self.tab_widget.currentChanged.connect(self.ensure_tab_built)
+        self.ensure_tab_built(self.tab_widget.currentIndex())
+
+        layout.addWidget(self.tab_widget)
+
+    def ensure_tab_built(self, index: int):
+        """Construct the page for a tab on its first activation."""
+        if index < 0 or index in self._tab_pages:
+            return
+        page = self._tab_factories[index](self.automation_manager)
+        self.tab_widget.widget(index).layout().addWidget(page)
+        self._tab_pages[index] = page 
\ No newline at end of file
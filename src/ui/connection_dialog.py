@@ -1,6 +1,27 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                                QComboBox, QPushButton, QGroupBox)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import (Qt, QObject, QRunnable, QSignalBlocker, QThreadPool,
+                          pyqtSignal, pyqtSlot)
+
+class PortScannerSignals(QObject):
+    ports_ready = pyqtSignal(object)  # sequence of (device, description)
+
+class PortScanner(QRunnable):
+    """Enumerates serial ports off the UI thread."""
+
+    def __init__(self, serial_manager, use_cache: bool = True):
+        super().__init__()
+        self.serial_manager = serial_manager
+        self.use_cache = use_cache
+        self.signals = PortScannerSignals()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            ports = self.serial_manager.list_ports(use_cache=self.use_cache)
+        except Exception:
+            ports = ()
+        self.signals.ports_ready.emit(ports)
 
 class ConnectionDialog(QDialog):
     def __init__(self, serial_manager, parent=None):
@@ -23,13 +44,14 @@ class ConnectionDialog(QDialog):
         port_row = QHBoxLayout()
         port_row.addWidget(QLabel("Port:"))
         self.port_combo = QComboBox()
-        self.refresh_ports()
         port_row.addWidget(self.port_combo)
 
         # Refresh button
-        refresh_button = QPushButton("Refresh")
-        refresh_button.clicked.connect(self.refresh_ports)
-        port_row.addWidget(refresh_button)
+        self.refresh_button = QPushButton("Refresh")
+        # An explicit refresh always rescans; opening the dialog may reuse a recent scan
+        self.refresh_button.clicked.connect(lambda: self.refresh_ports(use_cache=False))
+        port_row.addWidget(self.refresh_button)
+        self.refresh_ports()
 
         port_layout.addLayout(port_row)
         port_group.setLayout(port_layout)
@@ -50,12 +72,37 @@ class ConnectionDialog(QDialog):
 
         layout.addLayout(button_layout)
 
-    def refresh_ports(self):
-        self.port_combo.clear()
-        for port, description in self.serial_manager.list_ports():
-            self.port_combo.addItem(f"{port} - {description}", port)
+    def refresh_ports(self, use_cache: bool = True):
+        # Port enumeration can block for a long time, so scan in the background
+        self.refresh_button.setEnabled(False)
+        self._scanner = PortScanner(self.serial_manager, use_cache)
+        self._scanner.signals.ports_ready.connect(self.populate_ports)
+        QThreadPool.globalInstance().start(self._scanner)
+
+    @pyqtSlot(object)
+    def populate_ports(self, ports):
+        previous = self.port_combo.currentData()
+
+        # Rebuild silently and with a single repaint, then announce the result once
+        blocker = QSignalBlocker(self.port_combo)
+        self.port_combo.setUpdatesEnabled(False)
+        try:
+            self.port_combo.clear()
+            # Insert every row in one go, then fill in label and port data
+            model = self.port_combo.model()
+            model.insertRows(0, len(ports))
+            for row, (port, description) in enumerate(ports):
+                index = model.index(row, 0)
+                model.setData(index, f"{port} - {description}")
+                model.setData(index, port, Qt.ItemDataRole.UserRole)
+            index = self.port_combo.findData(previous)
+            if index >= 0:
+                self.port_combo.setCurrentIndex(index)
+        finally:
+            self.port_combo.setUpdatesEnabled(True)
+            blocker.unblock()
+        self.port_combo.currentIndexChanged.emit(self.port_combo.currentIndex())
+        self.refresh_button.setEnabled(True)
 
     def get_selected_port(self):
-        if self.port_combo.currentData():
-            return self.port_combo.currentData()
-        return None 
\ No newline at end of file
+        return self.port_combo.currentData() or None 
\ No newline at end of file
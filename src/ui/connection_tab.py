@@ -1,15 +1,161 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTextEdit,
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QPlainTextEdit,
                                QComboBox, QPushButton, QLabel, QSpinBox,
                                QCheckBox, QGroupBox, QSplitter, QMenu, QToolBar,
                                QFileDialog, QMessageBox)
-from PyQt6.QtCore import Qt, pyqtSlot, pyqtSignal
+from PyQt6.QtCore import (Qt, QObject, QRunnable, QSignalBlocker, QThreadPool, QTimer,
+                          pyqtSlot, pyqtSignal)
 from PyQt6.QtGui import QTextCursor, QFont, QAction
-import datetime
+import codecs
+from collections import deque
+from functools import lru_cache, partial
+from types import MappingProxyType
+from typing import Mapping, Optional
+import threading
+import time
 
 from .visualization_widget import VisualizationWidget
 from .search_filter_dialog import SearchFilterDialog
 from .protocol_view import ProtocolView
 from core.protocol_analyzer import ProtocolFrame
+from ..core.config import PERFORMANCE_CONFIG
+
+# Parity combo labels mapped to PySerial values
+PARITY_MAP = MappingProxyType({
+    'None': 'N',
+    'Even': 'E',
+    'Odd': 'O',
+    'Mark': 'M',
+    'Space': 'S'
+})
+
+EXPORT_FILE_FILTERS = MappingProxyType({
+    'csv': 'CSV Files (*.csv)',
+    'json': 'JSON Files (*.json)',
+    'xml': 'XML Files (*.xml)'
+})
+
+# Deletes all whitespace from hex input in a single translate pass
+_HEX_STRIP = str.maketrans('', '', ' \t\r\n')
+
+@lru_cache(maxsize=512)
+def _hex_format(data: bytes) -> str:
+    """Hex-view text for a payload; repeated short frames such as heartbeats hit the cache."""
+    return data.hex(' ').upper()
+
+@lru_cache(maxsize=16)
+def _parse_settings(baudrate: str, bytesize: str, stopbits: str, parity: str) -> Mapping:
+    """Convert the settings combo texts into (read-only) serial port settings."""
+    return MappingProxyType({
+        'baudrate': int(baudrate),
+        'bytesize': int(bytesize),
+        'stopbits': float(stopbits),
+        'parity': PARITY_MAP[parity]
+    })
+
+class ReceiveSignals(QObject):
+    text_ready = pyqtSignal(str)  # formatted display text
+
+class ReceiveWorker(QRunnable):
+    """Filters and formats one port's received chunks on the thread pool."""
+
+    def __init__(self, data_processor, port_name: str):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.data_processor = data_processor
+        self.port_name = port_name
+        self.signals = ReceiveSignals()
+        # Bounded so a stalled UI drops the oldest chunks instead of growing forever
+        self._queue = deque(maxlen=PERFORMANCE_CONFIG['receive_queue_size'])
+        self._lock = threading.Lock()
+        self._scheduled = False
+        # Keeps UTF-8 sequences split across chunks instead of failing the whole chunk
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    def submit(self, data: bytes, hex_view: bool, timestamp: Optional[str]):
+        """Queue a chunk and make sure a drain is scheduled."""
+        with self._lock:
+            self._queue.append((data, hex_view, timestamp))
+            if self._scheduled:
+                return
+            self._scheduled = True
+        QThreadPool.globalInstance().start(self)
+
+    def clear(self):
+        """Discard chunks that have not been processed yet."""
+        with self._lock:
+            self._queue.clear()
+            self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            while True:
+                with self._lock:
+                    items = list(self._queue)
+                    self._queue.clear()
+                    if not items:
+                        self._scheduled = False
+                        return
+                self.signals.text_ready.emit(''.join(map(self._format, items)))
+        except BaseException:
+            with self._lock:
+                self._scheduled = False
+            raise
+
+    def _format(self, item) -> str:
+        data, hex_view, timestamp = item
+
+        # Process data through filters and patterns
+        processed_data = self.data_processor.process_data(self.port_name, data)
+
+        if hex_view:
+            if len(processed_data) <= PERFORMANCE_CONFIG['hex_cache_max_length']:
+                display_text = _hex_format(processed_data)
+            else:
+                display_text = processed_data.hex(' ').upper()
+        else:
+            display_text = self._decoder.decode(processed_data)
+
+        if timestamp is not None:
+            display_text = f'[{timestamp}] {display_text}'
+        return display_text
+
+class SerialTaskSignals(QObject):
+    finished = pyqtSignal(str, object)  # task name, result or raised exception
+
+class SerialTaskQueue(QRunnable):
+    """Runs a tab's blocking serial calls on the thread pool, one at a time and in order."""
+
+    def __init__(self):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = SerialTaskSignals()
+        self._tasks = deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+
+    def submit(self, name: str, func, *args):
+        """Queue a call; its outcome is reported through signals.finished."""
+        with self._lock:
+            self._tasks.append((name, func, args))
+            if self._scheduled:
+                return
+            self._scheduled = True
+        QThreadPool.globalInstance().start(self)
+
+    @pyqtSlot()
+    def run(self):
+        while True:
+            with self._lock:
+                if not self._tasks:
+                    self._scheduled = False
+                    return
+                name, func, args = self._tasks.popleft()
+            try:
+                result = func(*args)
+            except Exception as e:
+                result = e
+            self.signals.finished.emit(name, result)
 
 class ConnectionTab(QWidget):
     """Tab widget for a single serial connection."""
@@ -26,6 +172,27 @@ class ConnectionTab(QWidget):
         self.port_name = port_name
         self.protocol_analyzer = protocol_analyzer
         self.security_manager = security_manager
+
+        # Received chunks are filtered and formatted off the UI thread
+        self._receiver = ReceiveWorker(data_processor, port_name)
+        self._receiver.signals.text_ready.connect(self._on_text_ready)
+
+        # Opening, closing and writing to a port can block, so they run in order off the UI thread
+        self._serial_tasks = SerialTaskQueue()
+        self._serial_tasks.signals.finished.connect(self._on_serial_task_finished)
+
+        # Received text is buffered and inserted into the display once per interval
+        self._pending_chunks = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(PERFORMANCE_CONFIG['display_flush_interval'])
+        self._flush_timer.timeout.connect(self._flush_pending)
+        # Full redraws requested in between flushes collapse into one
+        self._update_pending = False
+
+        # Timestamp prefix is formatted once per second; only the milliseconds vary
+        self._ts_second = None
+        self._ts_prefix = ''
         
         # Initialize UI
         self.setup_ui()
@@ -69,8 +236,10 @@ class ConnectionTab(QWidget):
         display_layout.addLayout(control_layout)
 
         # Data display
-        self.data_display = QTextEdit()
+        self.data_display = QPlainTextEdit()
         self.data_display.setReadOnly(True)
+        self.data_display.setUndoRedoEnabled(False)
+        self.data_display.setMaximumBlockCount(PERFORMANCE_CONFIG['display_max_lines'])
         display_layout.addWidget(self.data_display)
 
         display_group.setLayout(display_layout)
@@ -102,20 +271,26 @@ class ConnectionTab(QWidget):
         export_menu = QMenu("Export", self)
         
         export_csv = QAction("Export as CSV", self)
-        export_csv.triggered.connect(lambda: self.export_data('csv'))
+        export_csv.triggered.connect(partial(self.export_data, 'csv'))
         export_menu.addAction(export_csv)
         
         export_json = QAction("Export as JSON", self)
-        export_json.triggered.connect(lambda: self.export_data('json'))
+        export_json.triggered.connect(partial(self.export_data, 'json'))
         export_menu.addAction(export_json)
         
         export_xml = QAction("Export as XML", self)
-        export_xml.triggered.connect(lambda: self.export_data('xml'))
+        export_xml.triggered.connect(partial(self.export_data, 'xml'))
         export_menu.addAction(export_xml)
 
         export_action = toolbar.addAction("Export")
         export_action.setMenu(export_menu)
 
+        # Stream received data to disk instead of exporting it all at the end
+        self.record_button = QPushButton("Record to File")
+        self.record_button.setCheckable(True)
+        self.record_button.toggled.connect(self.toggle_recording)
+        toolbar.addWidget(self.record_button)
+
         toolbar.addSeparator()
 
         # Add visualization toggle
@@ -216,55 +391,74 @@ class ConnectionTab(QWidget):
 
     def setup_signals(self):
         """Setup signal connections."""
-        # Serial manager signals
-        self.serial_manager.data_received.connect(self.handle_received_data)
-        self.serial_manager.connection_status_changed.connect(self.handle_connection_status)
-        self.serial_manager.error_occurred.connect(self.handle_error)
-
-        # Protocol analyzer signals
-        self.protocol_analyzer.frame_detected.connect(self.on_frame_detected)
-        self.protocol_analyzer.error_detected.connect(self.on_error_detected)
-
-        # Security manager signals
-        self.security_manager.security_error.connect(self.on_security_error)
-
-        # UI signals
-        self.send_button.clicked.connect(self.send_data)
+        # Signals of shared managers outlive this tab, so keep them for close_connection
+        self._manager_connections = [
+            # Only this port's data is delivered, so other tabs' traffic never reaches us
+            (self.serial_manager.port_signals(self.port_name).data_received,
+             self.handle_received_data),
+            (self.serial_manager.connection_status_changed, self.handle_connection_status),
+            (self.serial_manager.error_occurred, self.handle_error),
+            (self.protocol_analyzer.frame_detected, self.on_frame_detected),
+            (self.protocol_analyzer.error_detected, self.on_error_detected),
+            (self.security_manager.security_error, self.on_security_error),
+            (self.data_processor.error_detected, self.on_processing_error),
+        ]
+        for signal, slot in self._manager_connections:
+            signal.connect(slot)
+
+        # UI signals (send_button is connected where it is created)
         self.search_button.clicked.connect(self.show_search_dialog)
         
         # Visualization signals
         if hasattr(self, 'visualization'):
             self.visualization.update_requested.connect(self.update_display)
 
-    @pyqtSlot(str, bytes)
-    def handle_received_data(self, port, data):
-        if port != self.port_name:
-            return
-
-        # Process data through filters and patterns
-        processed_data = self.data_processor.process_data(port, data)
+    @pyqtSlot(bytes)
+    def handle_received_data(self, data):
+        # Display options are sampled here so the worker never touches widgets
+        timestamp = self._timestamp() if self.show_timestamp.isChecked() else None
+        self._receiver.submit(data, self.hex_view.isChecked(), timestamp)
 
-        if self.hex_view.isChecked():
-            display_text = ' '.join(f'{b:02X}' for b in processed_data)
-        else:
-            try:
-                display_text = processed_data.decode('utf-8')
-            except UnicodeDecodeError:
-                display_text = ' '.join(f'{b:02X}' for b in processed_data)
+        # Analyze received data
+        if self.protocol_button.isChecked():
+            self.protocol_analyzer.analyze_frame(self.port_name, data)
 
-        if self.show_timestamp.isChecked():
-            timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-            display_text = f'[{timestamp}] {display_text}'
+    def _timestamp(self) -> str:
+        """Current local time as 'YYYY-mm-dd HH:MM:SS.mmm'."""
+        now_ms = int(time.time() * 1000)
+        second, ms = divmod(now_ms, 1000)
+        if second != self._ts_second:
+            self._ts_second = second
+            self._ts_prefix = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(second))
+        return f'{self._ts_prefix}.{ms:03d}'
+
+    @pyqtSlot(str)
+    def _on_text_ready(self, text):
+        self._pending_chunks.append(text)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush_pending(self):
+        """Insert all text received since the last flush in a single edit."""
+        if self._update_pending:
+            # The full redraw already includes everything still pending
+            self._update_pending = False
+            self._refresh_display()
+            return
+        if not self._pending_chunks:
+            return
+        text = ''.join(self._pending_chunks)
+        self._pending_chunks.clear()
 
-        self.data_display.moveCursor(QTextCursor.MoveOperation.End)
-        self.data_display.insertPlainText(display_text)
-        
         if self.auto_scroll.isChecked():
+            # Inserting at the visible cursor leaves it at the end and keeps it in view
             self.data_display.moveCursor(QTextCursor.MoveOperation.End)
-
-        # Analyze received data
-        if self.protocol_button.isChecked():
-            self.protocol_analyzer.analyze_frame(self.port_name, data)
+            self.data_display.insertPlainText(text)
+        else:
+            # A separate cursor appends without moving the user's cursor, selection or scroll
+            cursor = QTextCursor(self.data_display.document())
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.insertText(text)
 
     @pyqtSlot(str, bool)
     def handle_connection_status(self, port, connected):
@@ -298,61 +492,93 @@ class ConnectionTab(QWidget):
 
     def export_data(self, format_type):
         """Export data in the specified format."""
-        file_filters = {
-            'csv': 'CSV Files (*.csv)',
-            'json': 'JSON Files (*.json)',
-            'xml': 'XML Files (*.xml)'
-        }
-
         filename, _ = QFileDialog.getSaveFileName(
             self,
             "Export Data",
             "",
-            file_filters[format_type]
+            EXPORT_FILE_FILTERS[format_type]
         )
 
         if filename:
             self.data_processor.export_data(self.port_name, format_type, filename)
 
+    def toggle_recording(self, checked):
+        """Start or stop streaming received data to a file."""
+        if not checked:
+            filename = self.data_processor.stop_recording(self.port_name)
+            if filename:
+                self.status_label.setText(f"Recording saved to {filename}")
+            return
+
+        filename, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Record to File",
+            "",
+            ';;'.join(EXPORT_FILE_FILTERS.values())
+        )
+        format_type = next(
+            (fmt for fmt, file_filter in EXPORT_FILE_FILTERS.items()
+             if file_filter == selected_filter),
+            'csv'
+        )
+
+        if filename and self.data_processor.start_recording(
+                self.port_name, format_type, filename):
+            self.status_label.setText(f"Recording to {filename}")
+        else:
+            with QSignalBlocker(self.record_button):
+                self.record_button.setChecked(False)
+            if filename:
+                self.status_label.setText("Failed to start recording")
+
     def toggle_connection(self):
         """Toggle the serial connection."""
         try:
+            # The button stays disabled until the queued open or close completes
+            self.connect_button.setEnabled(False)
             if self.serial_manager.is_connected(self.port_name):
-                if self.serial_manager.disconnect_port(self.port_name):
-                    self.connect_button.setChecked(False)
-                    self.connect_button.setText("Connect")
-                    self.status_label.setText(f"Disconnected from {self.port_name}")
-                    self.encryption_button.setEnabled(False)
+                self._serial_tasks.submit('disconnect', self.serial_manager.disconnect_port,
+                                          self.port_name)
             else:
-                # Map parity selection to PySerial values
-                parity_map = {
-                    'None': 'N',
-                    'Even': 'E',
-                    'Odd': 'O',
-                    'Mark': 'M',
-                    'Space': 'S'
-                }
-                
-                settings = {
-                    'baudrate': int(self.baud_rate.currentText()),
-                    'bytesize': int(self.data_bits.currentText()),
-                    'stopbits': float(self.stop_bits.currentText()),
-                    'parity': parity_map[self.parity.currentText()].upper()  # Ensure uppercase
-                }
-                
-                if self.serial_manager.connect_port(self.port_name, settings):
-                    self.connect_button.setChecked(True)
-                    self.connect_button.setText("Disconnect")
-                    self.status_label.setText(f"Connected to {self.port_name}")
-                    self.encryption_button.setEnabled(True)
-                else:
-                    self.connect_button.setChecked(False)
-                    self.status_label.setText(f"Failed to connect to {self.port_name}")
+                settings = _parse_settings(
+                    self.baud_rate.currentText(),
+                    self.data_bits.currentText(),
+                    self.stop_bits.currentText(),
+                    self.parity.currentText()
+                )
+                self._serial_tasks.submit('connect', self.serial_manager.connect_port,
+                                          self.port_name, settings)
         except Exception as e:
+            self.connect_button.setEnabled(True)
             self.handle_error(self.port_name, str(e))
             self.connect_button.setChecked(False)
             self.status_label.setText(f"Error: {str(e)}")
 
+    @pyqtSlot(str, object)
+    def _on_serial_task_finished(self, name, result):
+        """Update the UI once a queued serial call has completed."""
+        if name in ('connect', 'disconnect'):
+            self.connect_button.setEnabled(True)
+
+        if isinstance(result, Exception):
+            self.handle_error(self.port_name, str(result))
+            self.connect_button.setChecked(False)
+            self.status_label.setText(f"Error: {str(result)}")
+        elif name == 'connect':
+            if result:
+                self.connect_button.setChecked(True)
+                self.connect_button.setText("Disconnect")
+                self.status_label.setText(f"Connected to {self.port_name}")
+                self.encryption_button.setEnabled(True)
+            else:
+                self.connect_button.setChecked(False)
+                self.status_label.setText(f"Failed to connect to {self.port_name}")
+        elif name == 'disconnect' and result:
+            self.connect_button.setChecked(False)
+            self.connect_button.setText("Connect")
+            self.status_label.setText(f"Disconnected from {self.port_name}")
+            self.encryption_button.setEnabled(False)
+
     def toggle_encryption(self, checked):
         """Toggle encryption for the connection."""
         try:
@@ -363,8 +589,7 @@ class ConnectionTab(QWidget):
                     self.encryption_button.setChecked(False)
                     self.status_label.setText("Failed to enable encryption")
             else:
-                if self.port_name in self.security_manager.encryption_keys:
-                    del self.security_manager.encryption_keys[self.port_name]
+                if self.security_manager.remove_encryption(self.port_name):
                     self.status_label.setText("Encryption disabled")
                 self.encryption_button.setChecked(False)
             
@@ -389,7 +614,7 @@ class ConnectionTab(QWidget):
         if self.send_hex.isChecked():
             try:
                 # Convert hex string to bytes
-                data = bytes.fromhex(data.replace(' ', ''))
+                data = bytes.fromhex(data.translate(_HEX_STRIP))
             except ValueError:
                 QMessageBox.warning(self, "Error", "Invalid hex format")
                 return
@@ -400,7 +625,7 @@ class ConnectionTab(QWidget):
         if self.encryption_button.isChecked():
             data = self.security_manager.encrypt_data(self.port_name, data)
 
-        self.serial_manager.send_data(self.port_name, data)
+        self._serial_tasks.submit('send', self.serial_manager.send_data, self.port_name, data)
         self.data_sent.emit(self.port_name, data)
         
         if not self.send_hex.isChecked():
@@ -408,6 +633,10 @@ class ConnectionTab(QWidget):
 
     def clear_display(self):
         """Clear the data display."""
+        self._receiver.clear()
+        self._flush_timer.stop()
+        self._update_pending = False
+        self._pending_chunks.clear()
         self.data_display.clear()
         self.data_processor.clear_data(self.port_name)
         if hasattr(self, 'visualization'):
@@ -426,27 +655,32 @@ class ConnectionTab(QWidget):
         self.update_display()
 
     def update_display(self):
-        """Update the data display with filtered content."""
+        """Schedule a redraw of the data display on the next flush."""
         if not hasattr(self, 'data_display'):
             return
-        
-        cursor = self.data_display.textCursor()
-        current_position = cursor.position()
-        
-        # Get filtered data from processor
-        filtered_data = self.data_processor.get_filtered_data(self.port_name)
-        
+        self._update_pending = True
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _refresh_display(self):
+        """Replace the data display with the filtered content."""
+        scroll_bar = self.data_display.verticalScrollBar()
+        saved = scroll_bar.value()
+
+        # Only decode as much as the display can hold
+        filtered_data = self.data_processor.get_filtered_data(
+            self.port_name, PERFORMANCE_CONFIG['display_max_lines']
+        )
+
         # Update display
-        self.data_display.clear()
+        self._pending_chunks.clear()
         self.data_display.setPlainText(filtered_data)
-        
-        # Restore cursor position if auto-scroll is off
-        if not self.auto_scroll.isChecked():
-            cursor.setPosition(current_position)
-            self.data_display.setTextCursor(cursor)
+
+        # Keep the viewport where it was unless following the tail
+        if self.auto_scroll.isChecked():
+            scroll_bar.setValue(scroll_bar.maximum())
         else:
-            cursor.movePosition(QTextCursor.MoveOperation.End)
-            self.data_display.setTextCursor(cursor)
+            scroll_bar.setValue(saved)
 
     def toggle_visualization(self, checked):
         """Toggle the visualization widget visibility."""
@@ -458,28 +692,51 @@ class ConnectionTab(QWidget):
 
     def on_frame_detected(self, port: str, frame: ProtocolFrame):
         """Handle detected protocol frame."""
-        if port == self.port_name and self.protocol_button.isChecked():
+        if (port == self.port_name and self.protocol_button.isChecked()
+                and hasattr(self, 'protocol_view')):
             self.protocol_view.add_frame(frame)
 
     def on_error_detected(self, port: str, error_type: str, description: str):
         """Handle protocol error."""
-        if port == self.port_name and self.protocol_button.isChecked():
+        if (port == self.port_name and self.protocol_button.isChecked()
+                and hasattr(self, 'protocol_view')):
             self.protocol_view.add_error(error_type, description)
 
     def on_security_error(self, error: str):
         """Handle security-related errors."""
         QMessageBox.warning(self, "Security Error", error)
 
+    def on_processing_error(self, port: str, error: str):
+        """Handle data processing errors, such as a recording that had to stop."""
+        if port != self.port_name:
+            return
+
+        self.status_label.setText(f"Error: {error}")
+        with QSignalBlocker(self.record_button):
+            self.record_button.setChecked(False)
+
     def close_connection(self):
         """Clean up resources when closing the connection."""
+        # Stop receiving manager signals; a closed tab must not keep processing traffic
+        for signal, slot in self._manager_connections:
+            try:
+                signal.disconnect(slot)
+            except TypeError:
+                pass  # Already disconnected
+        self._manager_connections = []
+
+        self._receiver.clear()
+        self._flush_timer.stop()
+        self.data_processor.stop_recording(self.port_name)
+
         # Stop visualization updates
-        if hasattr(self, 'visualization') and self.visualization:
+        if (hasattr(self, 'visualization') and self.visualization
+                and self.visualization.update_timer is not None):
             self.visualization.update_timer.stop()
             self.visualization.update_timer = None
         
         # Clean up security
-        if self.port_name in self.security_manager.encryption_keys:
-            del self.security_manager.encryption_keys[self.port_name]
+        self.security_manager.remove_encryption(self.port_name)
         
         # Clear protocol buffer
         self.protocol_analyzer.clear_buffer(self.port_name)
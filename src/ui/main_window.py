@@ -2,30 +2,23 @@ from PyQt6.QtWidgets import (QMainWindow, QTabWidget, QMenuBar, QMenu,
                                QToolBar, QDockWidget, QStatusBar, QMessageBox,
                                QFileDialog, QVBoxLayout, QWidget, QDialog,
                                QSplitter, QPushButton)
-from PyQt6.QtCore import Qt, QSettings, pyqtSlot, QSize
+from PyQt6.QtCore import Qt, QSettings, QTimer, pyqtSlot, QSize
 from PyQt6.QtGui import QAction, QIcon
 import os
 import sys
-import qdarkstyle
-from pathlib import Path
-from datetime import datetime
-import json
+from functools import cached_property
 
 from src.ui.connection_dialog import ConnectionDialog
 from src.ui.connection_tab import ConnectionTab
 from src.ui.protocol_view import ProtocolView
-from src.ui.auth_dialog import LoginDialog, UserManagementDialog
-from src.ui.security_dialog import SecuritySettingsDialog
-from src.ui.automation_view import AutomationView
-from src.ui.tab_selection_dialog import TabSelectionDialog
 from src.core.serial_manager import SerialManager
 from src.core.data_processor import DataProcessor
-from src.core.protocol_analyzer import ProtocolAnalyzer
-from src.core.security_manager import SecurityManager
-from src.core.automation_manager import AutomationManager
 from src.core.session_manager import SessionManager
 
 class MainWindow(QMainWindow):
+    # Loading the dark stylesheet reads and assembles a large template; do it once
+    _dark_stylesheet_cache = None
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("SynapseLink")
@@ -35,12 +28,17 @@ class MainWindow(QMainWindow):
         
         # Initialize managers
         self.settings = QSettings("SynapseLink", "SynapseLink")
+        self._settings_cache = {}
+        self._applied_dark_mode = None  # theme currently set on the window
         self.session_manager = SessionManager(self.app_data_dir)
         self.serial_manager = SerialManager()
         self.data_processor = DataProcessor()
-        self.protocol_analyzer = ProtocolAnalyzer()
-        self.security_manager = SecurityManager()
-        self.automation_manager = AutomationManager()
+        self.session_manager.data_processor = self.data_processor
+        self._sessions_dir = self.session_manager.get_app_data_path('sessions')
+        # Protocol, security and automation managers are created on first access
+
+        # Open connection tabs in creation order, and by port
+        self._connection_tabs = {}  # insertion-ordered set of open ConnectionTabs
         
         # Create split view button (before toolbar creation)
         self.split_view_button = QPushButton("Enable Split View")
@@ -78,24 +76,17 @@ class MainWindow(QMainWindow):
         self.main_splitter.setSizes([1200, 0])
         
         # Connect signals
-        self.left_tabs.tabCloseRequested.connect(lambda idx: self.close_tab(idx, is_left=True))
-        self.right_tabs.tabCloseRequested.connect(lambda idx: self.close_tab(idx, is_left=False))
+        self.left_tabs.tabCloseRequested.connect(self._close_left_tab)
+        self.right_tabs.tabCloseRequested.connect(self._close_right_tab)
         self.split_view_button.clicked.connect(self.toggle_split_view)
 
-        # Create automation view (hidden by default)
-        self.automation_view = AutomationView(self.automation_manager)
-        self.automation_view.hide()
-        self.layout.addWidget(self.automation_view)
+        # Automation and protocol views are hidden by default; built on first use
+        self.automation_view = None
+        self.protocol_view = None
+        self.protocol_dock = None
 
-        # Create protocol view dock
-        self.protocol_dock = QDockWidget("Protocol Analysis", self)
-        self.protocol_view = ProtocolView()
-        self.protocol_dock.setWidget(self.protocol_view)
-        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.protocol_dock)
-        self.protocol_dock.hide()
-
-        # Apply initial theme
-        self.apply_theme()
+        # Apply initial theme once the event loop runs, so it does not delay the first paint
+        QTimer.singleShot(0, self.apply_theme)
 
         # Setup signals
         self.setup_signals()
@@ -104,12 +95,40 @@ class MainWindow(QMainWindow):
         self.restore_geometry()
 
         # Hide window initially if security is enabled
-        if self.settings.value("security_enabled", True, type=bool):
+        if self._get_setting("security_enabled", True, bool):
             self.hide()
             self.show_login_dialog()
         else:
             self.show()
 
+    @cached_property
+    def protocol_analyzer(self):
+        from src.core.protocol_analyzer import ProtocolAnalyzer
+        analyzer = ProtocolAnalyzer()
+        # Queued so frame producers never wait on the protocol view
+        analyzer.frame_detected.connect(self.handle_protocol_frame,
+                                        Qt.ConnectionType.QueuedConnection)
+        analyzer.error_detected.connect(self.handle_protocol_error)
+        return analyzer
+
+    @cached_property
+    def security_manager(self):
+        from src.core.security_manager import SecurityManager
+        manager = SecurityManager()
+        manager.auth_status_changed.connect(self.handle_auth_status)
+        manager.access_denied.connect(self.handle_access_denied)
+        manager.security_error.connect(self.handle_security_error)
+        return manager
+
+    @cached_property
+    def automation_manager(self):
+        from src.core.automation_manager import AutomationManager
+        manager = AutomationManager()
+        manager.macro_started.connect(self.handle_macro_started)
+        manager.macro_finished.connect(self.handle_macro_finished)
+        manager.automation_error.connect(self.handle_automation_error)
+        return manager
+
     def setup_ui(self):
         """Initialize the user interface."""
         self.setMinimumSize(1200, 800)
@@ -217,6 +236,7 @@ class MainWindow(QMainWindow):
             self.protocol_analyzer,
             self.security_manager
         )
+        self._connection_tabs[tab] = None
         
         # Add to the tab widget with fewer tabs
         if self.left_tabs.count() <= self.right_tabs.count():
@@ -225,58 +245,119 @@ class MainWindow(QMainWindow):
         else:
             self.right_tabs.addTab(tab, port)
             self.right_tabs.setCurrentWidget(tab)
+        return tab
 
     def close_tab(self, index, is_left=True):
         """Close a connection tab."""
         tab_widget = self.left_tabs if is_left else self.right_tabs
         tab = tab_widget.widget(index)
-        if isinstance(tab, ConnectionTab):
+        if tab in self._connection_tabs:
+            del self._connection_tabs[tab]
             if self.serial_manager.get_connection_status(tab.port_name):
                 self.serial_manager.close_connection(tab.port_name)
+            tab.close_connection()
         tab_widget.removeTab(index)
 
+    def _get_setting(self, key, default=None, value_type=None):
+        """Read a setting once and serve later reads from memory."""
+        if key not in self._settings_cache:
+            if value_type is None:
+                value = self.settings.value(key, default)
+            else:
+                value = self.settings.value(key, default, type=value_type)
+            self._settings_cache[key] = value
+        return self._settings_cache[key]
+
+    def _set_setting(self, key, value):
+        """Write a setting only when it differs from the cached value."""
+        if key in self._settings_cache and self._settings_cache[key] == value:
+            return
+        self._settings_cache[key] = value
+        self.settings.setValue(key, value)
+
+    @pyqtSlot(int)
+    def _close_left_tab(self, index):
+        self.close_tab(index, is_left=True)
+
+    @pyqtSlot(int)
+    def _close_right_tab(self, index):
+        self.close_tab(index, is_left=False)
+
     def toggle_dark_mode(self):
         """Toggle between light and dark themes."""
-        self.settings.setValue("dark_mode", not self.is_dark_mode())
+        self._set_setting("dark_mode", not self.is_dark_mode())
         self.apply_theme()
 
     def is_dark_mode(self):
         """Check if dark mode is enabled."""
-        return self.settings.value("dark_mode", True, type=bool)
+        return self._get_setting("dark_mode", True, bool)
 
     def apply_theme(self):
         """Apply the current theme."""
-        if self.is_dark_mode():
-            self.setStyleSheet(qdarkstyle.load_stylesheet(qt_api='pyqt6'))
+        # Setting a stylesheet invalidates every widget's style; skip it if nothing changed
+        dark_mode = self.is_dark_mode()
+        if dark_mode == self._applied_dark_mode:
+            return
+        self._applied_dark_mode = dark_mode
+
+        if dark_mode:
+            if MainWindow._dark_stylesheet_cache is None:
+                import qdarkstyle
+                MainWindow._dark_stylesheet_cache = qdarkstyle.load_stylesheet(qt_api='pyqt6')
+            self.setStyleSheet(MainWindow._dark_stylesheet_cache)
         else:
             self.setStyleSheet("")
 
+    def _ensure_protocol_view(self):
+        """Create the protocol view dock the first time it is needed."""
+        if self.protocol_dock is None:
+            self.protocol_dock = QDockWidget("Protocol Analysis", self)
+            self.protocol_view = ProtocolView()
+            self.protocol_dock.setWidget(self.protocol_view)
+        return self.protocol_view
+
+    def _ensure_automation_view(self):
+        """Create the automation view the first time it is needed."""
+        if self.automation_view is None:
+            from src.ui.automation_view import AutomationView
+            self.automation_view = AutomationView(self.automation_manager)
+            self.automation_view.hide()
+            self.layout.addWidget(self.automation_view)
+        return self.automation_view
+
     def toggle_protocol_view(self, checked):
         """Toggle protocol analysis view."""
         if checked:
+            self._ensure_protocol_view()
+            # Docking relayouts the main window, so wait until the dock is first shown
+            if self.dockWidgetArea(self.protocol_dock) == Qt.DockWidgetArea.NoDockWidgetArea:
+                self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.protocol_dock)
             self.protocol_dock.show()
-        else:
+        elif self.protocol_dock is not None:
             self.protocol_dock.hide()
 
     def toggle_automation_view(self, checked):
         """Toggle automation view."""
         if checked:
-            self.automation_view.show()
-        else:
+            self._ensure_automation_view().show()
+        elif self.automation_view is not None:
             self.automation_view.hide()
 
     def show_security_settings(self):
         """Show security settings dialog."""
+        from src.ui.security_dialog import SecuritySettingsDialog
         dialog = SecuritySettingsDialog(self.security_manager, self)
         dialog.exec()
 
     def show_user_management(self):
         """Show user management dialog."""
+        from src.ui.auth_dialog import UserManagementDialog
         dialog = UserManagementDialog(self.security_manager, self)
         dialog.exec()
 
     def show_login_dialog(self):
         """Show login dialog."""
+        from src.ui.auth_dialog import LoginDialog
         dialog = LoginDialog(self.security_manager, self)
         dialog.login_successful.connect(self.on_login_successful)
         if dialog.exec() != QDialog.DialogCode.Accepted:
@@ -292,7 +373,7 @@ class MainWindow(QMainWindow):
         filename, _ = QFileDialog.getSaveFileName(
             self,
             "Save Session",
-            os.path.join(self.session_manager.get_app_data_path('sessions')),
+            self._sessions_dir,
             "Session Files (*.json)"
         )
         if filename:
@@ -301,7 +382,7 @@ class MainWindow(QMainWindow):
             
             session_data = self._get_session_data()
             if self.session_manager.save_session(session_data, filename):
-                self.settings.setValue("last_session", filename)
+                self._set_setting("last_session", filename)
                 self.status_bar.showMessage(f"Session saved to {filename}")
             else:
                 QMessageBox.warning(self, "Error", "Failed to save session")
@@ -311,7 +392,7 @@ class MainWindow(QMainWindow):
         filename, _ = QFileDialog.getOpenFileName(
             self,
             "Load Session",
-            os.path.join(self.session_manager.get_app_data_path('sessions')),
+            self._sessions_dir,
             "Session Files (*.json)"
         )
         if filename:
@@ -321,14 +402,15 @@ class MainWindow(QMainWindow):
         """Get current session state data."""
         session_data = {
             'connections': [],
+            # Window geometry and state live in QSettings, not in session files
             'window': {
-                'geometry': self.saveGeometry().toBase64().data().decode(),
-                'state': self.saveState().toBase64().data().decode(),
                 'dark_mode': self.is_dark_mode()
             },
             'views': {
-                'protocol_view': not self.protocol_dock.isHidden(),
-                'automation_view': not self.automation_view.isHidden()
+                'protocol_view': (self.protocol_dock is not None
+                                  and not self.protocol_dock.isHidden()),
+                'automation_view': (self.automation_view is not None
+                                    and not self.automation_view.isHidden())
             },
             'automation': {
                 'macros': self.automation_manager.macro_recorder.actions,
@@ -337,13 +419,11 @@ class MainWindow(QMainWindow):
         }
 
         # Save connection tabs
-        for i in range(self.left_tabs.count()):
-            tab = self.left_tabs.widget(i)
-            if isinstance(tab, ConnectionTab):
-                session_data['connections'].append({
-                    'port': tab.port_name,
-                    'settings': tab.get_settings()
-                })
+        for tab in self._connection_tabs:
+            session_data['connections'].append({
+                'port': tab.port_name,
+                'settings': tab.get_settings()
+            })
 
         return session_data
 
@@ -352,7 +432,7 @@ class MainWindow(QMainWindow):
         session_data = self.session_manager.load_session(filename)
         if session_data:
             self._restore_session_data(session_data)
-            self.settings.setValue("last_session", filename)
+            self._set_setting("last_session", filename)
             self.status_bar.showMessage(f"Session loaded from {filename}")
         else:
             QMessageBox.warning(self, "Error", "Failed to load session")
@@ -362,12 +442,8 @@ class MainWindow(QMainWindow):
         # Restore window state
         if 'window' in session_data:
             window = session_data['window']
-            if 'geometry' in window:
-                self.restoreGeometry(bytes(window['geometry'], 'utf-8'))
-            if 'state' in window:
-                self.restoreState(bytes(window['state'], 'utf-8'))
             if 'dark_mode' in window:
-                self.settings.setValue("dark_mode", window['dark_mode'])
+                self._set_setting("dark_mode", bool(window['dark_mode']))
                 self.apply_theme()
 
         # Restore views
@@ -391,7 +467,8 @@ class MainWindow(QMainWindow):
             if 'macros' in auto:
                 self.automation_manager.macro_recorder.actions = auto['macros']
             if 'scheduled_tasks' in auto:
-                self.automation_manager.scheduled_tasks = auto['scheduled_tasks']
+                for task_id, task in auto['scheduled_tasks'].items():
+                    self.automation_manager.schedule_task(task_id, task['schedule'], task['action'])
 
     def setup_signals(self):
         """Setup signal connections."""
@@ -399,19 +476,7 @@ class MainWindow(QMainWindow):
         self.serial_manager.connection_status_changed.connect(self.handle_connection_status)
         self.serial_manager.error_occurred.connect(self.handle_error)
 
-        # Protocol analyzer signals
-        self.protocol_analyzer.frame_detected.connect(self.handle_protocol_frame)
-        self.protocol_analyzer.error_detected.connect(self.handle_protocol_error)
-
-        # Security manager signals
-        self.security_manager.auth_status_changed.connect(self.handle_auth_status)
-        self.security_manager.access_denied.connect(self.handle_access_denied)
-        self.security_manager.security_error.connect(self.handle_security_error)
-
-        # Automation manager signals
-        self.automation_manager.macro_started.connect(self.handle_macro_started)
-        self.automation_manager.macro_finished.connect(self.handle_macro_finished)
-        self.automation_manager.automation_error.connect(self.handle_automation_error)
+        # Protocol, security and automation signals are connected by their properties
 
         # Session manager signals
         self.session_manager.session_error.connect(self.handle_session_error)
@@ -430,12 +495,16 @@ class MainWindow(QMainWindow):
     @pyqtSlot(str, object)
     def handle_protocol_frame(self, port: str, frame):
         """Handle detected protocol frames."""
+        # Nothing to show until the protocol view has been opened
+        if self.protocol_view is None:
+            return
         self.protocol_view.add_frame(frame)
 
     @pyqtSlot(str, str, str)
     def handle_protocol_error(self, port: str, error_type: str, description: str):
         """Handle protocol analysis errors."""
-        self.protocol_view.add_error(error_type, description)
+        if self.protocol_view is not None:
+            self.protocol_view.add_error(error_type, description)
         QMessageBox.warning(self, "Protocol Error", f"{port} - {error_type}: {description}")
 
     @pyqtSlot(str, bool)
@@ -477,18 +546,18 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         """Handle application close event."""
         # Close all serial connections
-        for i in range(self.left_tabs.count()):
-            tab = self.left_tabs.widget(i)
-            if isinstance(tab, ConnectionTab):
-                if self.serial_manager.get_connection_status(tab.port_name):
-                    self.serial_manager.close_connection(tab.port_name)
+        for tab in self._connection_tabs:
+            if self.serial_manager.get_connection_status(tab.port_name):
+                self.serial_manager.close_connection(tab.port_name)
         
         # Save window state
-        self.settings.setValue("geometry", self.saveGeometry())
-        self.settings.setValue("windowState", self.saveState())
+        self._set_setting("geometry", self.saveGeometry())
+        self._set_setting("windowState", self.saveState())
+        self.settings.sync()
         
-        # Stop automation manager
-        self.automation_manager.stop_timer()
+        # Stop automation manager, if it was ever started
+        if 'automation_manager' in self.__dict__:
+            self.automation_manager.stop_timer()
         
         event.accept()
 
@@ -512,26 +581,26 @@ class MainWindow(QMainWindow):
         return app_data
 
     def restore_geometry(self):
-        if self.settings.value("geometry"):
-            self.restoreGeometry(self.settings.value("geometry"))
-        if self.settings.value("windowState"):
-            self.restoreState(self.settings.value("windowState"))
+        geometry = self._get_setting("geometry")
+        if geometry:
+            self.restoreGeometry(geometry)
+        window_state = self._get_setting("windowState")
+        if window_state:
+            self.restoreState(window_state)
 
     def toggle_split_view(self, checked):
         """Toggle between split view and single view."""
         if checked:
             # Show tab selection dialog
             if self.left_tabs.count() > 0:
+                from src.ui.tab_selection_dialog import TabSelectionDialog
                 dialog = TabSelectionDialog(self.left_tabs, self)
                 if dialog.exec() == QDialog.DialogCode.Accepted:
                     selected_indices = dialog.get_selected_indices()
                     
                     # Move selected tabs to right side
-                    for index in sorted(selected_indices, reverse=True):
-                        tab = self.left_tabs.widget(index)
-                        title = self.left_tabs.tabText(index)
-                        self.left_tabs.removeTab(index)
-                        self.right_tabs.addTab(tab, title)
+                    self._move_tabs(self.left_tabs, self.right_tabs,
+                                    sorted(selected_indices, reverse=True))
                     
                     # Show right side and adjust splitter
                     self.right_tabs.show()
@@ -546,15 +615,28 @@ class MainWindow(QMainWindow):
                 QMessageBox.information(self, "Split View", "No tabs available to split.")
         else:
             # Move all tabs to left widget and hide right widget
-            while self.right_tabs.count() > 0:
-                tab = self.right_tabs.widget(0)
-                title = self.right_tabs.tabText(0)
-                self.right_tabs.removeTab(0)
-                self.left_tabs.addTab(tab, title)
+            self._move_tabs(self.right_tabs, self.left_tabs,
+                            [0] * self.right_tabs.count())
             self.right_tabs.hide()
             self.main_splitter.setSizes([1200, 0])
             self.split_view_button.setText("Enable Split View")
 
+    def _move_tabs(self, source, target, indices):
+        """Move tabs at the given source indices, in order, with one relayout."""
+        for tabs in (source, target):
+            tabs.setUpdatesEnabled(False)
+            tabs.blockSignals(True)
+        try:
+            for index in indices:
+                tab = source.widget(index)
+                title = source.tabText(index)
+                source.removeTab(index)
+                target.addTab(tab, title)
+        finally:
+            for tabs in (source, target):
+                tabs.blockSignals(False)
+                tabs.setUpdatesEnabled(True)
+
     def move_tab_to_other_side(self, index, from_left=True):
         """Move a tab from one side to the other."""
         source = self.left_tabs if from_left else self.right_tabs
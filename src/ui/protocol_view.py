@@ -1,13 +1,124 @@
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget,
-                               QTreeWidgetItem, QLabel, QPushButton, QGroupBox,
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTreeView,
+                               QLabel, QPushButton, QGroupBox,
                                QTextEdit, QSplitter)
-from PyQt6.QtCore import Qt, pyqtSlot
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer, pyqtSlot
+from collections import deque
 from datetime import datetime
+from typing import Iterable
 from core.protocol_analyzer import ProtocolFrame
+from ..core.config import PERFORMANCE_CONFIG
+
+def _format_timestamp(t: datetime) -> str:
+    """'YYYY-mm-dd HH:MM:SS.mmm' without formatting and slicing microseconds."""
+    return f"{t:%Y-%m-%d %H:%M:%S}.{t.microsecond // 1000:03d}"
+
+HEX_DUMP_WIDTH = 16  # bytes per line of the details hex dump
+
+def _hex_dump(data: bytes) -> str:
+    """Space-separated hex, HEX_DUMP_WIDTH bytes per line."""
+    view = memoryview(data)
+    return '\n'.join(
+        view[i:i + HEX_DUMP_WIDTH].hex(' ') for i in range(0, len(view), HEX_DUMP_WIDTH)
+    )
+
+def _format_frame_details(frame: ProtocolFrame) -> str:
+    details = []
+    details.append(f"Timestamp: {frame.timestamp}")
+    details.append(f"Protocol: {frame.protocol}")
+    details.append(f"Frame Type: {frame.frame_type}")
+    details.append(f"Data Length: {len(frame.data)} bytes")
+    details.append(f"\nRaw Data (Hex):\n{_hex_dump(frame.data)}")
+
+    if frame.parsed_data:
+        details.append("\nParsed Data:")
+        for key, value in frame.parsed_data.items():
+            details.append(f"{key}: {value}")
+
+    if frame.errors:
+        details.append("\nErrors:")
+        for error in frame.errors:
+            details.append(f"- {error}")
+
+    return '\n'.join(details)
+
+class FrameTableModel(QAbstractTableModel):
+    """Most recent protocol frames as table rows; the oldest drop past max_rows."""
+
+    HEADERS = ("Timestamp", "Protocol", "Type", "Length", "Status")
+    DetailsRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, max_rows: int = PERFORMANCE_CONFIG['protocol_view_max_frames'],
+                 parent=None):
+        super().__init__(parent)
+        self.max_rows = max_rows
+        # (timestamp, protocol, type, length, status, frame)
+        self._rows = deque()
+        # Formatted details text by id of the row, filled in on first display
+        self._details = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return row[index.column()]
+        if role == Qt.ItemDataRole.UserRole:
+            return row[-1]
+        if role == self.DetailsRole:
+            # Format once; revisiting a frame reuses the text
+            details = self._details.get(id(row))
+            if details is None:
+                details = self._details[id(row)] = _format_frame_details(row[-1])
+            return details
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def append_rows(self, rows: list):
+        """Append rows at the end, first removing the oldest rows beyond the cap."""
+        if not rows:
+            return
+        rows = rows[-self.max_rows:]
+        overflow = len(self._rows) + len(rows) - self.max_rows
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self._details.pop(id(self._rows.popleft()), None)
+            self.endRemoveRows()
+
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._rows.clear()
+        self._details.clear()
+        self.endResetModel()
 
 class ProtocolView(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
+
+        # Frames and errors are queued and added in one batch per interval; if the
+        # view falls behind, the oldest queued frames are dropped
+        self._pending_frames = deque(maxlen=PERFORMANCE_CONFIG['protocol_frame_queue_size'])
+        self._pending_errors = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(PERFORMANCE_CONFIG['display_flush_interval'])
+        self._flush_timer.timeout.connect(self._flush_pending)
+
         self.setup_ui()
 
     def setup_ui(self):
@@ -21,12 +132,13 @@ class ProtocolView(QWidget):
         frame_group = QGroupBox("Protocol Frames")
         frame_layout = QVBoxLayout()
 
-        # Create tree widget for frames
-        self.frame_tree = QTreeWidget()
-        self.frame_tree.setHeaderLabels([
-            "Timestamp", "Protocol", "Type", "Length", "Status"
-        ])
-        self.frame_tree.currentItemChanged.connect(self.on_frame_selected)
+        # Create a flat tree view over a capped frame model
+        self.frame_model = FrameTableModel(parent=self)
+        self.frame_tree = QTreeView()
+        self.frame_tree.setRootIsDecorated(False)
+        self.frame_tree.setUniformRowHeights(True)
+        self.frame_tree.setModel(self.frame_model)
+        self.frame_tree.selectionModel().currentChanged.connect(self.on_frame_selected)
         frame_layout.addWidget(self.frame_tree)
 
         frame_group.setLayout(frame_layout)
@@ -65,55 +177,76 @@ class ProtocolView(QWidget):
         splitter.setSizes([200, 150, 100])
 
     def add_frame(self, frame: ProtocolFrame):
-        """Add a protocol frame to the tree widget."""
-        item = QTreeWidgetItem(self.frame_tree)
-        item.setText(0, frame.timestamp.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3])
-        item.setText(1, frame.protocol)
-        item.setText(2, frame.frame_type)
-        item.setText(3, str(len(frame.data)))
-        item.setText(4, "Error" if frame.errors else "OK")
-        
-        # Store frame data for details view
-        item.setData(0, Qt.ItemDataRole.UserRole, frame)
-        
-        # Auto-scroll to new item
-        self.frame_tree.scrollToItem(item)
+        """Queue a protocol frame for the next batched update of the tree."""
+        self._pending_frames.append(frame)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush_pending(self):
+        frames = list(self._pending_frames)
+        self._pending_frames.clear()
+        self.add_frames(frames)
+
+        if self._pending_errors:
+            # One append, and so one layout pass, for all errors since the last flush
+            self.error_log.append('\n'.join(self._pending_errors))
+            self._pending_errors.clear()
+
+    def add_frames(self, frames: Iterable[ProtocolFrame]):
+        """Add several protocol frames to the frame list in one insert."""
+        rows = [
+            (
+                _format_timestamp(frame.timestamp),
+                frame.protocol,
+                frame.frame_type,
+                str(len(frame.data)),
+                "Error" if frame.errors else "OK",
+                frame  # for the details view
+            )
+            for frame in frames
+        ]
+        if not rows:
+            return
+
+        # One repaint for the whole batch
+        self.frame_tree.setUpdatesEnabled(False)
+        try:
+            self.frame_model.append_rows(rows)
+
+            # Auto-scroll to the newest frame
+            self.frame_tree.scrollToBottom()
+        finally:
+            self.frame_tree.setUpdatesEnabled(True)
+
+    def clear(self):
+        """Remove all frames, including those not yet shown."""
+        self._pending_frames.clear()
+        self._flush_timer.stop()
+        # Queued errors belong in the error log, which is kept; show them now
+        self._flush_pending()
+        self.frame_model.clear()
+        self.details_text.clear()
 
     def add_error(self, error_type: str, description: str):
-        """Add an error to the error log."""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-        self.error_log.append(f"[{timestamp}] {error_type}: {description}")
+        """Queue an error for the next batched update of the error log."""
+        timestamp = _format_timestamp(datetime.now())
+        self._pending_errors.append(f"[{timestamp}] {error_type}: {description}")
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
 
     def clear_error_log(self):
         """Clear the error log."""
+        self._pending_errors.clear()
         self.error_log.clear()
 
-    def on_frame_selected(self, current: QTreeWidgetItem, previous: QTreeWidgetItem):
+    def on_frame_selected(self, current: QModelIndex, previous: QModelIndex):
         """Display details of the selected frame."""
-        if not current:
+        if not current.isValid():
             self.details_text.clear()
             return
 
-        frame: ProtocolFrame = current.data(0, Qt.ItemDataRole.UserRole)
-        if not frame:
+        details = current.data(FrameTableModel.DetailsRole)
+        if details is None:
             return
 
-        # Format frame details
-        details = []
-        details.append(f"Timestamp: {frame.timestamp}")
-        details.append(f"Protocol: {frame.protocol}")
-        details.append(f"Frame Type: {frame.frame_type}")
-        details.append(f"Data Length: {len(frame.data)} bytes")
-        details.append(f"\nRaw Data (Hex):\n{frame.data.hex(' ')}")
-        
-        if frame.parsed_data:
-            details.append("\nParsed Data:")
-            for key, value in frame.parsed_data.items():
-                details.append(f"{key}: {value}")
-        
-        if frame.errors:
-            details.append("\nErrors:")
-            for error in frame.errors:
-                details.append(f"- {error}")
-
-        self.details_text.setPlainText('\n'.join(details)) 
\ No newline at end of file
+        self.details_text.setPlainText(details) 
\ No newline at end of file
@@ -1,14 +1,48 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                                QLineEdit, QPushButton, QGroupBox, QTextEdit,
-                               QListWidget, QDateTimeEdit, QCheckBox, QMessageBox)
-from PyQt6.QtCore import Qt, pyqtSlot, QDateTime
+                               QListWidget, QDateTimeEdit, QCheckBox, QMessageBox,
+                               QWidget)
+from PyQt6.QtCore import Qt, pyqtSlot, QDateTime, QTimer
 import re
+import weakref
+from ..core.config import PERFORMANCE_CONFIG
+
+try:
+    import regex
+except ImportError:  # Optional; without it user searches run without a time limit
+    regex = None
+
+# Searches compile with regex when available so pathological patterns can time out
+_search_re = regex if regex is not None else re
+
+# Compiled searches shared by all open dialogs; each dialog's own cache keeps them alive
+_compiled_searches = weakref.WeakValueDictionary()
+
+def _decode(data: bytes) -> str:
+    """UTF-8 text, or hex when the payload is not valid UTF-8."""
+    if data.isascii():
+        return data.decode('ascii')  # Cannot fail, so no exception setup
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return data.hex()
 
 class SearchFilterDialog(QDialog):
     def __init__(self, data_processor, port_name, parent=None):
         super().__init__(parent)
         self.data_processor = data_processor
         self.port_name = port_name
+        # (text, case sensitive, regex mode) -> compiled bytes pattern
+        self._regex_cache = {}
+        # Match and filter notifications are appended to the results once per interval
+        self._pending_lines = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(PERFORMANCE_CONFIG['display_flush_interval'])
+        self._flush_timer.timeout.connect(self._flush_pending)
+        # Time range editors are built on first show, see _ensure_time_widgets
+        self.start_time = None
+        self.end_time = None
         self.setup_ui()
         self.connect_signals()
 
@@ -55,15 +89,15 @@ class SearchFilterDialog(QDialog):
         layout.addLayout(pattern_layout)
 
         # Time range
+        self._start_time_container = QWidget()
+        self._end_time_container = QWidget()
         time_layout = QHBoxLayout()
         
         time_layout.addWidget(QLabel("From:"))
-        self.start_time = QDateTimeEdit(QDateTime.currentDateTime().addSecs(-3600))
-        time_layout.addWidget(self.start_time)
+        time_layout.addWidget(self._start_time_container)
         
         time_layout.addWidget(QLabel("To:"))
-        self.end_time = QDateTimeEdit(QDateTime.currentDateTime())
-        time_layout.addWidget(self.end_time)
+        time_layout.addWidget(self._end_time_container)
         
         layout.addLayout(time_layout)
 
@@ -156,50 +190,123 @@ class SearchFilterDialog(QDialog):
         group.setLayout(layout)
         return group
 
+    def showEvent(self, event):
+        self._ensure_time_widgets()
+        super().showEvent(event)
+
+    def _ensure_time_widgets(self):
+        """Create the time range editors, defaulting to the last hour."""
+        if self.start_time is not None:
+            return
+
+        now = QDateTime.currentDateTime()
+        self.start_time = QDateTimeEdit(now.addSecs(-3600))
+        self.end_time = QDateTimeEdit(now)
+        for container, editor in ((self._start_time_container, self.start_time),
+                                  (self._end_time_container, self.end_time)):
+            container_layout = QHBoxLayout(container)
+            container_layout.setContentsMargins(0, 0, 0, 0)
+            container_layout.addWidget(editor)
+
     def connect_signals(self):
-        self.data_processor.pattern_matched.connect(self.handle_pattern_match)
-        self.data_processor.data_filtered.connect(self.handle_filtered_data)
+        # Only this port's events reach the dialog; queued so the producer
+        # never waits on UI slots
+        signals = self.data_processor.port_signals(self.port_name)
+        signals.pattern_matched.connect(self.handle_pattern_match,
+                                        Qt.ConnectionType.QueuedConnection)
+        signals.data_filtered.connect(self.handle_filtered_data,
+                                      Qt.ConnectionType.QueuedConnection)
 
     def perform_search(self):
         pattern = self.search_pattern.text()
         if not pattern:
             return
 
+        self._ensure_time_widgets()
+        start_time = self.start_time.dateTime().toPyDateTime()
+        end_time = self.end_time.dateTime().toPyDateTime()
+
         if not self.regex_search.isChecked():
-            pattern = re.escape(pattern)
-        
-        if not self.case_sensitive.isChecked():
-            pattern = f"(?i){pattern}"
+            # Plain text needs no regex engine
+            results = self.data_processor.search_literal(
+                self.port_name,
+                pattern.encode(),
+                start_time,
+                end_time,
+                ignore_case=not self.case_sensitive.isChecked()
+            )
+            self.display_results(results)
+            return
+
+        try:
+            compiled = self._compile_search(
+                pattern, self.case_sensitive.isChecked(), self.regex_search.isChecked()
+            )
+        except _search_re.error:
+            QMessageBox.warning(self, "Invalid Pattern",
+                              "The search pattern is not a valid regular expression.")
+            return
 
-        results = self.data_processor.search_data(
-            self.port_name,
-            pattern,
-            self.start_time.dateTime().toPyDateTime(),
-            self.end_time.dateTime().toPyDateTime()
-        )
+        try:
+            results = self.data_processor.search_data(
+                self.port_name,
+                compiled,
+                start_time,
+                end_time,
+                timeout=PERFORMANCE_CONFIG['search_timeout'] if regex is not None else None
+            )
+        except TimeoutError:
+            QMessageBox.warning(self, "Regex Timeout",
+                              "The search took too long and was stopped. "
+                              "Try a simpler pattern or a shorter time range.")
+            return
 
         self.display_results(results)
 
+    def _compile_search(self, text, case_sensitive, regex_mode):
+        """Compile a search pattern once per distinct set of options."""
+        key = (text, case_sensitive, regex_mode)
+        compiled = self._regex_cache.get(key)
+        if compiled is None:
+            compiled = _compiled_searches.get(key)
+            if compiled is None:
+                pattern = text if regex_mode else re.escape(text)
+                flags = 0 if case_sensitive else _search_re.IGNORECASE
+                compiled = _search_re.compile(pattern.encode(), flags)
+                _compiled_searches[key] = compiled
+            self._regex_cache[key] = compiled
+        return compiled
+
     def display_results(self, results):
-        self.results_text.clear()
-        for timestamp, data in results:
-            try:
-                text = data.decode('utf-8')
-            except UnicodeDecodeError:
-                text = data.hex()
-            
-            self.results_text.append(f"[{timestamp}] {text}")
+        text = '\n'.join(f"[{timestamp}] {_decode(data)}" for timestamp, data in results)
+        self._pending_lines.clear()
+        self.results_text.setUpdatesEnabled(False)
+        try:
+            self.results_text.setPlainText(text)
+        finally:
+            self.results_text.setUpdatesEnabled(True)
+
+    def _queue_line(self, line):
+        self._pending_lines.append(line)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush_pending(self):
+        if not self._pending_lines:
+            return
+        self.results_text.append('\n'.join(self._pending_lines))
+        self._pending_lines.clear()
 
     def add_filter(self):
         pattern = self.filter_pattern.text()
         if not pattern:
             return
 
-        try:
-            if self.data_processor.add_filter(pattern, pattern):
-                self.filter_list.addItem(pattern)
-                self.filter_pattern.clear()
-        except re.error:
+        # The processor compiles and keeps the filter, and reports invalid patterns
+        if self.data_processor.add_filter(pattern, pattern):
+            self.filter_list.addItem(pattern)
+            self.filter_pattern.clear()
+        else:
             QMessageBox.warning(self, "Invalid Filter", 
                               "The filter pattern is not a valid regular expression.")
 
@@ -216,12 +323,11 @@ class SearchFilterDialog(QDialog):
         if not name or not pattern:
             return
 
-        try:
-            if self.data_processor.add_pattern(name, pattern):
-                self.pattern_list.addItem(f"{name}: {pattern}")
-                self.pattern_name.clear()
-                self.pattern_value.clear()
-        except re.error:
+        if self.data_processor.add_pattern(name, pattern):
+            self.pattern_list.addItem(f"{name}: {pattern}")
+            self.pattern_name.clear()
+            self.pattern_value.clear()
+        else:
             QMessageBox.warning(self, "Invalid Pattern", 
                               "The pattern is not a valid regular expression.")
 
@@ -232,28 +338,10 @@ class SearchFilterDialog(QDialog):
             if self.data_processor.remove_pattern(name):
                 self.pattern_list.takeItem(self.pattern_list.row(current))
 
-    @pyqtSlot(str, str, bytes)
-    def handle_pattern_match(self, port, pattern_name, data):
-        if port != self.port_name:
-            return
-        
-        try:
-            text = data.decode('utf-8')
-        except UnicodeDecodeError:
-            text = data.hex()
-        
-        self.results_text.append(
-            f"Pattern '{pattern_name}' matched: {text}"
-        )
-
     @pyqtSlot(str, bytes)
-    def handle_filtered_data(self, port, data):
-        if port != self.port_name:
-            return
-        
-        try:
-            text = data.decode('utf-8')
-        except UnicodeDecodeError:
-            text = data.hex()
-        
-        self.results_text.append(f"Filtered data: {text}") 
\ No newline at end of file
+    def handle_pattern_match(self, pattern_name, data):
+        self._queue_line(f"Pattern '{pattern_name}' matched: {_decode(data)}")
+
+    @pyqtSlot(bytes)
+    def handle_filtered_data(self, data):
+        self._queue_line(f"Filtered data: {_decode(data)}") 
\ No newline at end of file
@@ -1,9 +1,10 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTabWidget,
                                QPushButton, QLabel, QLineEdit, QCheckBox,
-                               QGroupBox, QFormLayout, QListWidget, QMessageBox,
-                               QComboBox, QWidget)
-from PyQt6.QtCore import Qt
+                               QGroupBox, QFormLayout, QListWidget, QListWidgetItem,
+                               QMessageBox, QComboBox, QWidget)
+from PyQt6.QtCore import Qt, QSignalBlocker, QTimer, pyqtSlot
 import serial.tools.list_ports
+from ..core.config import PERFORMANCE_CONFIG
 
 class SecuritySettingsDialog(QDialog):
     """Dialog for managing security settings."""
@@ -12,6 +13,13 @@ class SecuritySettingsDialog(QDialog):
         super().__init__(parent)
         self.security_manager = security_manager
         self.setWindowTitle("Security Settings")
+        self._ports_signature = None  # devices currently listed
+        # Permission edits per user, saved together once the checkboxes go quiet
+        self._pending_permissions = {}
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(PERFORMANCE_CONFIG['permission_save_delay'])
+        self._save_timer.timeout.connect(self.save_permissions)
         self.setup_ui()
         self.load_settings()
         self.refresh_ports()
@@ -56,16 +64,21 @@ class SecuritySettingsDialog(QDialog):
 
     def refresh_ports(self):
         """Refresh the list of available ports."""
-        self.port_list.clear()
-        ports = list(serial.tools.list_ports.comports())
-        for port in ports:
-            item = port.device
-            list_item = QListWidget.QListWidgetItem(item)
-            self.port_list.addItem(list_item)
-            
-            # Check if port is encrypted
-            if self.security_manager.is_port_encrypted(port.device):
-                list_item.setSelected(True)
+        devices = tuple(port.device for port in serial.tools.list_ports.comports())
+        if devices == self._ports_signature:
+            return  # Same ports; keep the list and the user's selection
+
+        encrypted = set(self.security_manager.encryption_keys)
+        self.port_list.setUpdatesEnabled(False)
+        try:
+            self.port_list.clear()
+            for device in devices:
+                list_item = QListWidgetItem(device)
+                self.port_list.addItem(list_item)
+                list_item.setSelected(device in encrypted)
+        finally:
+            self.port_list.setUpdatesEnabled(True)
+        self._ports_signature = devices
 
     def load_settings(self):
         """Load current security settings."""
@@ -77,12 +90,11 @@ class SecuritySettingsDialog(QDialog):
             # Update global encryption setting
             self.security_manager.set_encryption_enabled(self.encryption_enabled.isChecked())
             
-            # Update port-specific encryption settings
-            selected_ports = [item.text() for item in self.port_list.selectedItems()]
-            all_ports = [self.port_list.item(i).text() for i in range(self.port_list.count())]
-            
-            for port in all_ports:
-                self.security_manager.set_port_encryption(port, port in selected_ports)
+            # Update port-specific encryption settings in one call
+            selected = {item.text() for item in self.port_list.selectedItems()}
+            ports = {port: port in selected for port in self._ports_signature or ()}
+            if not self.security_manager.set_port_encryption_bulk(ports):
+                raise RuntimeError("could not enable encryption for every selected port")
             
             QMessageBox.information(self, "Success", "Security settings saved successfully")
             self.accept()
@@ -154,9 +166,8 @@ class SecuritySettingsDialog(QDialog):
 
         for perm in permissions:
             checkbox = QCheckBox(perm.replace('_', ' ').title())
-            checkbox.stateChanged.connect(
-                lambda state, p=perm: self.on_permission_changed(p, state)
-            )
+            checkbox.setProperty("perm", perm)
+            checkbox.stateChanged.connect(self._on_perm_toggled)
             self.perm_checkboxes[perm] = checkbox
             perms_layout.addWidget(checkbox)
 
@@ -221,8 +232,7 @@ class SecuritySettingsDialog(QDialog):
             return
 
         port = current.text()
-        if port in self.security_manager.encryption_keys:
-            del self.security_manager.encryption_keys[port]
+        if self.security_manager.remove_encryption(port):
             self.refresh_encrypted_ports()
 
     def on_user_selected(self, username: str):
@@ -234,9 +244,17 @@ class SecuritySettingsDialog(QDialog):
         if not user:
             return
 
+        # Save edits made for the previous user before showing this one's
+        self.save_permissions()
         permissions = user.get('permissions', [])
         for perm, checkbox in self.perm_checkboxes.items():
+            blocker = QSignalBlocker(checkbox)
             checkbox.setChecked(perm in permissions or '*' in permissions)
+            blocker.unblock()
+
+    @pyqtSlot(int)
+    def _on_perm_toggled(self, state: int):
+        self.on_permission_changed(self.sender().property("perm"), state)
 
     def on_permission_changed(self, permission: str, state: int):
         """Update user permissions when a checkbox is toggled."""
@@ -248,14 +266,26 @@ class SecuritySettingsDialog(QDialog):
         if not user:
             return
 
-        permissions = set(user.get('permissions', []))
+        permissions = self._pending_permissions.get(username)
+        if permissions is None:
+            permissions = self._pending_permissions[username] = set(user.get('permissions', []))
         if state == Qt.CheckState.Checked.value:
             permissions.add(permission)
         else:
             permissions.discard(permission)
 
-        user['permissions'] = list(permissions)
-        self.security_manager.save_config()
+        self._save_timer.start()
+
+    def save_permissions(self):
+        """Save pending permission edits, once per edited user."""
+        self._save_timer.stop()
+        pending, self._pending_permissions = self._pending_permissions, {}
+        for username, permissions in pending.items():
+            self.security_manager.set_permissions(username, permissions)
+
+    def done(self, result: int):
+        self.save_permissions()
+        super().done(result)
 
     def change_password(self):
         """Change the current user's password."""
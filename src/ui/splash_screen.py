@@ -62,21 +62,22 @@ class SplashScreen(QSplashScreen):
             "Starting application..."
         ]
         self.current_step = 0
+        self._step_size = max(1, 100 // len(self.loading_steps))
         
-        # Setup timer for progress updates
+        # Setup timer for progress updates; the splash is cosmetic, so wake rarely
         self.timer = QTimer()
+        self.timer.setTimerType(Qt.TimerType.CoarseTimer)
         self.timer.timeout.connect(self.update_progress)
-        self.timer.start(100)  # Update every 100ms
+        self.timer.start(250)  # Update every 250ms
 
     def update_progress(self):
         """Update the progress bar and loading text."""
         if self.progress < 100:
-            self.progress += 2
+            self.progress += 5
             self.progress_bar.setValue(self.progress)
             
             # Update loading text at certain intervals
-            step_size = 100 // len(self.loading_steps)
-            current_step = self.progress // step_size
+            current_step = self.progress // self._step_size
             if current_step < len(self.loading_steps) and current_step != self.current_step:
                 self.current_step = current_step
                 self.loading_label.setText(self.loading_steps[current_step])
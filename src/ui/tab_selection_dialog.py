@@ -1,5 +1,5 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QListWidget, QPushButton,
-                               QLabel, QHBoxLayout, QListWidgetItem)
+                               QLabel, QHBoxLayout)
 from PyQt6.QtCore import Qt
 
 class TabSelectionDialog(QDialog):
@@ -20,10 +20,8 @@ class TabSelectionDialog(QDialog):
         self.list_widget = QListWidget()
         self.list_widget.setSelectionMode(QListWidget.SelectionMode.MultiSelection)
         
-        # Add tabs to list
-        for i in range(tabs.count()):
-            item = QListWidgetItem(tabs.tabText(i))
-            self.list_widget.addItem(item)
+        # Add tabs to list in one insert
+        self.list_widget.addItems([tabs.tabText(i) for i in range(tabs.count())])
 
         layout.addWidget(self.list_widget)
 
@@ -42,4 +40,5 @@ class TabSelectionDialog(QDialog):
         layout.addLayout(button_layout)
 
     def get_selected_indices(self):
-        return [self.list_widget.row(item) for item in self.list_widget.selectedItems()] 
\ No newline at end of file
+        # Model indexes carry their row; row(item) would scan the list per item
+        return sorted(index.row() for index in self.list_widget.selectedIndexes()) 
\ No newline at end of file
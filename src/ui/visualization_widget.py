@@ -6,73 +6,212 @@ import pyqtgraph as pg
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Generator, Optional
+from collections import OrderedDict
 import traceback
 from ..core.config import PERFORMANCE_CONFIG
 
+try:
+    import numba
+except ImportError:  # Optional accelerator; plot math falls back to numpy
+    numba = None
+
+# Plot kernel codes for each data type
+_PACKET_SIZE, _PACKET_RATE, _CUMULATIVE = 0, 1, 2
+_PLOT_KINDS = {'Packet Size': _PACKET_SIZE, 'Packet Rate': _PACKET_RATE, 'Cumulative': _CUMULATIVE}
+
+def _reduce(timestamps: np.ndarray, sizes: np.ndarray, kind: int):
+    """Return the x and y values plotted for a data type."""
+    if kind == _PACKET_SIZE:
+        return timestamps, sizes.astype(np.float64)
+    if kind == _CUMULATIVE:
+        return timestamps, np.cumsum(sizes, dtype=np.float64)
+    rate = np.diff(timestamps)
+    with np.errstate(divide='ignore'):  # equal timestamps give inf, dropped before plotting
+        np.divide(1.0, rate, out=rate)
+    return timestamps[1:], rate
+
+def _reduce_loop(timestamps, sizes, kind):
+    # Same result as _reduce in a single pass over the columns
+    n = len(timestamps)
+    count = n - 1 if kind == _PACKET_RATE else n
+    if count < 0:
+        count = 0
+    ts_out = np.empty(count)
+    y_out = np.empty(count)
+    total = 0.0
+    for i in range(n):
+        if kind == _PACKET_SIZE:
+            ts_out[i] = timestamps[i]
+            y_out[i] = sizes[i]
+        elif kind == _CUMULATIVE:
+            total += sizes[i]
+            ts_out[i] = timestamps[i]
+            y_out[i] = total
+        elif i > 0:
+            ts_out[i - 1] = timestamps[i]
+            y_out[i - 1] = 1.0 / (timestamps[i] - timestamps[i - 1])
+    return ts_out, y_out
+
+def _lttb(x: np.ndarray, y: np.ndarray, n_out: int):
+    """Largest-Triangle-Three-Buckets: keep n_out points that preserve the curve's shape.
+
+    The first and last points are always kept; each bucket in between keeps
+    the point forming the largest triangle with the previously kept point
+    and the average of the next bucket.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    out_x = np.empty(n_out)
+    out_y = np.empty(n_out)
+    out_x[0] = x[0]
+    out_y[0] = y[0]
+    bucket = (n - 2) / (n_out - 2)
+    kept = 0
+    for i in range(n_out - 2):
+        start = int(i * bucket) + 1
+        end = int((i + 1) * bucket) + 1
+        next_end = min(int((i + 2) * bucket) + 1, n)
+        if end < next_end:
+            avg_x = x[end:next_end].mean()
+            avg_y = y[end:next_end].mean()
+        else:
+            avg_x = x[n - 1]
+            avg_y = y[n - 1]
+        area = np.abs((x[kept] - avg_x) * (y[start:end] - y[kept])
+                      - (x[kept] - x[start:end]) * (avg_y - y[kept]))
+        kept = start + int(np.argmax(area))
+        out_x[i + 1] = x[kept]
+        out_y[i + 1] = y[kept]
+    out_x[n_out - 1] = x[n - 1]
+    out_y[n_out - 1] = y[n - 1]
+    return out_x, out_y
+
+def _finite_points(x: np.ndarray, y: np.ndarray):
+    """Drop points whose y is not finite and return x, y and y's (min, max)."""
+    low, high = float(y.min()), float(y.max())
+    if not (np.isfinite(low) and np.isfinite(high)):
+        # Equal timestamps give infinite rates, which cannot be drawn
+        finite = np.isfinite(y)
+        x, y = x[finite], y[finite]
+        if not len(y):
+            return x, y, None
+        low, high = float(y.min()), float(y.max())
+    return x, y, (low, high)
+
+if numba is not None:
+    # Numpy error model: equal timestamps give inf, as in the fallback
+    _reduce = numba.njit(cache=True, error_model='numpy')(_reduce_loop)
+    _lttb = numba.njit(cache=True)(_lttb)
+
 class ChunkedDataHandler:
-    def __init__(self, chunk_size: int = PERFORMANCE_CONFIG['chunk_size']):
+    def __init__(self, chunk_size: int = PERFORMANCE_CONFIG['chunk_size'], dtype=np.uint8):
         self.chunk_size = chunk_size
-        self.current_chunk = []
+        self.dtype = np.dtype(dtype)
+        # Chunks are assembled in place; room for one more fragment past chunk_size
+        self._buffer = bytearray(chunk_size * 2)
         self.chunk_count = 0
 
     def process_large_dataset(self, data_generator: Generator[bytes, None, None]):
-        current_size = 0
-        
-        for data_chunk in data_generator:
-            current_size += len(data_chunk)
-            self.current_chunk.append(data_chunk)
-
-            if current_size >= self.chunk_size:
-                yield self._process_chunk(b''.join(self.current_chunk))
-                self.current_chunk = []
-                current_size = 0
+        """Yield the data as arrays of dtype covering at least chunk_size bytes.
 
-        if self.current_chunk:
-            yield self._process_chunk(b''.join(self.current_chunk))
+        Each array is a writable view of a shared buffer and is only valid
+        until the next one is requested; copy it to keep it. Bytes of an item
+        split across chunks are carried into the next chunk, and trailing
+        bytes that never complete an item are dropped.
+        """
+        cursor = 0
 
-    def _process_chunk(self, chunk: bytes) -> np.ndarray:
-        return np.frombuffer(chunk, dtype=np.uint8)
+        for data_chunk in data_generator:
+            end = cursor + len(data_chunk)
+            if end > len(self._buffer):
+                # Fragment larger than the spare room; earlier arrays keep the old buffer
+                buffer = bytearray(end + self.chunk_size)
+                buffer[:cursor] = self._buffer[:cursor]
+                self._buffer = buffer
+            self._buffer[cursor:end] = data_chunk
+            cursor = end
+
+            if cursor >= self.chunk_size:
+                used = cursor - cursor % self.dtype.itemsize
+                yield self._process_chunk(used)
+                if used < cursor:
+                    self._buffer[:cursor - used] = self._buffer[used:cursor]
+                cursor -= used
+
+        if cursor >= self.dtype.itemsize:
+            yield self._process_chunk(cursor - cursor % self.dtype.itemsize)
+
+    def _process_chunk(self, size: int) -> np.ndarray:
+        self.chunk_count += 1
+        return np.frombuffer(self._buffer, dtype=self.dtype, count=size // self.dtype.itemsize)
 
 class DataProcessWorker(QRunnable):
-    def __init__(self, fn, *args, **kwargs):
+    def __init__(self, fn, *args, signals=None, **kwargs):
         super().__init__()
         self.fn = fn
         self.args = args
         self.kwargs = kwargs
-        self.signals = WorkerSignals()
+        self.signals = signals if signals is not None else WorkerSignals()
 
     @pyqtSlot()
     def run(self):
+        result, error = None, None
         try:
             result = self.fn(*self.args, **self.kwargs)
-            self.signals.result.emit(result)
         except Exception as e:
-            self.signals.error.emit((e, traceback.format_exc()))
-        finally:
-            self.signals.finished.emit()
+            error = (e, traceback.format_exc())
+        # One emit per job, so the UI thread is woken only once
+        self.signals.finished.emit(result, error)
 
 class WorkerSignals(QObject):
-    finished = pyqtSignal()
-    error = pyqtSignal(tuple)
-    result = pyqtSignal(object)
-    progress = pyqtSignal(int)
+    finished = pyqtSignal(object, object)  # result, (exception, traceback) or None
 
 class VisualizationWidget(QWidget):
     # Signals
     update_requested = pyqtSignal()  # Signal to request data update
 
+    # Time range choices; anything else shows all data
+    _RANGES = {
+        '1 minute': timedelta(minutes=1),
+        '5 minutes': timedelta(minutes=5),
+        '15 minutes': timedelta(minutes=15),
+        '1 hour': timedelta(hours=1),
+    }
+
+    # Computed plots kept for reuse, e.g. when only the plot type changes
+    _PLOT_CACHE_SIZE = 4
+
+    # Curve styles shared by every widget; pens and brushes need no QApplication
+    _LINE_PEN = pg.mkPen('b', width=2)
+    _BAR_BRUSH = pg.mkBrush(0, 0, 255, 150)
+
     def __init__(self, data_processor, parent=None):
         super().__init__(parent)
         self.data_processor = data_processor
         self.chunked_handler = ChunkedDataHandler()
         self.plot_decimation = PERFORMANCE_CONFIG['plot_decimation']
+        self.inline_max_points = PERFORMANCE_CONFIG['plot_inline_max_points']
+        self._plot_cache: OrderedDict = OrderedDict()
         self.threadpool = QThreadPool()
+        # Shared by every plot worker, so the slots are connected only once
+        self._worker_signals = WorkerSignals(self)
+        self._worker_signals.finished.connect(self._processing_finished)
+        # Refresh requests arriving together start one worker, and never a
+        # second one while the first is still running
+        self._worker_running = False
+        self._rerun_requested = False
+        self._pending_timer = pg.QtCore.QTimer(self)
+        self._pending_timer.setSingleShot(True)
+        self._pending_timer.setInterval(PERFORMANCE_CONFIG['plot_update_delay'])
+        self._pending_timer.timeout.connect(self._do_update_plot)
         self.setup_ui()
         self.setup_plot()
         self.current_port = None
         self.update_timer = pg.QtCore.QTimer()
+        self.update_timer.setInterval(1000)  # Update every second while shown
         self.update_timer.timeout.connect(self.update_plot)
-        self.update_timer.start(1000)  # Update every second
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -102,6 +241,8 @@ class VisualizationWidget(QWidget):
         time_layout.addWidget(QLabel("Time Range:"))
         self.time_range = QComboBox()
         self.time_range.addItems(['1 minute', '5 minutes', '15 minutes', '1 hour', 'All'])
+        self._range_delta = self._RANGES.get(self.time_range.currentText())
+        self.time_range.currentTextChanged.connect(self._on_time_range_changed)
         self.time_range.currentTextChanged.connect(self.update_plot)
         time_layout.addWidget(self.time_range)
         control_layout.addLayout(time_layout)
@@ -120,119 +261,193 @@ class VisualizationWidget(QWidget):
         data_type_layout.addWidget(QLabel("Data Type:"))
         self.data_type = QComboBox()
         self.data_type.addItems(['Packet Size', 'Packet Rate', 'Cumulative'])
+        self._plot_kind = _PLOT_KINDS[self.data_type.currentText()]
+        self.data_type.currentTextChanged.connect(self._on_data_type_changed)
         self.data_type.currentTextChanged.connect(self.update_plot)
         data_type_layout.addWidget(self.data_type)
         control_layout.addLayout(data_type_layout)
 
+        # Return to following the data after zooming or panning
+        fit_button = QPushButton("Fit")
+        fit_button.clicked.connect(self.fit_plot)
+        control_layout.addWidget(fit_button)
+
         control_group.setLayout(control_layout)
         return control_group
 
     def setup_plot(self):
-        self.plot = self.plot_widget.plot([], [], pen=pg.mkPen('b', width=2))
+        # Plot-level settings, so every curve drawn later is reduced to
+        # per-pixel peaks within the visible range
+        self.plot_widget.setDownsampling(auto=True, mode='peak')
+        self.plot_widget.setClipToView(True)
+        self.plot_widget.setAntialiasing(False)
+
+        # One persistent curve per plot type; updates only replace their data
+        self._plot_items = {
+            'Line': self.plot_widget.plot([], [], pen=self._LINE_PEN),
+            'Scatter': self.plot_widget.plot([], [], pen=None, symbol='o', symbolSize=5),
+            'Bar': self.plot_widget.plot([], [], stepMode="center", fillLevel=0,
+                                         brush=self._BAR_BRUSH),
+        }
+        # Clipping cuts x and y to the same length, but step mode needs one more x edge
+        self._plot_items['Bar'].setClipToView(False)
+        for item in self._plot_items.values():
+            item.setVisible(False)
+        self.plot = self._plot_items[self.plot_type.currentText()]
+        self.plot.setVisible(True)
         self.plot_widget.setMouseEnabled(x=True, y=True)
         self.plot_widget.showGrid(x=True, y=True)
-        self.plot_widget.enableAutoRange()
+        # Ranges come from bounds computed with the plot data instead of a
+        # pyqtgraph rescan on every update; user zooming stops following them
+        self.plot_widget.disableAutoRange()
+        self._follow_data = True
+        self._data_range = None
+        self.plot_widget.getViewBox().sigRangeChangedManually.connect(self._on_manual_range)
 
     def set_port(self, port_name: str):
         """Set the port to visualize data from."""
         self.current_port = port_name
         self.update_plot()
 
+    @pyqtSlot(str)
+    def _on_time_range_changed(self, range_text: str):
+        self._range_delta = self._RANGES.get(range_text)
+
+    @pyqtSlot(str)
+    def _on_data_type_changed(self, data_type: str):
+        self._plot_kind = _PLOT_KINDS[data_type]
+
     def get_time_range(self):
         """Get the start time based on selected range."""
-        range_text = self.time_range.currentText()
-        now = datetime.now()
-        
-        if range_text == '1 minute':
-            return now - timedelta(minutes=1)
-        elif range_text == '5 minutes':
-            return now - timedelta(minutes=5)
-        elif range_text == '15 minutes':
-            return now - timedelta(minutes=15)
-        elif range_text == '1 hour':
-            return now - timedelta(hours=1)
-        else:
-            return None
+        # Uses the cached choice, so plot workers never read the combo box
+        delta = self._range_delta
+        return datetime.now() - delta if delta is not None else None
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_timer.start()
+        self.update_plot()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_timer.stop()
+        self._pending_timer.stop()
 
     def update_plot(self):
+        # Hidden plots are refreshed when they are shown again
+        if not self.isVisible():
+            return
+        self._pending_timer.start()
+
+    def _do_update_plot(self):
         if not self.current_port:
             return
+        if self._worker_running:
+            self._rerun_requested = True
+            return
 
-        # Create worker for background processing
-        worker = DataProcessWorker(self._process_plot_data)
-        worker.signals.result.connect(self._update_plot_data)
-        worker.signals.progress.connect(self._update_progress)
-        worker.signals.finished.connect(self._processing_finished)
+        # Small series take less time to process than a thread handoff
+        buffer = self.data_processor.buffers.get(self.current_port)
+        if buffer is None or len(buffer) <= self.inline_max_points:
+            self._update_plot_data(self._process_plot_data())
+            return
 
+        worker = DataProcessWorker(self._process_plot_data, signals=self._worker_signals)
+        self._worker_running = True
         self.progress_bar.show()
         self.threadpool.start(worker)
 
     def _process_plot_data(self):
-        df = self._get_decimated_data()
-        if df.empty:
-            return None
-
-        timestamps = df['timestamp'].values
-        data_type = self.data_type.currentText()
-        
-        if data_type == 'Packet Size':
-            y_data = df['data_size'].values
-        elif data_type == 'Packet Rate':
-            # Calculate packets per second using numpy
-            time_diff = np.diff(timestamps.astype(np.float64))
-            y_data = 1.0 / time_diff
-            timestamps = timestamps[1:]
-        else:  # Cumulative
-            y_data = np.cumsum(df['data_size'].values)
-
-        return timestamps, y_data
-
-    def _get_decimated_data(self):
-        data = self.data_processor.get_data_for_visualization(
+        start_time = self.get_time_range()
+        # Uses the cached choice, so plot workers never read the combo box
+        kind = self._plot_kind
+        key = (self.current_port, self._range_delta, kind,
+               self.data_processor.get_data_version(self.current_port))
+        cached = self._plot_cache.get(key)
+        # Without new data a relative range still loses points as they age out
+        if cached is not None and (start_time is None or cached[0] >= start_time.timestamp()):
+            self._plot_cache.move_to_end(key)
+            return cached[1]
+
+        # Plain columns, with timestamps as epoch seconds so plot items get numbers
+        timestamps, sizes = self.data_processor.get_visualization_arrays(
             self.current_port,
-            start_time=self.get_time_range()
+            start_time=start_time
         )
-        
-        if len(data) > self.plot_decimation:
-            # Use efficient decimation with numpy
-            indices = np.linspace(0, len(data)-1, self.plot_decimation, dtype=int)
-            return data.iloc[indices]
-        return data
+        if not len(timestamps):
+            return None
+        first_timestamp = timestamps[0]
+
+        timestamps, y_data = _reduce(timestamps, sizes, kind)
+        if not len(y_data):
+            return None
+        # Only finite points are plotted, so setData can skip its own check and
+        # LTTB's triangle areas never see the inf rates of equal timestamps
+        timestamps, y_data, y_range = _finite_points(timestamps, y_data)
+        if not len(y_data):
+            return None
+        # Full buffers hold more samples than pixels; LTTB keeps the visible shape
+        timestamps, y_data = _lttb(timestamps, y_data, self.plot_decimation)
+
+        result = timestamps, y_data, y_range
+        self._plot_cache[key] = (first_timestamp, result)
+        if len(self._plot_cache) > self._PLOT_CACHE_SIZE:
+            self._plot_cache.popitem(last=False)
+        return result
 
     @pyqtSlot(object)
     def _update_plot_data(self, result):
         if not result:
             return
 
-        timestamps, y_data = result
-        plot_type = self.plot_type.currentText()
+        timestamps, y_data, y_range = result
+        if self.plot is self._plot_items['Bar']:
+            # Bars span from each sample to the next, so they need one more edge
+            step = timestamps[-1] - timestamps[-2] if len(timestamps) > 1 else 1.0
+            timestamps = np.append(timestamps, timestamps[-1] + step)
+            if y_range is not None:
+                y_range = (min(y_range[0], 0.0), max(y_range[1], 0.0))  # bars fill to 0
+        # _process_plot_data only returns finite points
+        self.plot.setData(timestamps, y_data, connect='all', skipFiniteCheck=True)
+
+        # Timestamps are sorted, so the x range is just the end points
+        self._data_range = (timestamps[0], timestamps[-1]), y_range
+        if self._follow_data:
+            self._apply_data_range()
+
+    def _apply_data_range(self):
+        if self._data_range is None:
+            return
+        x_range, y_range = self._data_range
+        if y_range is None:
+            self.plot_widget.setXRange(*x_range)
+        else:
+            self.plot_widget.setRange(xRange=x_range, yRange=y_range)
 
-        self.plot_widget.clear()
-        if plot_type == 'Line':
-            self.plot = self.plot_widget.plot(timestamps, y_data, pen=pg.mkPen('b', width=2))
-        elif plot_type == 'Scatter':
-            self.plot = self.plot_widget.plot(timestamps, y_data, pen=None, symbol='o', symbolSize=5)
-        else:  # Bar
-            self.plot = self.plot_widget.plot(timestamps, y_data, stepMode="center", fillLevel=0, brush=(0,0,255,150))
+    @pyqtSlot(object)
+    def _on_manual_range(self, _mask):
+        self._follow_data = False
 
-    @pyqtSlot(int)
-    def _update_progress(self, value):
-        self.progress_bar.setValue(value)
+    def fit_plot(self):
+        """Fit the view to the data and keep following it on updates."""
+        self._follow_data = True
+        self._apply_data_range()
 
-    @pyqtSlot()
-    def _processing_finished(self):
+    @pyqtSlot(object, object)
+    def _processing_finished(self, result, error):
+        self._worker_running = False
         self.progress_bar.hide()
+        if error is None:
+            self._update_plot_data(result)
+        if self._rerun_requested:
+            self._rerun_requested = False
+            self.update_plot()
 
     def update_plot_type(self):
-        plot_type = self.plot_type.currentText()
-        
-        self.plot_widget.clear()
-        if plot_type == 'Line':
-            self.plot = self.plot_widget.plot([], [], pen=pg.mkPen('b', width=2))
-        elif plot_type == 'Scatter':
-            self.plot = self.plot_widget.plot([], [], pen=None, symbol='o', symbolSize=5)
-        else:  # Bar
-            self.plot = self.plot_widget.plot([], [], stepMode="center", fillLevel=0, brush=(0,0,255,150))
+        self.plot.setData([], [])
+        self.plot.setVisible(False)
+        self.plot = self._plot_items[self.plot_type.currentText()]
+        self.plot.setVisible(True)
 
         self.update_plot() 
 
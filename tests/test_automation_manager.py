@@ -0,0 +1,67 @@
+import threading
+import time
+import unittest
+from src.core.automation_manager import AutomationManager
+
+class TestAutomationManager(unittest.TestCase):
+    def setUp(self):
+        self.manager = AutomationManager()
+        self.manager.macro_recorder.actions = [{'type': 'send', 'params': {}, 'delay': 0}]
+
+    def tearDown(self):
+        self.manager.stop_timer()
+
+    def test_scheduled_task_runs(self):
+        ran = threading.Event()
+        action = {'type': 'macro', 'name': 'test', 'handler': lambda *args: ran.set()}
+
+        self.assertTrue(self.manager.schedule_task('task', {'interval': 60}, action))
+        self.assertTrue(ran.wait(timeout=2.0))
+
+    def test_failing_task_stays_scheduled(self):
+        ran = threading.Event()
+        good = {'type': 'macro', 'name': 'test', 'handler': lambda *args: ran.set()}
+
+        # Missing 'handler' makes this action raise when it runs
+        self.manager.schedule_task('bad', {'interval': 60}, {'type': 'macro', 'name': 'test'})
+        self.manager.schedule_task('good', {'interval': 60}, good)
+        self.assertTrue(ran.wait(timeout=2.0))
+        time.sleep(0.05)
+        self.assertIn('bad', self.manager._next_run)
+        self.assertIn('good', self.manager._next_run)
+
+    def test_removed_task_does_not_run(self):
+        ran = threading.Event()
+        action = {'type': 'macro', 'name': 'test', 'handler': lambda *args: ran.set()}
+
+        self.manager.stop_timer()
+        self.manager.schedule_task('task', {'interval': 60}, action)
+        self.assertTrue(self.manager.remove_task('task'))
+        self.manager.start_timer()
+        self.assertFalse(ran.wait(timeout=0.2))
+
+    def test_stop_timer_ends_thread(self):
+        thread = self.manager.task_timer
+        self.manager.stop_timer()
+        self.assertFalse(thread.is_alive())
+
+    def test_script_output(self):
+        engine = self.manager.script_engine
+        self.assertTrue(engine.run_script('script', 'print("a", 1)\nprint("b")', {}))
+        thread = engine.running_scripts.get('script')
+        if thread:
+            thread.join(timeout=2.0)
+        self.assertEqual(engine.get_output('script'), ['a 1', 'b'])
+        self.assertEqual(engine.get_output('script'), [])
+
+    def test_precompiled_script(self):
+        engine = self.manager.script_engine
+        code = compile('print("compiled")', 'script', 'exec')
+        self.assertTrue(engine.run_script('script', code, {}))
+        thread = engine.running_scripts.get('script')
+        if thread:
+            thread.join(timeout=2.0)
+        self.assertEqual(engine.get_output('script'), ['compiled'])
+
+if __name__ == '__main__':
+    unittest.main()
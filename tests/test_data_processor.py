@@ -0,0 +1,350 @@
+import csv
+import json
+import os
+import re
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from src.core import data_processor
+from src.core.data_processor import DataProcessor, OptimizedDataBuffer
+
+class TestOptimizedDataBuffer(unittest.TestCase):
+    def setUp(self):
+        self.buffer = OptimizedDataBuffer(max_size=4)
+        self.start = datetime(2024, 1, 1)
+        for i in range(6):
+            self.buffer.append(self.start + timedelta(seconds=i), bytes([i]))
+
+    def test_max_size(self):
+        data = self.buffer.get_data()
+        self.assertEqual([d for _, d in data], [b'\x02', b'\x03', b'\x04', b'\x05'])
+
+    def test_get_data_time_range(self):
+        data = self.buffer.get_data(self.start + timedelta(seconds=3),
+                                    self.start + timedelta(seconds=4))
+        self.assertEqual(data, [(self.start + timedelta(seconds=3), b'\x03'),
+                                (self.start + timedelta(seconds=4), b'\x04')])
+
+    def test_clear_old_data(self):
+        self.buffer.clear_old_data(self.start + timedelta(seconds=4))
+        self.assertEqual([d for _, d in self.buffer.get_data()], [b'\x04', b'\x05'])
+
+    def test_statistics(self):
+        buffer = OptimizedDataBuffer(max_size=3)
+        for size in (5, 1, 3, 2):
+            buffer.append(self.start, b'x' * size)
+
+        stats = buffer.get_statistics()
+        self.assertEqual(stats['total_bytes'], 6)
+        self.assertEqual(stats['packet_count'], 3)
+        self.assertEqual(stats['min_packet_size'], 1)
+        self.assertEqual(stats['max_packet_size'], 3)
+        self.assertAlmostEqual(stats['std_dev_packet_size'], 0.816496580927726)
+
+        ranged = buffer.get_statistics(self.start, self.start)
+        for key, value in stats.items():
+            self.assertAlmostEqual(ranged[key], value)
+
+class TestDataProcessor(unittest.TestCase):
+    def setUp(self):
+        self.processor = DataProcessor()
+        self.matches = []
+        self.processor.pattern_matched.connect(
+            lambda port, name, data: self.matches.append((port, name, data))
+        )
+
+    @unittest.skipUnless(data_processor.hyperscan, 'hyperscan is not installed')
+    def test_hyperscan_spans_match_re(self):
+        batches = []
+        self.processor.patterns_matched_batch.connect(
+            lambda port, hits: batches.append(hits)
+        )
+        self.processor.add_pattern('err', 'ERR[0-9]+')
+        self.processor.add_pattern('ok', 'OK')
+
+        self.processor.process_data('COM1', b'xx ERR42')
+        self.assertIsNotNone(self.processor._get_pattern_db())
+        self.assertEqual(batches, [[('err', 3, 8)]])
+
+    def test_pattern_matched(self):
+        self.assertTrue(self.processor.add_pattern('ok', 'OK'))
+        self.assertTrue(self.processor.add_pattern('err', 'ERR[0-9]+'))
+
+        self.processor.process_data('COM1', b'status ERR42')
+        self.assertEqual(self.matches, [('COM1', 'err', b'status ERR42')])
+
+    def test_pattern_matches_batched(self):
+        batches = []
+        self.processor.patterns_matched_batch.connect(
+            lambda port, hits: batches.append((port, hits))
+        )
+        self.processor.add_pattern('ok', 'OK')
+        self.processor.add_pattern('err', 'ERR[0-9]+')
+
+        self.processor.process_data('COM1', b'OK ERR42')
+        self.assertEqual(batches, [('COM1', [('ok', 0, 2), ('err', 3, 8)])])
+
+    def test_port_signals_only_carry_own_port(self):
+        matches, filtered = [], []
+        signals = self.processor.port_signals('COM2')
+        signals.pattern_matched.connect(lambda name, data: matches.append((name, data)))
+        signals.data_filtered.connect(filtered.append)
+        self.processor.add_pattern('ok', 'OK')
+        self.processor.add_filter('noise', 'X')
+
+        self.processor.process_data('COM1', b'OKX')
+        self.processor.process_data('COM2', b'OKX')
+        self.assertEqual(matches, [('ok', b'OKX')])
+        self.assertEqual(filtered, [b'OK'])
+        self.assertIs(self.processor.port_signals('COM2'), signals)
+
+    def test_removed_pattern_not_matched(self):
+        self.processor.add_pattern('ok', 'OK')
+        self.processor.remove_pattern('ok')
+
+        self.processor.process_data('COM1', b'OK')
+        self.assertEqual(self.matches, [])
+
+    def test_cached_matches_invalidated(self):
+        self.processor.add_pattern('ok', 'OK')
+        self.processor.process_data('COM1', b'OK')
+        self.processor.process_data('COM1', b'OK')
+        self.processor.remove_pattern('ok')
+        self.processor.process_data('COM1', b'OK')
+        self.assertEqual(self.matches, [('COM1', 'ok', b'OK')] * 2)
+
+    def test_invalid_pattern_rejected(self):
+        self.assertFalse(self.processor.add_pattern('bad', '(unclosed'))
+
+    def test_filter_removes_matches(self):
+        self.processor.add_filter('noise', 'xx')
+        self.assertEqual(self.processor.process_data('COM1', b'axxbxx'), b'ab')
+
+    def test_unfiltered_data_not_copied(self):
+        data = b'payload without matches'
+        self.assertIs(self.processor.process_data('COM1', data), data)
+
+        self.processor.add_filter('noise', 'xx')
+        self.processor.add_filter('digits', '[0-9]')
+        self.assertIs(self.processor.process_data('COM1', data), data)
+
+    def test_overlapping_literal_filter_matches(self):
+        self.processor.add_filter('aa', 'aa')
+        self.processor.add_filter('digits', '[0-9]')
+        self.assertEqual(self.processor.process_data('COM1', b'aaa1'), b'a')
+
+    def test_literal_filters_applied_in_sequence(self):
+        self.processor.add_filter('a', 'a')
+        self.processor.add_filter('bc', 'bc')
+        self.assertEqual(self.processor.process_data('COM1', b'bac'), b'')
+
+    def test_regex_filters(self):
+        self.processor.add_filter('digits', '[0-9]+')
+        self.processor.add_filter('spaces', r'\s+')
+        self.processor.add_filter('repeat', r'(z)\1')
+        self.assertEqual(self.processor.process_data('COM1', b'a 12 bzzc'), b'abc')
+
+        self.processor.remove_filter('spaces')
+        self.assertEqual(self.processor.process_data('COM1', b'a 12 b'), b'a  b')
+
+    def test_filters_applied_in_sequence(self):
+        # Removing 'a' exposes 'bc' to the next filter
+        self.processor.add_filter('a', 'a')
+        self.processor.add_filter('bc', 'b[c]')
+        self.assertEqual(self.processor.process_data('COM1', b'bac'), b'')
+
+    def test_cached_filter_result_invalidated(self):
+        data = b'xx' * 64
+        self.assertEqual(self.processor.process_data('COM1', data), data)
+
+        self.processor.add_filter('noise', 'xx')
+        self.assertEqual(self.processor.process_data('COM1', data), b'')
+
+    def test_large_payloads_not_cached(self):
+        self.processor.add_filter('noise', 'xx')
+        data = b'axx' * 1024
+        self.assertEqual(self.processor.process_data('COM1', data), b'a' * 1024)
+        self.assertEqual(len(self.processor.cache), 0)
+
+    def test_repeated_payload_still_matches_patterns(self):
+        self.processor.add_pattern('ok', 'OK')
+        data = b'OK' * 64
+        self.processor.process_data('COM1', data)
+        self.processor.process_data('COM1', data)
+        self.assertEqual(len(self.matches), 2)
+
+    def test_filtered_data_keeps_trailing_lines(self):
+        self.processor.add_filter('noise', 'xx')
+        self.processor.process_data('COM1', b'one\ntwxxo\n')
+        self.processor.process_data('COM1', b'three\nfo')
+        self.processor.process_data('COM1', b'ur')
+
+        self.assertEqual(self.processor.get_filtered_data('COM1'), 'one\ntwo\nthree\nfour')
+        self.assertEqual(self.processor.get_filtered_data('COM1', max_lines=2), 'three\nfour')
+        self.assertEqual(self.processor.get_filtered_data('COM1', max_lines=10),
+                         'one\ntwo\nthree\nfour')
+        self.assertEqual(self.processor.get_filtered_data('COM2'), '')
+
+    def test_filtered_data_only_filters_trailing_payloads(self):
+        for _ in range(100):
+            self.processor.process_data('COM1', b'old\n')
+        self.processor.process_data('COM1', b'new\nli')
+        self.processor.process_data('COM1', b'ne')
+
+        with patch.object(self.processor, '_apply_filters',
+                          wraps=self.processor._apply_filters) as apply_filters:
+            self.assertEqual(self.processor.get_filtered_data('COM1', max_lines=1), 'line')
+        self.assertEqual(apply_filters.call_count, 2)
+
+    def test_export_json(self):
+        self.processor.process_data('COM1', b'AB')
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'export.json')
+            self.assertTrue(self.processor.export_data('COM1', 'json', filename))
+            with open(filename) as f:
+                exported = json.load(f)
+
+        self.assertEqual(len(exported), 1)
+        self.assertEqual(exported[0]['data'], '4142')
+        self.assertEqual(exported[0]['ascii'], 'AB')
+
+    def test_export_json_escapes_text(self):
+        self.processor.process_data('COM1', b'"a\\b"\n\xff')
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'export.json')
+            self.assertTrue(self.processor.export_data('COM1', 'json', filename))
+            with open(filename) as f:
+                exported = json.load(f)
+
+        self.assertEqual(exported[0]['ascii'], '"a\\b"\n\ufffd')
+
+    def test_export_csv(self):
+        self.processor.process_data('COM1', b'AB')
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'export.csv')
+            self.assertTrue(self.processor.export_data('COM1', 'csv', filename))
+            with open(filename, newline='') as f:
+                exported = list(csv.DictReader(f))
+
+        self.assertEqual(len(exported), 1)
+        self.assertEqual(exported[0]['data'], '4142')
+
+    def test_export_xml(self):
+        self.processor.process_data('COM1', b'AB')
+        self.processor.process_data('COM1', b'C')
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'export.xml')
+            self.assertTrue(self.processor.export_data('COM1', 'xml', filename))
+            root = ET.parse(filename).getroot()
+
+        self.assertEqual([p.findtext('ascii') for p in root.findall('packet')], ['AB', 'C'])
+
+    def test_search_accepts_compiled_pattern(self):
+        self.processor.process_data('COM1', b'Hello')
+        self.processor.process_data('COM1', b'world')
+        results = self.processor.search_data('COM1', re.compile(b'hello', re.IGNORECASE))
+        self.assertEqual([data for _, data in results], [b'Hello'])
+        self.assertEqual(self.processor.search_data('COM1', '(unclosed'), [])
+
+    def test_search_literal(self):
+        for chunk in (b'abHELLO', b'hel', b'lo', b'say hello hello'):
+            self.processor.process_data('COM1', chunk)
+
+        results = self.processor.search_literal('COM1', b'hello')
+        self.assertEqual([data for _, data in results], [b'say hello hello'])
+
+        results = self.processor.search_literal('COM1', b'hello', ignore_case=True)
+        self.assertEqual([data for _, data in results], [b'abHELLO', b'say hello hello'])
+
+    def test_search_timeout(self):
+        self.processor.process_data('COM1', b'Hello')
+        with self.assertRaises(TimeoutError):
+            self.processor.search_data('COM1', re.compile(b'hello'), timeout=0)
+
+    def test_recording_streams_packets(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            recording = os.path.join(tmp_dir, 'recording.json')
+            export = os.path.join(tmp_dir, 'export.json')
+            self.assertTrue(self.processor.start_recording('COM1', 'json', recording))
+            self.processor.process_data('COM1', b'AB')
+            self.processor.process_data('COM1', b'C')
+
+            self.assertTrue(self.processor.export_data('COM1', 'json', export))
+            with open(export) as f:
+                exported = json.load(f)
+
+            self.assertEqual(self.processor.stop_recording('COM1'), recording)
+            with open(recording) as f:
+                recorded = json.load(f)
+
+        self.assertEqual([p['ascii'] for p in exported], ['AB', 'C'])
+        self.assertEqual(recorded, exported)
+
+    def test_export_while_recording_includes_earlier_packets(self):
+        self.processor.process_data('COM1', b'AB')
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            recording = os.path.join(tmp_dir, 'recording.json')
+            export = os.path.join(tmp_dir, 'export.json')
+            self.assertTrue(self.processor.start_recording('COM1', 'json', recording))
+            self.processor.process_data('COM1', b'C')
+
+            self.assertTrue(self.processor.export_data('COM1', 'json', export))
+            self.processor.stop_recording('COM1')
+            with open(export) as f:
+                exported = json.load(f)
+
+        self.assertEqual([p['ascii'] for p in exported], ['AB', 'C'])
+
+    def test_recording_write_error_stops_recording(self):
+        errors = []
+        self.processor.error_detected.connect(lambda port, error: errors.append(port))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            recording = os.path.join(tmp_dir, 'recording.csv')
+            self.assertTrue(self.processor.start_recording('COM1', 'csv', recording))
+            with patch.object(self.processor.recorders['COM1'], 'write',
+                              side_effect=OSError('disk full')):
+                self.assertEqual(self.processor.process_data('COM1', b'AB'), b'AB')
+
+        self.assertEqual(errors, ['COM1'])
+        self.assertNotIn('COM1', self.processor.recorders)
+
+    def test_export_unknown_format(self):
+        self.processor.process_data('COM1', b'AB')
+        self.assertFalse(self.processor.export_data('COM1', 'yaml', 'unused.yaml'))
+
+    def test_data_for_visualization(self):
+        self.processor.process_data('COM1', b'AB')
+        self.processor.process_data('COM1', b'CDE')
+        df = self.processor.get_data_for_visualization('COM1')
+        self.assertEqual(list(df.columns), ['timestamp', 'data_size'])
+        self.assertEqual(list(df['data_size']), [2, 3])
+
+    def test_data_version_changes_with_contents(self):
+        self.assertEqual(self.processor.get_data_version('COM1'), 0)
+        self.processor.process_data('COM1', b'AB')
+        version = self.processor.get_data_version('COM1')
+        self.assertEqual(self.processor.get_data_version('COM1'), version)
+
+        self.processor.process_data('COM1', b'C')
+        self.assertNotEqual(self.processor.get_data_version('COM1'), version)
+        version = self.processor.get_data_version('COM1')
+        self.processor.clear_data('COM1')
+        self.assertNotEqual(self.processor.get_data_version('COM1'), version)
+
+    def test_visualization_arrays(self):
+        self.processor.process_data('COM1', b'AB')
+        self.processor.process_data('COM1', b'CDE')
+        timestamps, sizes = self.processor.get_visualization_arrays('COM1')
+        self.assertEqual(timestamps.dtype.kind, 'f')
+        self.assertLessEqual(timestamps[0], timestamps[1])
+        self.assertEqual(sizes.tolist(), [2, 3])
+        self.assertEqual(len(self.processor.get_visualization_arrays('COM2')[0]), 0)
+
+        start = datetime.now() + timedelta(hours=1)
+        timestamps, sizes = self.processor.get_visualization_arrays('COM1', start_time=start)
+        self.assertEqual((len(timestamps), len(sizes)), (0, 0))
+
+if __name__ == '__main__':
+    unittest.main()
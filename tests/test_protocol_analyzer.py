@@ -0,0 +1,51 @@
+import unittest
+from src.core.protocol_analyzer import ProtocolAnalyzer
+
+class TestProtocolAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = ProtocolAnalyzer()
+
+    def test_modbus_crc_valid(self):
+        # Read holding registers request with its known CRC 0x0A84, sent low byte first (84 0A)
+        frame = bytes.fromhex('010300000001840a')
+        self.assertTrue(self.analyzer._check_modbus_crc(frame))
+
+    def test_modbus_crc_invalid(self):
+        frame = bytes.fromhex('010300000001840b')
+        self.assertFalse(self.analyzer._check_modbus_crc(frame))
+
+    def test_modbus_crc_too_short(self):
+        self.assertFalse(self.analyzer._check_modbus_crc(b'\x01\x03\x00'))
+
+    def test_modbus_frame_extracted(self):
+        frame = self.analyzer.analyze_frame('COM1', bytes.fromhex('010300000001840a'))
+        self.assertIsNotNone(frame)
+        self.assertEqual(frame.protocol, 'Modbus RTU')
+        self.assertEqual(frame.parsed_data['unit_id'], 1)
+        self.assertEqual(frame.parsed_data['function_code'], 3)
+        self.assertEqual(frame.parsed_data['data'], '00 00 00 01')
+        self.assertEqual(frame.parsed_data['crc'], '84 0a')
+
+    def test_serial_frame_consumes_buffer(self):
+        frame = self.analyzer.analyze_frame('COM1', b'\x02AB\x03\x02C')
+        self.assertIsNotNone(frame)
+        self.assertEqual(frame.protocol, 'RS-232/485')
+        self.assertEqual(frame.data, b'\x02AB\x03')
+        offset = self.analyzer.read_offset['COM1']
+        self.assertEqual(bytes(self.analyzer.frame_buffer['COM1'][offset:]), b'\x02C')
+
+    def test_serial_buffer_compacted(self):
+        self.analyzer.compact_threshold = 4
+        self.analyzer.analyze_frame('COM1', b'\x02AB\x03')
+        self.assertEqual(len(self.analyzer.frame_buffer['COM1']), 0)
+
+        self.analyzer.analyze_frame('COM1', b'\x02ABCD\x03\x02')
+        self.assertEqual(bytes(self.analyzer.frame_buffer['COM1']), b'\x02')
+        self.assertEqual(self.analyzer.read_offset['COM1'], 0)
+
+    def test_calculate_parity(self):
+        self.assertEqual(self.analyzer._calculate_parity(b'\x01\x02\x04'), 0x07)
+        self.assertEqual(self.analyzer._calculate_parity(b''), 0)
+
+if __name__ == '__main__':
+    unittest.main()
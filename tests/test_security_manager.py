@@ -0,0 +1,140 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.core.security_manager import SecurityManager
+
+class TestSecurityManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.manager = SecurityManager(os.path.join(self.tmp_dir.name, 'security_config.json'))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_default_admin_authenticates(self):
+        self.assertIn('salt', self.manager.users['admin'])
+        self.assertTrue(self.manager.authenticate('admin', 'admin'))
+        self.assertFalse(self.manager.authenticate('admin', 'wrong'))
+
+    def test_authenticate_accepts_bytes(self):
+        self.assertTrue(self.manager.authenticate('admin', b'admin'))
+        self.assertTrue(self.manager.authenticate('admin', bytearray(b'admin')))
+        self.assertFalse(self.manager.authenticate('admin', b'wrong'))
+
+    def test_failed_logins_emit_once(self):
+        statuses = []
+        self.manager.auth_status_changed.connect(
+            lambda username, ok: statuses.append((username, ok))
+        )
+        self.manager.authenticate('admin', 'wrong')
+        self.manager.authenticate('admin', 'wrong')
+        self.manager.authenticate('admin', 'admin')
+        self.assertEqual(statuses, [('admin', False), ('admin', True)])
+
+    def test_password_change_during_login_rejected(self):
+        def change_password(user, password):
+            # Another thread replaces the password while this hash is checked
+            self.manager.users['admin']['password_hash'] = 'changed'
+            return True
+
+        with patch.object(self.manager, '_verify_password', side_effect=change_password):
+            self.assertFalse(self.manager.authenticate('admin', 'admin'))
+        self.assertFalse(self.manager.is_authenticated('admin'))
+
+    def test_check_permission(self):
+        self.assertFalse(self.manager.check_permission('admin', 'write'))
+        self.manager.authenticate('admin', 'admin')
+        self.assertTrue(self.manager.add_user('admin', 'bob', 'pw', permissions=['read']))
+        self.manager.authenticate('bob', 'pw')
+
+        self.assertTrue(self.manager.check_permission('admin', 'write'))
+        self.assertTrue(self.manager.check_permission('bob', 'read'))
+        self.assertFalse(self.manager.check_permission('bob', 'write'))
+
+        self.assertEqual(self.manager.get_admin_username(), 'admin')
+        self.assertTrue(self.manager.set_permissions('bob', ['write']))
+        self.assertTrue(self.manager.check_permission('bob', 'write'))
+        self.assertFalse(self.manager.check_permission('bob', 'read'))
+
+    def test_repeat_login_skips_hashing(self):
+        self.assertTrue(self.manager.authenticate('admin', 'admin'))
+        with patch.object(self.manager, '_verify_password') as verify:
+            self.assertTrue(self.manager.authenticate('admin', 'admin'))
+            verify.assert_not_called()
+
+            verify.return_value = False
+            self.assertFalse(self.manager.authenticate('admin', 'wrong'))
+
+    def test_password_change_invalidates_cached_login(self):
+        self.manager.authenticate('admin', 'admin')
+        self.assertTrue(self.manager.change_password('admin', 'admin', 'new'))
+        self.assertFalse(self.manager.authenticate('admin', 'admin'))
+        self.assertTrue(self.manager.authenticate('admin', 'new'))
+
+    def test_legacy_hash_upgraded_on_login(self):
+        self.manager.users['legacy'] = {
+            'password_hash': hashlib.sha256(b'secret').hexdigest(),
+            'role': 'user',
+            'permissions': []
+        }
+        self.assertTrue(self.manager.authenticate('legacy', 'secret'))
+        self.assertIn('salt', self.manager.users['legacy'])
+        self.assertTrue(self.manager.authenticate('legacy', 'secret'))
+
+    def test_config_reloaded(self):
+        self.manager.users['admin']['role'] = 'changed'
+        reloaded = SecurityManager(self.manager.config_file)
+        self.assertEqual(reloaded.users['admin']['role'], 'admin')
+
+        self.manager.save_config()
+        reloaded.load_config()
+        self.assertEqual(reloaded.users['admin']['role'], 'changed')
+
+    def test_unencrypted_port_passes_through(self):
+        self.assertEqual(self.manager.encrypt_data('COM1', b'data'), b'data')
+        self.assertEqual(self.manager.decrypt_data('COM1', b'data'), b'data')
+
+    def test_encryption_round_trip(self):
+        self.assertTrue(self.manager.setup_encryption('COM1'))
+        token = self.manager.encrypt_data('COM1', b'data')
+        self.assertNotEqual(token, b'data')
+        self.assertEqual(self.manager.decrypt_data('COM1', token), b'data')
+
+    def test_encrypt_accepts_buffers(self):
+        self.manager.setup_encryption('COM1')
+        for data in (bytearray(b'data'), memoryview(b'data')):
+            token = self.manager.encrypt_data('COM1', data)
+            self.assertEqual(self.manager.decrypt_data('COM1', bytearray(token)), b'data')
+
+    def test_decrypt_errors_rate_limited(self):
+        self.manager.setup_encryption('COM1')
+        errors = []
+        self.manager.security_error.connect(errors.append)
+        with self.assertLogs('src.core.security_manager', 'ERROR') as logs:
+            for _ in range(3):
+                self.assertIsNone(self.manager.decrypt_data('COM1', b'not a token'))
+        self.assertEqual(len(logs.output), 3)
+        self.assertEqual(len(errors), 1)
+
+    def test_remove_encryption(self):
+        self.manager.setup_encryption('COM1')
+        self.assertTrue(self.manager.remove_encryption('COM1'))
+        self.assertFalse(self.manager.remove_encryption('COM1'))
+        self.assertNotIn('COM1', self.manager.encryption_keys)
+        self.assertEqual(self.manager.encrypt_data('COM1', b'data'), b'data')
+
+    def test_set_port_encryption_bulk(self):
+        self.manager.setup_encryption('COM1')
+        key = self.manager.encryption_keys['COM1']
+        self.manager.setup_encryption('COM3')
+        self.assertTrue(self.manager.set_port_encryption_bulk(
+            {'COM1': True, 'COM2': True, 'COM3': False}
+        ))
+        self.assertEqual(self.manager.encryption_keys['COM1'], key)
+        self.assertIn('COM2', self.manager.encryption_keys)
+        self.assertNotIn('COM3', self.manager.encryption_keys)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,7 @@
+import os
+import time
 import unittest
+import serial
 from unittest.mock import Mock, patch
 from src.core.serial_manager import SerialManager
 
@@ -19,11 +22,125 @@ class TestSerialManager(unittest.TestCase):
         self.assertEqual(len(ports), 1)
         self.assertEqual(ports[0], ('COM1', 'Test Port'))
 
+        # Listing again within the TTL reuses the cached result
+        self.assertIs(self.serial_manager.list_ports(), ports)
+        mock_comports.assert_called_once()
+
+        # Bypassing the cache always rescans
+        self.serial_manager.list_ports(use_cache=False)
+        self.assertEqual(mock_comports.call_count, 2)
+
     def test_port_settings(self):
         # Test default port settings
         settings = self.serial_manager.get_port_settings('COM1')
         self.assertIsNone(settings)  # Should be None when port is not connected
 
+    def test_read_loop_drains_waiting_bytes(self):
+        ser = Mock(is_open=True, in_waiting=2)
+        self.serial_manager.connections['COM1'] = ser
+        self.serial_manager.running['COM1'] = True
+
+        def read(size=1):
+            data = reads.pop(0)
+            if not reads:
+                self.serial_manager.running['COM1'] = False
+            return data
+        reads = [b'', b'A', b'BC']
+        ser.read.side_effect = read
+
+        received = []
+        self.serial_manager.data_received.connect(
+            lambda port, data: received.append((port, data))
+        )
+
+        self.serial_manager._read_loop('COM1')
+        ser.read.assert_called_with(2)
+        self.assertEqual(received, [])
+
+        self.serial_manager._flush_reads()
+        self.assertEqual(received, [('COM1', b'ABC')])
+
+    def test_reads_coalesced_per_flush(self):
+        received = []
+        self.serial_manager.data_received.connect(
+            lambda port, data: received.append((port, data))
+        )
+        self.serial_manager._buffer_read('COM1', b'A')
+        self.serial_manager._buffer_read('COM2', b'X')
+        self.serial_manager._buffer_read('COM1', b'B')
+
+        self.serial_manager._flush_reads()
+        self.serial_manager._flush_reads()
+        self.assertEqual(received, [('COM1', b'AB'), ('COM2', b'X')])
+
+    def test_port_signals_only_carry_own_port(self):
+        received = []
+        self.serial_manager.port_signals('COM2').data_received.connect(received.append)
+        self.serial_manager._buffer_read('COM1', b'A')
+        self.serial_manager._buffer_read('COM2', b'X')
+
+        self.serial_manager._flush_reads()
+        self.assertEqual(received, [b'X'])
+        self.assertIs(self.serial_manager.port_signals('COM2'),
+                      self.serial_manager.port_signals('COM2'))
+
+    @patch('serial.Serial')
+    def test_open_and_disconnect_share_lifecycle(self, mock_serial):
+        mock_serial.return_value.read.return_value = b''
+        statuses = []
+        self.serial_manager.connection_status_changed.connect(
+            lambda port, connected: statuses.append((port, connected))
+        )
+
+        self.assertTrue(self.serial_manager.open_connection('COM1', baud_rate=115200))
+        self.assertFalse(self.serial_manager.open_connection('COM1'))
+        self.assertEqual(mock_serial.call_args.kwargs['baudrate'], 115200)
+
+        self.assertTrue(self.serial_manager.disconnect_port('COM1'))
+        self.assertFalse(self.serial_manager.close_connection('COM1'))
+        self.assertEqual(statuses, [('COM1', True), ('COM1', False)])
+        self.assertEqual(self.serial_manager.read_threads, {})
+
+    @unittest.skipUnless(os.name == 'posix', 'reactor requires selectable file descriptors')
+    def test_reactor_reads_registered_port(self):
+        read_fd, write_fd = os.pipe()
+        self.addCleanup(os.close, read_fd)
+        self.addCleanup(os.close, write_fd)
+        ser = Mock(is_open=True, in_waiting=0)
+        ser.fileno.return_value = read_fd
+        ser.read.side_effect = lambda size: os.read(read_fd, size)
+        self.serial_manager.connections['COM1'] = ser
+        self.serial_manager.running['COM1'] = True
+
+        self.assertTrue(self.serial_manager._register_port('COM1', ser))
+        os.write(write_fd, b'A')
+        deadline = time.monotonic() + 2.0
+        while not self.serial_manager._read_buf.get('COM1') and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(bytes(self.serial_manager._read_buf['COM1']), b'A')
+
+        reactor = self.serial_manager._reactor_thread
+        self.assertTrue(self.serial_manager.close_connection('COM1'))
+        reactor.join(timeout=2.0)
+        self.assertFalse(reactor.is_alive())
+        self.assertEqual(self.serial_manager.read_threads, {})
+
+    def test_send_errors_rate_limited(self):
+        ser = Mock(is_open=True)
+        ser.write.side_effect = serial.SerialException('device busy')
+        self.serial_manager.connections['COM1'] = ser
+        errors = []
+        self.serial_manager.error_occurred.connect(
+            lambda port, message: errors.append((port, message))
+        )
+
+        with self.assertLogs('src.core.serial_manager', 'ERROR') as logs:
+            self.assertFalse(self.serial_manager.send_data('COM1', b'A'))
+            self.assertFalse(self.serial_manager.send_data('COM1', b'A'))
+
+        self.assertEqual(errors, [('COM1', 'Send error: device busy')])
+        self.assertEqual(len(logs.records), 2)
+
     def test_connection_status(self):
         # Test connection status for non-existent port
         self.assertFalse(self.serial_manager.is_connected('COM1'))
@@ -0,0 +1,97 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from datetime import datetime, timedelta
+from src.core.data_processor import DataProcessor
+from src.core.session_manager import SessionManager
+
+class TestSessionManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.manager = SessionManager(self.tmp_dir.name)
+        self.manager.memory_timer.stop()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_save_and_load_session(self):
+        session_data = {'tabs': [{'port_name': 'COM1'}], 'split_view': False}
+        filename = os.path.join(self.tmp_dir.name, 'sessions', 'session.json')
+
+        self.assertTrue(self.manager.save_session(session_data, filename))
+        self.assertEqual(self.manager.load_session(filename), session_data)
+
+    def test_recent_sessions_newest_first(self):
+        sessions_dir = self.manager.get_app_data_path('sessions')
+        for index, name in enumerate(['a.json', 'b.json', 'c.json', 'notes.txt']):
+            path = os.path.join(sessions_dir, name)
+            with open(path, 'w') as f:
+                f.write('{}')
+            os.utime(path, (1000 + index, 1000 + index))
+
+        recent = self.manager.get_recent_sessions(max_count=2)
+        self.assertEqual([s['name'] for s in recent], ['c.json', 'b.json'])
+
+    def test_old_data_archived(self):
+        processor = DataProcessor()
+        processor.process_data('COM1', b'AB')
+        buffer = processor.buffers['COM1']
+        buffer.append(datetime.now(), b'C')
+        # Age the first packet past the one hour archive cutoff
+        buffer._timestamps[0] -= timedelta(hours=2)
+        self.manager.data_processor = processor
+
+        self.manager._serialize_old_data()
+
+        archive_dir = self.manager.get_app_data_path('archive')
+        (archive_file,) = os.listdir(archive_dir)
+        with gzip.open(os.path.join(archive_dir, archive_file)) as f:
+            archive = json.load(f)
+        blob = bytes.fromhex(archive['blob'])
+        self.assertIn(archive['digest']['algorithm'], ('blake3', 'blake2b'))
+        self.assertEqual([blob[offset:offset + length] for _, offset, length in archive['records']],
+                         [b'AB'])
+        self.assertEqual([d for _, d in buffer.get_data()], [b'C'])
+
+    def test_posix_port_archived_in_archive_dir(self):
+        processor = DataProcessor()
+        processor.process_data('/dev/ttyUSB0', b'AB')
+        processor.buffers['/dev/ttyUSB0']._timestamps[0] -= timedelta(hours=2)
+        self.manager.data_processor = processor
+        errors = []
+        self.manager.session_error.connect(errors.append)
+
+        self.manager._serialize_old_data()
+
+        self.assertEqual(errors, [])
+        (archive_file,) = os.listdir(self.manager.get_app_data_path('archive'))
+        self.assertTrue(archive_file.startswith('_dev_ttyUSB0_'))
+
+    def test_failed_archive_keeps_data(self):
+        processor = DataProcessor()
+        processor.process_data('COM1', b'AB')
+        processor.buffers['COM1']._timestamps[0] -= timedelta(hours=2)
+        self.manager.data_processor = processor
+        errors = []
+        self.manager.session_error.connect(errors.append)
+
+        with patch('src.core.session_manager._write_atomic', side_effect=OSError('disk full')):
+            self.manager._serialize_old_data()
+
+        self.assertEqual(len(errors), 1)
+        self.assertEqual([d for _, d in processor.buffers['COM1'].get_data()], [b'AB'])
+
+    def test_memory_sampled_every_n_checks(self):
+        memory = self.manager.memory_manager
+        memory.sample_every = 3
+        with patch.object(memory._process, 'memory_info') as memory_info:
+            memory_info.return_value.rss = 0
+            for _ in range(7):
+                memory.check_memory_usage()
+        self.assertEqual(memory_info.call_count, 3)
+
+if __name__ == '__main__':
+    unittest.main()
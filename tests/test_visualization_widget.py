@@ -0,0 +1,70 @@
+import unittest
+import warnings
+from datetime import datetime, timedelta
+import numpy as np
+from PyQt6.QtWidgets import QApplication
+from src.core.data_processor import DataProcessor, OptimizedDataBuffer
+from src.ui.visualization_widget import VisualizationWidget
+
+class TestVisualizationWidget(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.processor = DataProcessor()
+        buffer = self.processor.buffers['COM1'] = OptimizedDataBuffer()
+        start = datetime.now() - timedelta(seconds=30)
+        for i in range(40):
+            buffer.append(start + timedelta(milliseconds=500 * i), b'x' * (i % 7 + 1))
+        self.widget = VisualizationWidget(self.processor)
+        self.widget.current_port = 'COM1'
+
+    def tearDown(self):
+        self.widget.update_timer.stop()
+        self.widget.deleteLater()
+
+    def test_zoomed_bar_plot_accepts_new_data(self):
+        self.widget.plot_type.setCurrentText('Bar')
+        self.widget._update_plot_data(self.widget._process_plot_data())
+        x_start, x_end = self.widget.plot.xData[0], self.widget.plot.xData[-1]
+        self.widget.plot_widget.setXRange(x_start, (x_start + x_end) / 2)
+        self.widget._follow_data = False
+
+        self.processor.process_data('COM1', b'new')
+        self.widget._update_plot_data(self.widget._process_plot_data())
+        self.assertEqual(len(self.widget.plot.xData), len(self.widget.plot.yData) + 1)
+
+    def test_long_series_decimated(self):
+        self.widget.plot_decimation = 10
+        timestamps, y_data, _ = self.widget._process_plot_data()
+        self.assertEqual(len(timestamps), 10)
+        self.assertEqual(len(y_data), 10)
+        buffer_seconds = self.processor.buffers['COM1']._seconds
+        self.assertEqual(timestamps[0], buffer_seconds[0])
+        self.assertEqual(timestamps[-1], buffer_seconds[-1])
+
+    def test_infinite_rates_dropped_before_decimation(self):
+        buffer = self.processor.buffers['COM1']
+        for _ in range(5):
+            buffer.append(buffer._timestamps[-1], b'x')  # equal timestamps
+        self.widget.data_type.setCurrentText('Packet Rate')
+        self.widget.plot_decimation = 10
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            timestamps, y_data, _ = self.widget._process_plot_data()
+        self.assertEqual(len(y_data), 10)
+        self.assertTrue(np.isfinite(y_data).all())
+
+    def test_large_series_processed_on_worker(self):
+        self.widget.inline_max_points = 10
+        self.widget._do_update_plot()
+        self.assertTrue(self.widget._worker_running)
+        self.widget.threadpool.waitForDone()
+        QApplication.processEvents()
+        self.assertFalse(self.widget._worker_running)
+        self.assertEqual(len(self.widget.plot.yData), 40)
+
+if __name__ == '__main__':
+    unittest.main()